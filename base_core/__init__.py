@@ -0,0 +1,21 @@
+"""
+Subpackages are imported on first attribute access (base_core.fitting, ...),
+so `import base_core` does not load NumPy or SciPy.
+"""
+import importlib
+
+_SUBPACKAGES = ("fitting", "framework", "math", "plotting", "quantities")
+
+__all__ = list(_SUBPACKAGES)
+
+
+def __getattr__(name: str):
+    if name in _SUBPACKAGES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_SUBPACKAGES))
@@ -0,0 +1,48 @@
+"""
+Lazy re-exports: the defining module is imported on first access. SciPy is
+only imported when a fit actually runs.
+"""
+import importlib
+
+_EXPORTS = {
+    "FitMode": "enums",
+    "StartSampling": "enums",
+    "ResampleMethod": "enums",
+    "FitModel": "fit_models",
+    "GAUSSIAN_MODEL": "fit_models",
+    "US_CFG_MODEL": "fit_models",
+    "CF_CFG_MODEL": "fit_models",
+    "fit_gaussian": "functions",
+    "estimate_gaussian": "functions",
+    "fit_usCFG": "functions",
+    "fit_cfCFG": "functions",
+    "fit_model": "functions",
+    "fit_gaussian_batch": "batch",
+    "fit_multistart": "multistart",
+    "fit_gaussian_resampled": "bootstrap",
+    "find_gaussian_peaks": "multi_peak",
+    "fit_multi_gaussian": "multi_peak",
+    "FitSession": "session",
+    "FitStats": "session",
+    "FitResult": "models",
+    "GaussianFitResult": "models",
+    "GaussianBatchFitResult": "models",
+    "GaussianResampledFitResult": "models",
+    "MultiStartResult": "models",
+    "MultiPeakFitResult": "models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
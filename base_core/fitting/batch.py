@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Sequence
+
+import numpy as np
+
+from base_core.fitting.enums import FitMode
+from base_core.fitting.fit_models import GAUSSIAN_MODEL
+from base_core.fitting.functions import estimate_gaussian
+from base_core.fitting.models import GaussianBatchFitResult
+
+_N_PARAMS = 4
+
+
+def fit_gaussian_batch(
+    x: Sequence[float] | np.ndarray,
+    y: np.ndarray,
+    *,
+    p0: Sequence[float] | np.ndarray | None = None,
+    mode: FitMode = FitMode.FULL,
+    max_iter: int = 100,
+    xtol: float = 1.49012e-8,
+    ftol: float = 1.49012e-8,
+    chunk_size: int = 256,
+    executor: Executor | None = None,
+) -> GaussianBatchFitResult:
+    """
+    Fit one Gaussian + offset to every row of y with a vectorized Levenberg–Marquardt.
+
+    - x: shared 1-D axis of length M, or an (N, M) array with one axis per row
+    - y: (N, M) traces
+    - p0: optional (4,) or (N, 4) start values; default is GAUSSIAN_MODEL's guess, as in fit_gaussian()
+    - mode: FAST returns estimate_gaussian() for all rows (no p0 allowed), REFINED uses it
+      as p0 unless p0 is given
+    - executor: optional (process-pool) executor that fits chunks of chunk_size rows in parallel
+
+    Errors are the 1σ values from the scaled covariance, as returned by curve_fit.
+    """
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    if y_arr.ndim != 2:
+        raise ValueError("y must be a 2-D array (n_rows, n_points).")
+    n_rows, n_points = y_arr.shape
+    if x_arr.shape not in ((n_points,), y_arr.shape):
+        raise ValueError("x must have shape (n_points,) or the same shape as y.")
+    if n_points <= _N_PARAMS:
+        raise ValueError(f"need more than {_N_PARAMS} points per row.")
+
+    mode = FitMode(mode)
+    if mode is FitMode.FAST:
+        if p0 is not None:
+            raise ValueError("mode=FAST does not iterate, so it cannot use p0.")
+        return estimate_gaussian(x_arr, y_arr)
+
+    if p0 is None:
+        p0_arr = GAUSSIAN_MODEL.guess(x_arr, y_arr)
+        if mode is FitMode.REFINED:
+            estimate = estimate_gaussian(x_arr, y_arr).parameters
+            usable = np.isfinite(estimate).all(axis=1)
+            p0_arr[usable] = estimate[usable]
+    else:
+        p0_arr = np.broadcast_to(np.asarray(p0, dtype=float), (n_rows, _N_PARAMS)).copy()
+
+    chunks = [
+        (
+            x_arr if x_arr.ndim == 1 else x_arr[start : start + chunk_size],
+            y_arr[start : start + chunk_size],
+            p0_arr[start : start + chunk_size],
+            max_iter,
+            xtol,
+            ftol,
+        )
+        for start in range(0, n_rows, chunk_size)
+    ]
+
+    if executor is None:
+        parts = [_fit_chunk(*chunk) for chunk in chunks]
+    else:
+        parts = list(executor.map(_fit_chunk, *zip(*chunks)))
+
+    if not parts:
+        parts = [_fit_chunk(x_arr, y_arr, p0_arr, max_iter, xtol, ftol)]
+    popt, pcov, converged, n_iter = (np.concatenate(col) for col in zip(*parts))
+    perr = np.sqrt(np.diagonal(pcov, axis1=1, axis2=2))
+
+    return GaussianBatchFitResult(
+        amplitude=popt[:, 0],
+        center=popt[:, 1],
+        sigma=np.abs(popt[:, 2]),
+        offset=popt[:, 3],
+        amplitude_err=perr[:, 0],
+        center_err=perr[:, 1],
+        sigma_err=perr[:, 2],
+        offset_err=perr[:, 3],
+        covariance=pcov,
+        converged=converged,
+        n_iter=n_iter,
+    )
+
+
+def _fit_chunk(
+    x: np.ndarray,
+    y: np.ndarray,
+    p0: np.ndarray,
+    max_iter: int,
+    xtol: float,
+    ftol: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Levenberg–Marquardt with Marquardt diagonal scaling, run on all rows at once.
+    Rows drop out of the working set as soon as they converge. The exponential of
+    an accepted trial step is kept and reused for the next Jacobian.
+    """
+    n_rows, n_points = y.shape
+    shared_x = x.ndim == 1
+
+    def evaluate(idx, p: np.ndarray) -> tuple[np.ndarray, ...]:
+        dx = (x if shared_x else x[idx]) - p[:, 1:2]
+        dx2 = dx * dx
+        e = dx2 * (-0.5 / p[:, 2:3] ** 2)
+        np.exp(e, out=e)
+        r = p[:, 0:1] * e
+        np.subtract(y[idx], r, out=r)
+        r -= p[:, 3:4]
+        return r, e, dx, dx2
+
+    def dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return np.einsum("nm,nm->n", a, b)
+
+    def normal_equations(p: np.ndarray, r: np.ndarray, e: np.ndarray, dx: np.ndarray, dx2: np.ndarray):
+        # The Jacobian columns are e, a·e·dx, b·e·dx² and 1 (a = A/σ², b = A/σ³), so
+        # J^T J and J^T r follow from a few moments without materializing J.
+        a = p[:, 0] / p[:, 2] ** 2
+        b = a / p[:, 2]
+
+        ee = e * e
+        m0, m1, m2 = ee.sum(axis=1), dot(ee, dx), dot(ee, dx2)
+        ee *= dx2
+        m3, m4 = dot(ee, dx), dot(ee, dx2)
+        s0, s1, s2 = e.sum(axis=1), dot(e, dx), dot(e, dx2)
+        re = r * e
+        g0, g1, g2 = re.sum(axis=1), dot(re, dx), dot(re, dx2)
+
+        JTJ = np.empty((len(p), _N_PARAMS, _N_PARAMS))
+        JTJ[:, 0, 0] = m0
+        JTJ[:, 0, 1] = JTJ[:, 1, 0] = a * m1
+        JTJ[:, 0, 2] = JTJ[:, 2, 0] = b * m2
+        JTJ[:, 0, 3] = JTJ[:, 3, 0] = s0
+        JTJ[:, 1, 1] = a * a * m2
+        JTJ[:, 1, 2] = JTJ[:, 2, 1] = a * b * m3
+        JTJ[:, 1, 3] = JTJ[:, 3, 1] = a * s1
+        JTJ[:, 2, 2] = b * b * m4
+        JTJ[:, 2, 3] = JTJ[:, 3, 2] = b * s2
+        JTJ[:, 3, 3] = n_points
+        g = np.stack([g0, a * g1, b * g2, r.sum(axis=1)], axis=-1)
+        return JTJ, g
+
+    all_rows = slice(None)
+    p = p0.copy()
+    r, e, dx, dx2 = evaluate(all_rows, p)
+    cost = dot(r, r)
+    lam = np.full(n_rows, 1e-3)
+    active = np.isfinite(cost)
+    converged = np.zeros(n_rows, dtype=bool)
+    n_iter = np.zeros(n_rows, dtype=np.int64)
+    diag_idx = np.arange(_N_PARAMS)
+
+    for _ in range(max_iter):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        if len(idx) == n_rows:
+            # avoid fancy-index copies while every row is still iterating
+            idx = all_rows
+
+        p_cur = p[idx]
+        JTJ, g = normal_equations(p_cur, r[idx], e[idx], dx[idx], dx2[idx])
+        diag = JTJ[:, diag_idx, diag_idx]
+        JTJ[:, diag_idx, diag_idx] += lam[idx, None] * np.maximum(
+            diag, 1e-12 * diag.max(axis=1, keepdims=True) + 1e-300
+        )
+        delta = _batched_solve(JTJ, g)
+
+        p_new = p_cur + delta
+        trial = evaluate(idx, p_new)
+        cost_new = dot(trial[0], trial[0])
+
+        cost_cur = cost[idx]
+        improved = np.isfinite(cost_new) & (cost_new < cost_cur)
+        small_step = np.all(np.abs(delta) <= xtol * (np.abs(p_cur) + xtol), axis=1)
+        small_gain = (cost_cur - cost_new) <= ftol * cost_cur
+        done = improved & (small_step | small_gain)
+
+        rows = np.arange(n_rows)[idx]
+        if idx is all_rows and improved.all():
+            p, cost = p_new, cost_new
+            r, e, dx, dx2 = trial
+        else:
+            acc = rows[improved]
+            p[acc] = p_new[improved]
+            cost[acc] = cost_new[improved]
+            for state, new in zip((r, e, dx, dx2), trial):
+                state[acc] = new[improved]
+        lam[idx] = np.where(improved, lam[idx] / 10, lam[idx] * 10)
+        n_iter[idx] += 1
+
+        converged[rows[done]] = True
+        active[rows[done]] = False
+        active[rows[lam[idx] > 1e12]] = False
+
+    JTJ, _ = normal_equations(p, r, e, dx, dx2)
+    dof = max(n_points - _N_PARAMS, 1)
+    pcov = _batched_inverse(JTJ) * (cost / dof)[:, None, None]
+
+    return p, pcov, converged, n_iter
+
+
+def _batched_solve(A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.solve(A, b[:, :, None])[:, :, 0]
+    except np.linalg.LinAlgError:
+        return (np.linalg.pinv(A) @ b[:, :, None])[:, :, 0]
+
+
+def _batched_inverse(A: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.inv(A)
+    except np.linalg.LinAlgError:
+        out = np.full_like(A, np.inf)
+        for i, a in enumerate(A):
+            try:
+                out[i] = np.linalg.inv(a)
+            except np.linalg.LinAlgError:
+                pass
+        return out
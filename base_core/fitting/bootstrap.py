@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Executor
+from statistics import NormalDist
+from typing import Iterator, Sequence
+
+import numpy as np
+
+from base_core.fitting.batch import fit_gaussian_batch
+from base_core.fitting.enums import ResampleMethod
+from base_core.fitting.functions import fit_gaussian
+from base_core.fitting.models import GaussianResampledFitResult
+
+_NAMES = ("amplitude", "center", "sigma", "offset")
+
+
+def fit_gaussian_resampled(
+    x: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
+    *,
+    method: ResampleMethod = ResampleMethod.BOOTSTRAP,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int | np.random.Generator | None = None,
+    p0: Sequence[float] | None = None,
+    chunk_size: int = 256,
+    executor: Executor | None = None,
+) -> GaussianResampledFitResult:
+    """
+    Fit a Gaussian as fit_gaussian() does and add resampling intervals to the 1σ covariance errors,
+    which are unreliable at low SNR.
+
+    The resampled data sets are fitted with fit_gaussian_batch() (one x row per resample),
+    started from the parameters of the full fit, in chunks of chunk_size resamples. Each
+    chunk's indices are made just before it is fitted, so memory stays at
+    O(chunk_size·len(x)) however many resamples there are. An executor fits the chunks on
+    its workers, a few per worker at a time. The indices are drawn from seed in chunk
+    order, so a given seed gives the same result with or without an executor.
+
+    n_resamples only applies to BOOTSTRAP; JACKKNIFE always fits the len(x) leave-one-out sets.
+    """
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    if x_arr.ndim != 1 or x_arr.shape != y_arr.shape:
+        raise ValueError("x and y must be 1-D arrays of the same length.")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be in (0, 1).")
+    method = ResampleMethod(method)
+    n = len(x_arr)
+
+    if method is ResampleMethod.BOOTSTRAP and n_resamples < 2:
+        raise ValueError("n_resamples must be >= 2.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1.")
+
+    base = fit_gaussian(x_arr, y_arr, p0=p0)
+    # the model is even in sigma; report the positive root, as the resamples will
+    base_sigma = abs(base.sigma)
+    covariance = base.covariance
+    if base.sigma < 0 and covariance is not None:
+        flip = np.array([1.0, 1.0, -1.0, 1.0])
+        covariance = covariance * np.outer(flip, flip)
+    start = np.array([base.amplitude, base.center, base_sigma, base.offset])
+
+    chunks = _resample_indices(method, n, n_resamples, chunk_size, seed)
+    if executor is None:
+        results = [_fit_chunk(x_arr, y_arr, idx, start) for idx in chunks]
+    else:
+        results = []
+        pending: deque = deque()
+        max_pending = 2 * (os.cpu_count() or 1)
+        for idx in chunks:
+            pending.append(executor.submit(_fit_chunk, x_arr, y_arr, idx, start))
+            if len(pending) >= max_pending:
+                results.append(pending.popleft().result())
+        results.extend(f.result() for f in pending)
+
+    params = np.concatenate([p for p, _ in results])
+    converged = np.concatenate([c for _, c in results])
+    ok = converged & np.isfinite(params).all(axis=1)
+    samples = params[ok]
+    n_failed = len(params) - len(samples)
+
+    if len(samples) < 2:
+        intervals = np.full((4, 2), np.nan)
+    elif method is ResampleMethod.BOOTSTRAP:
+        alpha = 100 * (1 - confidence) / 2
+        intervals = np.percentile(samples, [alpha, 100 - alpha], axis=0).T
+    else:
+        m = len(samples)
+        se = np.sqrt((m - 1) / m * ((samples - samples.mean(axis=0)) ** 2).sum(axis=0))
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        intervals = np.stack([start - z * se, start + z * se], axis=-1)
+
+    ci = {f"{name}_ci": (float(lo), float(hi)) for name, (lo, hi) in zip(_NAMES, intervals)}
+    return GaussianResampledFitResult(
+        amplitude=base.amplitude,
+        center=base.center,
+        sigma=base_sigma,
+        offset=base.offset,
+        amplitude_err=base.amplitude_err,
+        center_err=base.center_err,
+        sigma_err=base.sigma_err,
+        offset_err=base.offset_err,
+        covariance=covariance,
+        n_function_evals=base.n_function_evals,
+        method=method,
+        confidence=confidence,
+        samples=samples,
+        n_resamples=len(params),
+        n_failed=n_failed,
+        **ci,
+    )
+
+
+def _fit_chunk(x: np.ndarray, y: np.ndarray, idx: np.ndarray, start: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # module level, so that process pools can run it; the rows are gathered in the worker
+    fits = fit_gaussian_batch(x[idx], y[idx], p0=start, chunk_size=len(idx))
+    return fits.parameters, fits.converged
+
+
+def _resample_indices(
+    method: ResampleMethod,
+    n: int,
+    n_resamples: int,
+    chunk_size: int,
+    seed: int | np.random.Generator | None,
+) -> Iterator[np.ndarray]:
+    """
+    (rows, n) index arrays of the resampled data sets, chunk_size rows at a time.
+    """
+    if method is ResampleMethod.BOOTSTRAP:
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_resamples, chunk_size):
+            yield rng.integers(0, n, size=(min(chunk_size, n_resamples - start), n))
+    else:
+        # row j holds every index but j
+        keep = np.arange(n - 1)
+        for start in range(0, n, chunk_size):
+            yield keep + (keep >= np.arange(start, min(start + chunk_size, n))[:, None])
@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class FitMode(str, Enum):
+    FULL    = "full"       # least squares from the moment-based guess
+    FAST    = "fast"       # closed-form estimate only, no iterations
+    REFINED = "refined"    # least squares seeded with the closed-form estimate
+
+
+class StartSampling(str, Enum):
+    SOBOL = "sobol"
+    GRID  = "grid"
+
+
+class ResampleMethod(str, Enum):
+    BOOTSTRAP = "bootstrap"    # pairs bootstrap: n_resamples draws of n points with replacement
+    JACKKNIFE = "jackknife"    # leave-one-out: n fits of n - 1 points
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, replace
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+import numpy as np
+
+from base_core.math.functions import cfCFG_projection, cfg_envelope, gaussian, usCFG_projection
+from base_core.math.models import WavelengthGrid
+
+_FWHM_PER_SIGMA = float(np.sqrt(8 * np.log(2)))
+
+
+@dataclass(frozen=True)
+class FitModel:
+    """
+    A fittable function bundled with what a least-squares solver needs:
+
+    - function(x, *params, **constants) -> model values
+    - jacobian(x, *params, **constants) -> (len(x), n_params) partial derivatives
+    - initial_guess(x, y, **constants) -> start values (rows of y if y is 2-D)
+    - lower/upper: parameter bounds
+
+    `constants` are fixed inputs that are not fitted (e.g. starting_wavelength);
+    set them with bind().
+
+    Optional hooks used by fit_multistart():
+    - search_space(x, y, **constants) -> {parameter: (low, high)} to sample start values in
+    - canonical_form(values) -> values with equivalent solutions mapped onto one representative
+    """
+    name: str
+    parameters: tuple[str, ...]
+    function: Callable[..., np.ndarray]
+    jacobian: Callable[..., np.ndarray]
+    initial_guess: Callable[..., np.ndarray]
+    lower: tuple[float, ...]
+    upper: tuple[float, ...]
+    constants: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+    search_space: Callable[..., dict[str, tuple[float, float]]] | None = None
+    canonical_form: Callable[[np.ndarray], np.ndarray] | None = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.constants, MappingProxyType):
+            object.__setattr__(self, "constants", MappingProxyType(dict(self.constants)))
+
+    def __reduce__(self):
+        # MappingProxyType does not pickle; models are sent to worker processes
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        state["constants"] = dict(self.constants)
+        return (_rebuild_fit_model, (state,))
+
+    def bind(self, **constants: float) -> "FitModel":
+        return replace(self, constants={**self.constants, **constants})
+
+    @property
+    def n_params(self) -> int:
+        return len(self.parameters)
+
+    @property
+    def bounded(self) -> bool:
+        return bool(np.isfinite(self.lower).any() or np.isfinite(self.upper).any())
+
+    def evaluate(self, x, *params: float) -> np.ndarray:
+        return self.function(x, *params, **self.constants)
+
+    def evaluate_jacobian(self, x, *params: float) -> np.ndarray:
+        return self.jacobian(x, *params, **self.constants)
+
+    def guess(self, x, y) -> np.ndarray:
+        p0 = self.initial_guess(np.asarray(x, dtype=float), np.asarray(y, dtype=float), **self.constants)
+        return np.clip(p0, self.lower, self.upper)
+
+
+def _rebuild_fit_model(state: dict) -> FitModel:
+    return FitModel(**state)
+
+
+def _offset(x, center: float, power: int = 1) -> np.ndarray:
+    if isinstance(x, WavelengthGrid):
+        return x.offset(center, power)
+    return (np.asarray(x, dtype=float) - center) ** power
+
+
+# --- gaussian ---------------------------------------------------------------
+
+def _gaussian_jacobian(x, A, x0, sigma, offset) -> np.ndarray:
+    dx = _offset(x, x0)
+    e = gaussian(x, 1, x0, sigma, 0)
+    d_x0 = A * e * dx / sigma ** 2
+    d_sigma = d_x0 * dx / sigma
+    return np.stack([e, d_x0, d_sigma, np.ones_like(e)], axis=-1)
+
+
+def _gaussian_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Moment-style guess on the last axis: offset = min, amplitude = max - min,
+    center = centroid of the points above half maximum, sigma from their extent (FWHM).
+    """
+    x = np.broadcast_to(x, y.shape)
+    offset = y.min(axis=-1)
+    amplitude = y.max(axis=-1) - offset
+    above = y - offset[..., None]
+    above = np.where(above > amplitude[..., None] / 2, above, 0.0)
+
+    weight = above.sum(axis=-1)
+    center = np.where(
+        weight > 0,
+        (above * x).sum(axis=-1) / np.where(weight > 0, weight, 1.0),
+        np.take_along_axis(x, np.argmax(y, axis=-1)[..., None], axis=-1)[..., 0],
+    )
+    inside = above > 0
+    lo = np.where(inside, x, np.inf).min(axis=-1)
+    hi = np.where(inside, x, -np.inf).max(axis=-1)
+    spacing = (x.max(axis=-1) - x.min(axis=-1)) / max(x.shape[-1] - 1, 1)
+    fwhm = np.where(np.isfinite(hi - lo), hi - lo, 0.0) + spacing
+    sigma = np.where(fwhm > 0, fwhm / _FWHM_PER_SIGMA, 1.0)
+
+    return np.stack([amplitude, center, sigma, offset], axis=-1)
+
+
+GAUSSIAN_MODEL = FitModel(
+    name="gaussian",
+    parameters=("amplitude", "center", "sigma", "offset"),
+    function=gaussian,
+    jacobian=_gaussian_jacobian,
+    initial_guess=_gaussian_guess,
+    lower=(-np.inf,) * 4,
+    upper=(np.inf,) * 4,
+)
+
+
+# --- CFG projections --------------------------------------------------------
+# S = baseline + (1 - baseline) * (G * sin(theta))^2 with G = exp(-d^2 / 2 sigma^2),
+# sigma = bandwidth / sqrt(8 ln 2). Shared pieces for the derivatives:
+#   dS/dbaseline = 1 - (G sin theta)^2
+#   dS/dtheta    = (1 - baseline) * G^2 * sin(2 theta)
+#   dS/dsigma    = (1 - baseline) * 2 (G sin theta)^2 * d^2 / sigma^3
+
+def _us_cfg(x, carrier_wavelength, bandwidth, baseline, phase, acceleration, *, starting_wavelength):
+    return usCFG_projection(
+        x, carrier_wavelength, starting_wavelength, bandwidth, baseline, phase, acceleration
+    )
+
+
+def _us_cfg_jacobian(x, carrier_wavelength, bandwidth, baseline, phase, acceleration, *, starting_wavelength):
+    sigma = bandwidth / _FWHM_PER_SIGMA
+    d = _offset(x, carrier_wavelength)
+    d2 = _offset(x, carrier_wavelength, 2)
+    ds2 = _offset(x, starting_wavelength, 2)
+    g2 = cfg_envelope(x, carrier_wavelength, bandwidth)
+    theta = phase + acceleration * ds2
+    p2 = g2 * np.sin(theta) ** 2
+    scale = 1 - baseline
+    d_theta = scale * g2 * np.sin(2 * theta)
+
+    d_carrier = scale * 2 * p2 * d / sigma ** 2
+    d_bandwidth = scale * 2 * p2 * d2 / sigma ** 3 / _FWHM_PER_SIGMA
+    d_baseline = 1 - p2
+    return np.stack([d_carrier, d_bandwidth, d_baseline, d_theta, d_theta * ds2], axis=-1)
+
+
+def _cf_cfg(x, carrier_wavelength, average_frequency, bandwidth, baseline, phase, acceleration):
+    return cfCFG_projection(
+        x, carrier_wavelength, average_frequency, bandwidth, baseline, phase, acceleration
+    )
+
+
+def _cf_cfg_jacobian(x, carrier_wavelength, average_frequency, bandwidth, baseline, phase, acceleration):
+    sigma = bandwidth / _FWHM_PER_SIGMA
+    d = _offset(x, carrier_wavelength)
+    d2 = _offset(x, carrier_wavelength, 2)
+    d3 = _offset(x, carrier_wavelength, 3)
+    g2 = cfg_envelope(x, carrier_wavelength, bandwidth)
+    theta = phase + average_frequency * d + acceleration * d3
+    p2 = g2 * np.sin(theta) ** 2
+    scale = 1 - baseline
+    d_theta = scale * g2 * np.sin(2 * theta)
+
+    d_carrier = scale * 2 * p2 * d / sigma ** 2 - d_theta * (average_frequency + 3 * acceleration * d2)
+    d_bandwidth = scale * 2 * p2 * d2 / sigma ** 3 / _FWHM_PER_SIGMA
+    d_baseline = 1 - p2
+    return np.stack(
+        [d_carrier, d_theta * d, d_bandwidth, d_baseline, d_theta, d_theta * d3], axis=-1
+    )
+
+
+def _envelope_guess(x: np.ndarray, y: np.ndarray) -> tuple[float, float, float, np.ndarray]:
+    """
+    Baseline, carrier and bandwidth from the moments of y - baseline (the envelope
+    is G^2, variance sigma^2 / 2, times sin^2), plus the oscillating part of the
+    signal around that envelope.
+    """
+    baseline = float(np.clip(y.min(), 0.0, 1.0))
+    w = np.clip(y - baseline, 0.0, None)
+    total = w.sum()
+    if total <= 0:
+        carrier = float(x.mean())
+        sigma = float(x.max() - x.min()) / 6
+    else:
+        carrier = float((w * x).sum() / total)
+        variance = float((w * (x - carrier) ** 2).sum() / total)
+        sigma = float(np.sqrt(2 * variance)) if variance > 0 else float(x.max() - x.min()) / 6
+    g2 = np.exp(-((x - carrier) ** 2) / sigma ** 2)
+    depth = max(float(y.max()) - baseline, 1e-12)
+    oscillation = w - depth * g2 / 2
+    return baseline, carrier, sigma * _FWHM_PER_SIGMA, oscillation
+
+
+def _dominant_frequency(x: np.ndarray, signal: np.ndarray) -> float:
+    """
+    Strongest angular frequency (rad per x unit) of a signal on an approximately uniform grid.
+    """
+    n = len(x)
+    if n < 4:
+        return 0.0
+    spacing = (x[-1] - x[0]) / (n - 1)
+    spectrum = np.abs(np.fft.rfft(signal - signal.mean()))
+    spectrum[0] = 0.0
+    return float(2 * np.pi * np.fft.rfftfreq(n, d=abs(spacing))[np.argmax(spectrum)])
+
+
+def _demodulated_phase(oscillation: np.ndarray, theta0: np.ndarray, weight: np.ndarray) -> float:
+    # oscillation ~ -cos(2 phase + 2 theta0) / 2, so the phase of -sum(osc * e^{-2i theta0}) is 2 phase
+    z = np.sum(oscillation * weight * np.exp(-2j * theta0))
+    return float(np.angle(-z) / 2)
+
+
+def _us_cfg_guess(x: np.ndarray, y: np.ndarray, *, starting_wavelength: float) -> np.ndarray:
+    baseline, carrier, bandwidth, oscillation = _envelope_guess(x, y)
+    # local angular frequency of sin^2 is 4 * acceleration * (x - starting_wavelength)
+    omega = _dominant_frequency(x, oscillation)
+    lever = carrier - starting_wavelength
+    acceleration = omega / (4 * lever) if lever != 0 else 0.0
+    theta0 = acceleration * (x - starting_wavelength) ** 2
+    g2 = np.exp(-((x - carrier) ** 2) * (_FWHM_PER_SIGMA / bandwidth) ** 2)
+    phase = _demodulated_phase(oscillation, theta0, g2)
+    return np.array([carrier, bandwidth, baseline, phase, acceleration])
+
+
+def _cf_cfg_guess(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    baseline, carrier, bandwidth, oscillation = _envelope_guess(x, y)
+    # local angular frequency of sin^2 at the carrier is 2 * average_frequency
+    average_frequency = _dominant_frequency(x, oscillation) / 2
+    theta0 = average_frequency * (x - carrier)
+    g2 = np.exp(-((x - carrier) ** 2) * (_FWHM_PER_SIGMA / bandwidth) ** 2)
+    phase = _demodulated_phase(oscillation, theta0, g2)
+    return np.array([carrier, average_frequency, bandwidth, baseline, phase, 0.0])
+
+
+def _grid_spacing(x: np.ndarray) -> float:
+    return float(abs(x[-1] - x[0]) / max(len(x) - 1, 1)) or 1.0
+
+
+def _us_cfg_search_space(x: np.ndarray, y: np.ndarray, *, starting_wavelength: float) -> dict[str, tuple[float, float]]:
+    # keep the chirp (local angular frequency 4 a |x - x_s|) below a quarter of Nyquist
+    lever = float(np.max(np.abs(x - starting_wavelength))) or 1.0
+    a_max = np.pi / (16 * _grid_spacing(x) * lever)
+    return {"phase": (0.0, np.pi), "acceleration": (-a_max, a_max)}
+
+
+def _cf_cfg_search_space(x: np.ndarray, y: np.ndarray) -> dict[str, tuple[float, float]]:
+    # the cubic term adds a local angular frequency of 6 a d^2; keep it below a quarter of Nyquist
+    half_width = float(np.max(np.abs(x - np.mean(x)))) or 1.0
+    a_max = np.pi / (24 * _grid_spacing(x) * half_width ** 2)
+    return {"phase": (0.0, np.pi), "acceleration": (-a_max, a_max)}
+
+
+def _cfg_canonical_form(values: np.ndarray, theta_params: tuple[int, ...], phase_idx: int) -> np.ndarray:
+    """
+    sin^2 is pi-periodic and even in theta, so (phase, chirp terms) and
+    (pi - phase, -chirp terms) give the same curve. Map phase into [0, pi/2].
+    """
+    out = np.array(values, dtype=float)
+    out[phase_idx] = np.mod(out[phase_idx], np.pi)
+    if out[phase_idx] > np.pi / 2:
+        out[phase_idx] = np.pi - out[phase_idx]
+        out[list(theta_params)] *= -1
+    return out
+
+
+def _us_cfg_canonical_form(values: np.ndarray) -> np.ndarray:
+    return _cfg_canonical_form(values, theta_params=(4,), phase_idx=3)
+
+
+def _cf_cfg_canonical_form(values: np.ndarray) -> np.ndarray:
+    return _cfg_canonical_form(values, theta_params=(1, 5), phase_idx=4)
+
+
+US_CFG_MODEL = FitModel(
+    name="usCFG",
+    parameters=("carrier_wavelength", "bandwidth", "baseline", "phase", "acceleration"),
+    function=_us_cfg,
+    jacobian=_us_cfg_jacobian,
+    initial_guess=_us_cfg_guess,
+    lower=(-np.inf, 0.0, 0.0, -np.inf, -np.inf),
+    upper=(np.inf, np.inf, 1.0, np.inf, np.inf),
+    search_space=_us_cfg_search_space,
+    canonical_form=_us_cfg_canonical_form,
+)
+
+CF_CFG_MODEL = FitModel(
+    name="cfCFG",
+    parameters=("carrier_wavelength", "average_frequency", "bandwidth", "baseline", "phase", "acceleration"),
+    function=_cf_cfg,
+    jacobian=_cf_cfg_jacobian,
+    initial_guess=_cf_cfg_guess,
+    lower=(-np.inf, -np.inf, 0.0, 0.0, -np.inf, -np.inf),
+    upper=(np.inf, np.inf, np.inf, 1.0, np.inf, np.inf),
+    search_space=_cf_cfg_search_space,
+    canonical_form=_cf_cfg_canonical_form,
+)
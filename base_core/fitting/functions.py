@@ -1,27 +1,42 @@
-from dataclasses import dataclass
 from typing import Sequence
-from base_core.fitting.models import GaussianFitResult
+from base_core.fitting.enums import FitMode
+from base_core.fitting.fit_models import CF_CFG_MODEL, GAUSSIAN_MODEL, US_CFG_MODEL, FitModel
+from base_core.fitting.models import FitResult, GaussianBatchFitResult, GaussianFitResult
+from base_core.math.models import WavelengthGrid
 import numpy as np
-from scipy.optimize import curve_fit
 
-from base_core.math.functions import gaussian
+# normal-equation matrix of a parabola fit from the moments sum(w u^k), k = 0..4
+_HANKEL_3X3 = np.add.outer(np.arange(3), np.arange(3))
 
 
-def fit_gaussian(x: Sequence[float], y: Sequence[float]) -> GaussianFitResult:
+def fit_gaussian(
+    x: Sequence[float],
+    y: Sequence[float],
+    *,
+    p0: Sequence[float] | None = None,
+    mode: FitMode = FitMode.FULL,
+) -> GaussianFitResult:
     """
     Fit a Gaussian to data (x, y) and return parameters + 1σ errors.
+    p0 = (amplitude, center, sigma, offset) overrides the moment-based start values.
+
+    mode=FAST skips least squares and returns estimate_gaussian() (no errors), so it
+    takes no p0; mode=REFINED uses that estimate as p0 for the full fit unless p0 is given.
     """
-    x_arr = np.asarray(x)
-    y_arr = np.asarray(y)
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    mode = FitMode(mode)
 
-    # simple initial guesses
-    A0 = float(y_arr.max() - y_arr.min())
-    x0 = float(x_arr[np.argmax(y_arr)])
-    sigma0 = float((x_arr.max() - x_arr.min()) / 6)
-    offset0 = float(y_arr.min())
-    p0 = [A0, x0, sigma0, offset0]
+    if mode is FitMode.FAST:
+        if p0 is not None:
+            raise ValueError("mode=FAST does not iterate, so it cannot use p0.")
+        return estimate_gaussian(x_arr, y_arr)
+    if mode is FitMode.REFINED and p0 is None:
+        estimate = estimate_gaussian(x_arr, y_arr)
+        if np.isfinite([estimate.amplitude, estimate.center, estimate.sigma]).all():
+            p0 = [estimate.amplitude, estimate.center, estimate.sigma, estimate.offset]
 
-    popt, pcov = curve_fit(gaussian, x_arr, y_arr, p0=p0)
+    popt, pcov, _, nfev = _curve_fit_model(GAUSSIAN_MODEL, x_arr, y_arr, p0)
 
     # 1σ uncertainties of the parameters from covariance matrix
     perr = np.sqrt(np.diag(pcov))
@@ -36,4 +51,175 @@ def fit_gaussian(x: Sequence[float], y: Sequence[float]) -> GaussianFitResult:
         sigma_err=perr[2],
         offset_err=perr[3],
         covariance=pcov,
+        n_function_evals=nfev,
+    )
+
+
+def estimate_gaussian(
+    x: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
+    *,
+    threshold: float = 0.2,
+    edge_fraction: float = 0.05,
+) -> GaussianFitResult | GaussianBatchFitResult:
+    """
+    Closed-form Gaussian estimate (weighted log-parabola, Caruana/Guo), no iterations.
+
+    The offset is the mean of the outer edge_fraction of points on each side.
+    ln(y - offset) is fitted with a parabola over the points above
+    threshold * peak, weighted by (y - offset)^2 to undo the noise gain
+    of the log.
+
+    A 2-D y gives one estimate per row (GaussianBatchFitResult), and x may
+    be shared or per row. Rows where the parabola does not open downwards
+    give NaN.
+    """
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    x_rows = np.broadcast_to(x_arr, y_arr.shape)
+    n = y_arr.shape[-1]
+
+    k = max(1, int(round(n * edge_fraction)))
+    offset = (y_arr[..., :k].sum(axis=-1) + y_arr[..., -k:].sum(axis=-1)) / (2 * k)
+    s = y_arr - offset[..., None]
+    peak_idx = np.argmax(s, axis=-1)[..., None]
+    peak = np.take_along_axis(s, peak_idx, axis=-1)
+
+    # center/scale x around the peak so the 3x3 normal equations stay well conditioned
+    x_peak = np.take_along_axis(x_rows, peak_idx, axis=-1)
+    half_span = (x_rows.max(axis=-1, keepdims=True) - x_rows.min(axis=-1, keepdims=True)) / 2
+    half_span = np.where(half_span > 0, half_span, 1.0)
+    u = (x_rows - x_peak) / half_span
+
+    use = s > threshold * peak
+    w = np.where(use, s * s, 0.0)
+    log_s = np.log(np.where(use, s, 1.0))
+
+    powers = np.empty(u.shape[:-1] + (5,) + u.shape[-1:])
+    powers[..., 0, :] = 1.0
+    for j in range(1, 5):
+        np.multiply(powers[..., j - 1, :], u, out=powers[..., j, :])
+    moments = np.einsum("...km,...m->...k", powers, w)
+    b = np.einsum("...km,...m->...k", powers[..., :3, :], w * log_s)
+    A = moments[..., _HANKEL_3X3]
+
+    det = np.linalg.det(A)
+    ok = np.isfinite(det) & (np.abs(det) > 0)
+    A = np.where(ok[..., None, None], A, np.eye(3))
+    c0, c1, c2 = np.moveaxis(np.linalg.solve(A, b[..., None])[..., 0], -1, 0)
+    ok &= c2 < 0
+    c2 = np.where(ok, c2, -1.0)
+
+    center = x_peak[..., 0] - half_span[..., 0] * c1 / (2 * c2)
+    sigma = half_span[..., 0] * np.sqrt(-1 / (2 * c2))
+    amplitude = np.exp(c0 - c1 ** 2 / (4 * c2))
+    center, sigma, amplitude = (np.where(ok, v, np.nan) for v in (center, sigma, amplitude))
+
+    if y_arr.ndim == 1:
+        return GaussianFitResult(
+            amplitude=float(amplitude),
+            center=float(center),
+            sigma=float(sigma),
+            offset=float(offset),
+        )
+
+    nan = np.full(len(amplitude), np.nan)
+    return GaussianBatchFitResult(
+        amplitude=amplitude,
+        center=center,
+        sigma=sigma,
+        offset=offset,
+        amplitude_err=nan,
+        center_err=nan.copy(),
+        sigma_err=nan.copy(),
+        offset_err=nan.copy(),
+        covariance=np.full((len(amplitude), 4, 4), np.nan),
+        converged=ok,
+        n_iter=np.zeros(len(amplitude), dtype=np.int64),
+    )
+
+
+def fit_usCFG(
+    wavelengths: Sequence[float],
+    y: Sequence[float],
+    starting_wavelength: float,
+    *,
+    p0: Sequence[float] | None = None,
+) -> FitResult:
+    """
+    Fit usCFG_projection with starting_wavelength held fixed.
+    Fitted: carrier_wavelength, bandwidth, baseline, phase, acceleration.
+    """
+    return fit_model(US_CFG_MODEL.bind(starting_wavelength=starting_wavelength), wavelengths, y, p0=p0)
+
+
+def fit_cfCFG(
+    wavelengths: Sequence[float],
+    y: Sequence[float],
+    *,
+    p0: Sequence[float] | None = None,
+) -> FitResult:
+    """
+    Fit cfCFG_projection.
+    Fitted: carrier_wavelength, average_frequency, bandwidth, baseline, phase, acceleration.
+    """
+    return fit_model(CF_CFG_MODEL, wavelengths, y, p0=p0)
+
+
+def fit_model(
+    model: FitModel,
+    x: Sequence[float] | WavelengthGrid,
+    y: Sequence[float],
+    *,
+    p0: Sequence[float] | None = None,
+) -> FitResult:
+    """
+    Least-squares fit of any FitModel using its analytic Jacobian, initial guess and bounds.
+    A WavelengthGrid for x is passed through to the model, which reuses its cached axis terms.
+    """
+    x_arr = x if isinstance(x, WavelengthGrid) else np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+
+    popt, pcov, rss, nfev = _curve_fit_model(model, x_arr, y_arr, p0)
+    perr = np.sqrt(np.diag(pcov))
+
+    return FitResult(
+        model=model,
+        parameters=dict(zip(model.parameters, map(float, popt))),
+        errors=dict(zip(model.parameters, map(float, perr))),
+        covariance=pcov,
+        residual_sum_squares=rss,
+        n_function_evals=nfev,
+    )
+
+
+def _curve_fit_model(
+    model: FitModel,
+    x: np.ndarray | WavelengthGrid,
+    y: np.ndarray,
+    p0: Sequence[float] | None,
+) -> tuple[np.ndarray, np.ndarray, float, int]:
+    if p0 is None:
+        p0 = model.guess(x, y)
+    else:
+        p0 = np.clip(np.asarray(p0, dtype=float), model.lower, model.upper)
+
+    # scipy is imported on first use so that importing base_core.fitting stays cheap
+    from scipy.optimize import curve_fit
+
+    kwargs = {}
+    if model.bounded:
+        kwargs["bounds"] = (model.lower, model.upper)
+
+    # curve_fit hands non-array xdata (a WavelengthGrid) to the model unchanged
+    popt, pcov, infodict, _, _ = curve_fit(
+        lambda x_, *p: model.evaluate(x_, *p),
+        x,
+        y,
+        p0=p0,
+        jac=lambda x_, *p: model.evaluate_jacobian(x_, *p),
+        full_output=True,
+        **kwargs,
     )
+    fvec = infodict["fvec"]
+    return popt, pcov, float(np.dot(fvec, fvec)), int(infodict["nfev"])
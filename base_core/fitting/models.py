@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from base_core.fitting.enums import ResampleMethod
+from base_core.fitting.fit_models import FitModel
 from base_core.math.functions import gaussian
 import numpy as np
 
@@ -16,6 +18,7 @@ class GaussianFitResult:
     offset_err: float | None = None
 
     covariance: np.ndarray | None = None
+    n_function_evals: int | None = None
 
     def get_curve(self, x):
         """
@@ -23,3 +26,180 @@ class GaussianFitResult:
         """
         x = np.asarray(x)
         return gaussian(x, self.amplitude, self.center, self.sigma, self.offset)
+
+
+@dataclass
+class GaussianResampledFitResult(GaussianFitResult):
+    """
+    Result of fit_gaussian_resampled(): the fit of the full data (errors from its covariance,
+    as in fit_gaussian()) plus (low, high) intervals at the given confidence from the resampled fits.
+
+    - BOOTSTRAP: percentile intervals of the resampled parameters
+    - JACKKNIFE: normal intervals, value ± z·(jackknife standard error)
+    """
+    method: ResampleMethod = ResampleMethod.BOOTSTRAP
+    confidence: float = 0.95
+
+    amplitude_ci: tuple[float, float] | None = None
+    center_ci: tuple[float, float] | None = None
+    sigma_ci: tuple[float, float] | None = None
+    offset_ci: tuple[float, float] | None = None
+
+    samples: np.ndarray | None = None   # (n_used, 4) parameters of the resampled fits that converged
+    n_resamples: int = 0
+    n_failed: int = 0
+
+
+@dataclass
+class GaussianBatchFitResult:
+    """
+    Columnar result of fit_gaussian_batch(): one entry per fitted row.
+    """
+    amplitude: np.ndarray
+    center: np.ndarray
+    sigma: np.ndarray
+    offset: np.ndarray
+
+    amplitude_err: np.ndarray
+    center_err: np.ndarray
+    sigma_err: np.ndarray
+    offset_err: np.ndarray
+
+    covariance: np.ndarray
+    converged: np.ndarray
+    n_iter: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.amplitude)
+
+    def __getitem__(self, i: int) -> GaussianFitResult:
+        return GaussianFitResult(
+            amplitude=float(self.amplitude[i]),
+            center=float(self.center[i]),
+            sigma=float(self.sigma[i]),
+            offset=float(self.offset[i]),
+            amplitude_err=float(self.amplitude_err[i]),
+            center_err=float(self.center_err[i]),
+            sigma_err=float(self.sigma_err[i]),
+            offset_err=float(self.offset_err[i]),
+            covariance=self.covariance[i],
+        )
+
+    @property
+    def parameters(self) -> np.ndarray:
+        """
+        (n_rows, 4) array of (amplitude, center, sigma, offset).
+        """
+        return np.stack([self.amplitude, self.center, self.sigma, self.offset], axis=-1)
+
+    def get_curves(self, x):
+        """
+        Evaluate every fitted Gaussian on x (shared 1-D axis or one row per fit).
+        """
+        x = np.asarray(x)
+        return gaussian(
+            x,
+            self.amplitude[:, None],
+            self.center[:, None],
+            self.sigma[:, None],
+            self.offset[:, None],
+        )
+
+
+@dataclass
+class MultiPeakFitResult:
+    """
+    Result of fit_multi_gaussian() and find_gaussian_peaks(): K Gaussians on one shared offset,
+    one entry per peak, sorted by center.
+    """
+    amplitude: np.ndarray
+    center: np.ndarray
+    sigma: np.ndarray
+    offset: float
+
+    amplitude_err: np.ndarray
+    center_err: np.ndarray
+    sigma_err: np.ndarray
+    offset_err: float
+
+    covariance: np.ndarray | None = None    # (3K + 1)^2, order A_1, c_1, σ_1, ..., A_K, c_K, σ_K, offset
+    residual_sum_squares: float | None = None
+    n_function_evals: int | None = None
+    converged: bool | None = None
+
+    def __len__(self) -> int:
+        return len(self.amplitude)
+
+    def __getitem__(self, i: int) -> GaussianFitResult:
+        """
+        Peak i on its own (offset 0).
+        """
+        return GaussianFitResult(
+            amplitude=float(self.amplitude[i]),
+            center=float(self.center[i]),
+            sigma=float(self.sigma[i]),
+            offset=0.0,
+            amplitude_err=float(self.amplitude_err[i]),
+            center_err=float(self.center_err[i]),
+            sigma_err=float(self.sigma_err[i]),
+        )
+
+    @property
+    def parameters(self) -> np.ndarray:
+        """
+        (K, 3) array of (amplitude, center, sigma).
+        """
+        return np.stack([self.amplitude, self.center, self.sigma], axis=-1)
+
+    def get_components(self, x):
+        """
+        (K, len(x)) array with every peak evaluated on x, without the offset.
+        """
+        x = np.asarray(x, dtype=float)
+        return gaussian(x, self.amplitude[:, None], self.center[:, None], self.sigma[:, None], 0.0)
+
+    def get_curve(self, x):
+        """
+        Evaluate the sum of all peaks plus the offset for arbitrary x values.
+        """
+        x = np.asarray(x, dtype=float)
+        curve = np.full(x.shape, float(self.offset))
+        for a, c, s in zip(self.amplitude, self.center, self.sigma):
+            curve += gaussian(x, a, c, s, 0.0)
+        return curve
+
+
+@dataclass
+class FitResult:
+    """
+    Result of fitting a FitModel: parameters and 1σ errors keyed by parameter name.
+    """
+    model: FitModel
+    parameters: dict[str, float]
+    errors: dict[str, float]
+    covariance: np.ndarray
+    residual_sum_squares: float
+    n_function_evals: int | None = None
+
+    @property
+    def values(self) -> np.ndarray:
+        return np.array([self.parameters[name] for name in self.model.parameters])
+
+    def get_curve(self, x):
+        """
+        Evaluate the fitted model for arbitrary x values.
+        """
+        return self.model.evaluate(x, *self.values)
+
+
+@dataclass
+class MultiStartResult:
+    """
+    Result of fit_multistart(): the best fit plus every distinct local minimum found
+    (sorted by residual, best first).
+    """
+    best: FitResult
+    minima: list[FitResult]
+    n_starts: int
+    n_failed: int
+    n_agree: int
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from base_core.fitting.models import MultiPeakFitResult
+from base_core.math.enums import SmoothingMode
+from base_core.math.smoothing import moving_average
+
+_FWHM_PER_SIGMA = float(np.sqrt(8 * np.log(2)))
+# 1.4826 * MAD estimates a normal standard deviation; the √2 undoes the noise gain of np.diff
+_MAD_PER_SIGMA = 1.4826 / np.sqrt(2)
+
+
+def find_gaussian_peaks(
+    x: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
+    *,
+    max_peaks: int | None = None,
+    min_snr: float = 5.0,
+    smoothing: int = 5,
+) -> MultiPeakFitResult:
+    """
+    Start values for fit_multi_gaussian(), no iterations.
+
+    Peaks of y, boxcar-smoothed over `smoothing` points, whose height above the offset
+    and prominence both exceed min_snr noise levels. The noise level is the MAD of the point-to-point differences
+    of y, so noise wiggles on the flanks of a peak are not counted as peaks. For each peak:
+    - center: vertex of the parabola through the maximum and its two neighbours
+    - sigma: from the width at half prominence
+    - amplitude: height above the offset, which is the 10th percentile of the smoothed data
+    At most max_peaks peaks are kept, the most prominent first.
+
+    x must be strictly increasing. Errors are NaN.
+    """
+    x_arr, y_arr = _check_axis(x, y)
+    ys = moving_average(x_arr, y_arr, smoothing, mode=SmoothingMode.SAME)[1] if smoothing > 1 else y_arr
+    offset = float(np.percentile(ys, 10))
+    noise = _MAD_PER_SIGMA * float(np.median(np.abs(np.diff(y_arr))))
+
+    # scipy is imported on first use so that importing base_core.fitting stays cheap
+    from scipy.signal import find_peaks
+
+    threshold = max(min_snr * noise, np.finfo(float).tiny)
+    peaks, props = find_peaks(ys, height=offset + threshold, prominence=threshold, width=0, rel_height=0.5)
+    if max_peaks is not None:
+        top = np.sort(np.argsort(props["prominences"])[::-1][:max_peaks])
+        peaks = peaks[top]
+        props = {name: values[top] for name, values in props.items()}
+
+    # vertex of the parabola through the maximum and its neighbours
+    x0, x1, x2 = x_arr[peaks - 1], x_arr[peaks], x_arr[peaks + 1]
+    y0, y1, y2 = ys[peaks - 1], ys[peaks], ys[peaks + 1]
+    d0 = (y1 - y0) / (x1 - x0)
+    curvature = ((y2 - y1) / (x2 - x1) - d0) / (x2 - x0)
+    vertex = (x0 + x1) / 2 - d0 / (2 * np.where(curvature < 0, curvature, -1.0))
+    center = np.where(curvature < 0, np.clip(vertex, x0, x2), x1)
+
+    # the half-prominence crossings come as fractional sample indices
+    samples = np.arange(len(x_arr))
+    fwhm = np.interp(props["right_ips"], samples, x_arr) - np.interp(props["left_ips"], samples, x_arr)
+    sigma = np.maximum(fwhm, x2 - x1) / _FWHM_PER_SIGMA
+
+    nan = np.full(len(peaks), np.nan)
+    return MultiPeakFitResult(
+        amplitude=ys[peaks] - offset,
+        center=center,
+        sigma=sigma,
+        offset=offset,
+        amplitude_err=nan,
+        center_err=nan.copy(),
+        sigma_err=nan.copy(),
+        offset_err=float("nan"),
+    )
+
+
+def fit_multi_gaussian(
+    x: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
+    *,
+    p0: MultiPeakFitResult | Sequence[Sequence[float]] | np.ndarray | None = None,
+    max_peaks: int | None = None,
+    min_snr: float = 5.0,
+    support: float = 6.0,
+    max_iter: int = 100,
+    xtol: float = 1.49012e-8,
+    ftol: float = 1.49012e-8,
+) -> MultiPeakFitResult:
+    """
+    Least-squares fit of a sum of K gaussian() peaks plus one offset.
+
+    - p0: MultiPeakFitResult (e.g. from find_gaussian_peaks(), possibly edited) or a (K, 3)
+      array of (amplitude, center, sigma); default is find_gaussian_peaks(x, y, max_peaks, min_snr)
+    - support: each peak is evaluated only within center ± support·sigma
+
+    Levenberg–Marquardt on the normal equations. The model is accumulated with np.bincount
+    over the support windows, and the Jacobian is sparse: 3 columns per peak with nonzeros
+    only inside its window, plus the offset. One iteration costs O(len(x) + sum of window
+    lengths) plus a dense (3K + 1)² solve, instead of O(len(x)·K).
+    Steps are clipped so that amplitudes stay >= 0 and centers within x. Errors are the
+    1σ values from the scaled covariance, as in fit_gaussian().
+    """
+    x_arr, y_arr = _check_axis(x, y)
+    if p0 is None:
+        p0 = find_gaussian_peaks(x_arr, y_arr, max_peaks=max_peaks, min_snr=min_snr)
+    if isinstance(p0, MultiPeakFitResult):
+        start, offset = p0.parameters, p0.offset
+    else:
+        start = np.asarray(p0, dtype=float).reshape(-1, 3)
+        offset = float(np.percentile(y_arr, 10))
+    k = len(start)
+    if k == 0:
+        raise ValueError("no peaks to fit.")
+
+    spacing = float(np.min(np.diff(x_arr)))
+    lower = np.append(np.tile([0.0, x_arr[0], spacing / 10], k), -np.inf)
+    upper = np.append(np.tile([np.inf, x_arr[-1], x_arr[-1] - x_arr[0]], k), np.inf)
+    p = np.clip(np.append(start.ravel(), offset), lower, upper)
+
+    model = _SparseGaussians(x_arr, y_arr, support)
+    state = model.evaluate(p)
+    r = model.residual(p, state)
+    cost = float(np.dot(r, r))
+    n_evals = 1
+    lam = 1e-3
+    converged = False
+    diag_idx = np.arange(len(p))
+    for _ in range(max_iter):
+        JTJ, g = model.normal_equations(p, state, r)
+        diag = JTJ[diag_idx, diag_idx]
+        A = JTJ.copy()
+        A[diag_idx, diag_idx] += lam * np.maximum(diag, 1e-12 * diag.max() + 1e-300)
+        try:
+            delta = np.linalg.solve(A, -g)
+        except np.linalg.LinAlgError:
+            delta = np.linalg.lstsq(A, -g, rcond=None)[0]
+        p_new = np.clip(p + delta, lower, upper)
+
+        state_new = model.evaluate(p_new)
+        r_new = model.residual(p_new, state_new)
+        cost_new = float(np.dot(r_new, r_new))
+        n_evals += 1
+
+        if np.isfinite(cost_new) and cost_new < cost:
+            step = p_new - p
+            small_step = np.all(np.abs(step) <= xtol * (np.abs(p) + xtol))
+            small_gain = cost - cost_new <= ftol * cost
+            p, state, r, cost = p_new, state_new, r_new, cost_new
+            lam /= 10
+            if small_step or small_gain:
+                converged = True
+                break
+        else:
+            lam *= 10
+            if lam > 1e12:
+                break
+
+    JTJ, _ = model.normal_equations(p, state, r)
+    dof = max(len(x_arr) - len(p), 1)
+    pcov = np.linalg.pinv(JTJ) * (cost / dof)
+    perr = np.sqrt(np.abs(np.diag(pcov)))
+
+    order = np.argsort(p[1:-1:3])
+    cols = np.append((3 * order[:, None] + np.arange(3)).ravel(), 3 * k)
+    p, perr, pcov = p[cols], perr[cols], pcov[np.ix_(cols, cols)]
+
+    return MultiPeakFitResult(
+        amplitude=p[0:-1:3],
+        center=p[1:-1:3],
+        sigma=p[2:-1:3],
+        offset=float(p[-1]),
+        amplitude_err=perr[0:-1:3],
+        center_err=perr[1:-1:3],
+        sigma_err=perr[2:-1:3],
+        offset_err=float(perr[-1]),
+        covariance=pcov,
+        residual_sum_squares=cost,
+        n_function_evals=n_evals,
+        converged=converged,
+    )
+
+
+class _SparseGaussians:
+    """
+    Residual and normal equations of offset + sum_k A_k·exp(-(x - c_k)² / 2σ_k²) - y, with
+    parameters p = (A_1, c_1, σ_1, ..., A_K, c_K, σ_K, offset). Peak k only covers the
+    samples lo_k .. hi_k - 1 within c_k ± support·σ_k; evaluate() returns those windows,
+    concatenated peak by peak, and their exponentials for one p, which residual() and
+    normal_equations() then share.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, support: float) -> None:
+        self.x = x
+        self.y = y
+        self.support = support
+
+    def evaluate(self, p: np.ndarray) -> tuple[np.ndarray, ...]:
+        center, sigma = p[1:-1:3], p[2:-1:3]
+        lo = np.searchsorted(self.x, center - self.support * sigma, side="left")
+        hi = np.searchsorted(self.x, center + self.support * sigma, side="right")
+        lengths = hi - lo
+        starts = np.cumsum(lengths) - lengths
+        peak = np.repeat(np.arange(len(center)), lengths)
+        rows = np.arange(lengths.sum()) + np.repeat(lo - starts, lengths)
+        dx = self.x[rows] - center[peak]
+        e = dx * dx
+        e *= -0.5 / sigma[peak] ** 2
+        np.exp(e, out=e)
+        return lo, hi, starts, rows, peak, dx, e
+
+    def residual(self, p: np.ndarray, state: tuple[np.ndarray, ...]) -> np.ndarray:
+        *_, rows, peak, _, e = state
+        r = np.bincount(rows, weights=p[0:-1:3][peak] * e, minlength=len(self.x))
+        r += p[-1] - self.y
+        return r
+
+    def normal_equations(
+        self, p: np.ndarray, state: tuple[np.ndarray, ...], r: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        J^T J ((3K + 1)^2) and J^T r. The 3 Jacobian columns of a peak are nonzero only in
+        its window, so the 3x3 block of peaks k and l is a product over the overlap of
+        their windows and is zero if they do not overlap. The offset column is all ones.
+        """
+        lo, hi, starts, rows, peak, dx, e = state
+        k = len(lo)
+        amplitude, sigma = p[0:-1:3][peak], p[2:-1:3][peak]
+        G = np.empty((3, len(rows)))
+        G[0] = e
+        np.multiply(amplitude * e * dx, 1 / sigma ** 2, out=G[1])
+        np.multiply(G[1], dx / sigma, out=G[2])
+
+        JTJ = np.zeros((3 * k + 1, 3 * k + 1))
+        first = np.maximum(lo[:, None], lo[None, :])
+        last = np.minimum(hi[:, None], hi[None, :])
+        for a, b in zip(*np.nonzero(np.triu(last > first))):
+            # the overlap as slices of the concatenated windows of a and b
+            ga = G[:, starts[a] + first[a, b] - lo[a] : starts[a] + last[a, b] - lo[a]]
+            gb = G[:, starts[b] + first[a, b] - lo[b] : starts[b] + last[a, b] - lo[b]]
+            block = ga @ gb.T
+            JTJ[3 * a : 3 * a + 3, 3 * b : 3 * b + 3] = block
+            JTJ[3 * b : 3 * b + 3, 3 * a : 3 * a + 3] = block.T
+
+        used = hi > lo
+        column_sums = np.zeros((3, k))
+        column_sums[:, used] = np.add.reduceat(G, starts[used], axis=1)
+        weighted = np.zeros((3, k))
+        weighted[:, used] = np.add.reduceat(G * r[rows], starts[used], axis=1)
+        JTJ[:-1, -1] = JTJ[-1, :-1] = column_sums.T.ravel()
+        JTJ[-1, -1] = len(self.x)
+        g = np.append(weighted.T.ravel(), r.sum())
+        return JTJ, g
+
+
+def _check_axis(x, y) -> tuple[np.ndarray, np.ndarray]:
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    if x_arr.ndim != 1 or x_arr.shape != y_arr.shape:
+        raise ValueError("x and y must be 1-D arrays of the same length.")
+    if len(x_arr) < 3 or not np.all(np.diff(x_arr) > 0):
+        raise ValueError("x must be strictly increasing with at least 3 points.")
+    return x_arr, y_arr
+
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import Executor
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from base_core.fitting.enums import StartSampling
+from base_core.fitting.fit_models import FitModel
+from base_core.fitting.functions import fit_model
+from base_core.fitting.models import FitResult, MultiStartResult
+from base_core.math.models import WavelengthGrid
+
+
+def fit_multistart(
+    model: FitModel,
+    x: Sequence[float] | WavelengthGrid,
+    y: Sequence[float],
+    *,
+    search: Mapping[str, tuple[float, float]] | None = None,
+    n_starts: int = 64,
+    sampling: StartSampling = StartSampling.SOBOL,
+    seed: int = 0,
+    batch_size: int = 8,
+    n_agree: int = 4,
+    rtol: float = 1e-3,
+    executor: Executor | None = None,
+) -> MultiStartResult:
+    """
+    Local fits from many start points, for multimodal models such as the CFG projections.
+
+    The first start is the model's own initial guess. The others replace the
+    parameters in `search` (default: model.search_space, e.g. phase and
+    acceleration) with Sobol or grid samples inside the given ranges. Starts
+    run in batches of batch_size, optionally on an executor (e.g. a process
+    pool). The run stops early once n_agree starts have landed in the best
+    minimum.
+
+    Two fits are the same minimum if their residuals agree within rtol and
+    every canonical parameter agrees within its 1σ error plus rtol. Batches
+    and result order are fixed, so a given seed always gives the same result.
+    """
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    # the local fits run on the grid itself so they share its cached axis terms
+    x_fit = x if isinstance(x, WavelengthGrid) else x_arr
+    sampling = StartSampling(sampling)
+
+    if search is None:
+        if model.search_space is None:
+            raise ValueError(f"model {model.name!r} has no default search space; pass search=...")
+        search = model.search_space(x_arr, y_arr, **model.constants)
+    unknown = set(search) - set(model.parameters)
+    if unknown:
+        raise ValueError(f"unknown parameters in search: {sorted(unknown)}")
+
+    starts = _start_points(model, x_arr, y_arr, search, n_starts, sampling, seed)
+
+    fits: list[FitResult] = []
+    n_failed = 0
+    n_run = 0
+    minima: list[list[FitResult]] = []
+    for begin in range(0, len(starts), batch_size):
+        batch = starts[begin : begin + batch_size]
+        if executor is None:
+            outcomes = [_fit_from_start(model, x_fit, y_arr, p0) for p0 in batch]
+        else:
+            outcomes = list(
+                executor.map(
+                    _fit_from_start,
+                    itertools.repeat(model),
+                    itertools.repeat(x_fit),
+                    itertools.repeat(y_arr),
+                    batch,
+                )
+            )
+        n_run += len(batch)
+        n_failed += sum(outcome is None for outcome in outcomes)
+        fits.extend(outcome for outcome in outcomes if outcome is not None)
+
+        minima = _group_minima(model, fits, rtol)
+        if minima and len(minima[0]) >= n_agree:
+            break
+
+    if not fits:
+        raise RuntimeError(f"none of the {n_run} starts converged.")
+
+    return MultiStartResult(
+        best=minima[0][0],
+        minima=[group[0] for group in minima],
+        n_starts=n_run,
+        n_failed=n_failed,
+        n_agree=len(minima[0]),
+    )
+
+
+def _start_points(
+    model: FitModel,
+    x: np.ndarray,
+    y: np.ndarray,
+    search: Mapping[str, tuple[float, float]],
+    n_starts: int,
+    sampling: StartSampling,
+    seed: int,
+) -> np.ndarray:
+    names = list(search)
+    columns = [model.parameters.index(name) for name in names]
+    low = np.array([search[name][0] for name in names], dtype=float)
+    high = np.array([search[name][1] for name in names], dtype=float)
+
+    unit = _unit_samples(sampling, max(n_starts - 1, 0), len(names), seed)
+    starts = np.tile(model.guess(x, y), (len(unit) + 1, 1))
+    starts[1:, columns] = low + unit * (high - low)
+    return np.clip(starts, model.lower, model.upper)
+
+
+def _unit_samples(sampling: StartSampling, n: int, dim: int, seed: int) -> np.ndarray:
+    if n == 0 or dim == 0:
+        return np.zeros((n, dim))
+    if sampling is StartSampling.GRID:
+        per_axis = int(np.ceil(n ** (1 / dim)))
+        ticks = (np.arange(per_axis) + 0.5) / per_axis
+        grid = np.array(list(itertools.product(ticks, repeat=dim)))
+        # spread the first n points over the whole grid instead of its first rows
+        pick = np.linspace(0, len(grid) - 1, n).round().astype(int)
+        return grid[pick]
+
+    from scipy.stats import qmc
+
+    sobol = qmc.Sobol(d=dim, scramble=True, seed=seed)
+    return sobol.random_base2(int(np.ceil(np.log2(n))))[:n]
+
+
+def _fit_from_start(model: FitModel, x: np.ndarray | WavelengthGrid, y: np.ndarray, p0: np.ndarray) -> FitResult | None:
+    try:
+        result = fit_model(model, x, y, p0=p0)
+    except (RuntimeError, ValueError):
+        return None
+    if not np.isfinite(result.residual_sum_squares):
+        return None
+    return result
+
+
+def _group_minima(model: FitModel, fits: list[FitResult], rtol: float) -> list[list[FitResult]]:
+    """
+    Cluster fits into distinct minima. Groups are sorted by their best residual;
+    each group's first entry is its best fit.
+    """
+    groups: list[list[FitResult]] = []
+    representatives: list[tuple[float, np.ndarray, np.ndarray]] = []
+
+    for fit in sorted(fits, key=lambda f: f.residual_sum_squares):
+        values = _canonical(model, fit.values)
+        for group, (rss, rep, tol) in zip(groups, representatives):
+            same_cost = abs(fit.residual_sum_squares - rss) <= rtol * max(rss, 1e-300)
+            if same_cost and np.all(np.abs(values - rep) <= tol):
+                group.append(fit)
+                break
+        else:
+            errors = np.array([fit.errors[name] for name in model.parameters])
+            errors = np.where(np.isfinite(errors), errors, 0.0)
+            groups.append([fit])
+            representatives.append((fit.residual_sum_squares, values, errors + rtol * np.abs(values)))
+
+    return groups
+
+
+def _canonical(model: FitModel, values: np.ndarray) -> np.ndarray:
+    return model.canonical_form(values) if model.canonical_form is not None else np.asarray(values)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Hashable, Sequence
+
+import numpy as np
+
+from base_core.fitting.fit_models import GAUSSIAN_MODEL, FitModel
+from base_core.fitting.functions import fit_model
+from base_core.fitting.models import FitResult
+from base_core.math.models import WavelengthGrid
+
+
+@dataclass
+class FitStats:
+    n_fits: int = 0
+    n_warm: int = 0
+    n_fallback: int = 0
+    n_failed: int = 0
+    total_function_evals: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+    @property
+    def mean_function_evals(self) -> float:
+        return self.total_function_evals / self.n_fits if self.n_fits else 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.n_fits if self.n_fits else 0.0
+
+    def merge(self, other: "FitStats") -> "FitStats":
+        return FitStats(
+            n_fits=self.n_fits + other.n_fits,
+            n_warm=self.n_warm + other.n_warm,
+            n_fallback=self.n_fallback + other.n_fallback,
+            n_failed=self.n_failed + other.n_failed,
+            total_function_evals=self.total_function_evals + other.total_function_evals,
+            total_seconds=self.total_seconds + other.total_seconds,
+            last_seconds=max(self.last_seconds, other.last_seconds),
+        )
+
+
+@dataclass
+class _SourceState:
+    values: np.ndarray | None
+    mean_square: float
+    stats: FitStats
+
+
+class FitSession:
+    """
+    Warm-started fits for consecutive frames, keyed per source.
+
+    Each source's last converged parameters are the start values for its next
+    frame. If the mean-square residual at those start values (or after the warm
+    fit) exceeds residual_jump times the previous one, or the warm fit fails,
+    the frame is refitted from the model's fresh initial guess.
+
+    n_warm counts fits that started from the previous parameters;
+    n_fallback counts frames that had to be refitted from a fresh guess.
+    """
+
+    def __init__(self, model: FitModel = GAUSSIAN_MODEL, *, residual_jump: float = 4.0) -> None:
+        self._model = model
+        self._residual_jump = residual_jump
+        self._lock = threading.Lock()
+        self._sources: dict[Hashable, _SourceState] = {}
+
+    @property
+    def model(self) -> FitModel:
+        return self._model
+
+    def fit(self, source: Hashable, x: Sequence[float] | WavelengthGrid, y: Sequence[float]) -> FitResult:
+        x_arr = x if isinstance(x, WavelengthGrid) else np.asarray(x, dtype=float)
+        y_arr = np.asarray(y, dtype=float)
+
+        with self._lock:
+            state = self._sources.get(source)
+            start = None if state is None else state.values
+            previous_ms = np.inf if state is None else state.mean_square
+
+        t0 = time.perf_counter()
+        nfev = 0
+        warm = False
+        fallback = False
+        result: FitResult | None = None
+
+        if start is not None:
+            residual = y_arr - self._model.evaluate(x_arr, *start)
+            if np.mean(residual ** 2) <= self._residual_jump * previous_ms:
+                try:
+                    result = fit_model(self._model, x_arr, y_arr, p0=start)
+                    nfev += result.n_function_evals or 0
+                    warm = True
+                    if self._mean_square(result, y_arr) > self._residual_jump * previous_ms:
+                        result = None
+                except (RuntimeError, ValueError):
+                    result = None
+            fallback = result is None
+
+        try:
+            if result is None:
+                result = fit_model(self._model, x_arr, y_arr)
+                nfev += result.n_function_evals or 0
+        except BaseException:
+            self._record(source, None, np.inf, warm, fallback, nfev, time.perf_counter() - t0, failed=True)
+            raise
+
+        self._record(
+            source, result.values, self._mean_square(result, y_arr), warm, fallback, nfev, time.perf_counter() - t0
+        )
+        return result
+
+    def stats(self, source: Hashable | None = None) -> FitStats:
+        """
+        Statistics for one source, or summed over all sources.
+        """
+        with self._lock:
+            if source is not None:
+                state = self._sources.get(source)
+                return FitStats() if state is None else replace(state.stats)
+            total = FitStats()
+            for state in self._sources.values():
+                total = total.merge(state.stats)
+            return total
+
+    def reset(self, source: Hashable | None = None) -> None:
+        with self._lock:
+            if source is None:
+                self._sources.clear()
+            else:
+                self._sources.pop(source, None)
+
+    def _record(
+        self,
+        source: Hashable,
+        values: np.ndarray | None,
+        mean_square: float,
+        warm: bool,
+        fallback: bool,
+        nfev: int,
+        seconds: float,
+        *,
+        failed: bool = False,
+    ) -> None:
+        with self._lock:
+            state = self._sources.get(source)
+            if state is None:
+                state = self._sources[source] = _SourceState(values=None, mean_square=np.inf, stats=FitStats())
+            if not failed:
+                state.values = values
+                state.mean_square = mean_square
+            s = state.stats
+            s.n_fits += 1
+            s.n_warm += warm
+            s.n_fallback += fallback
+            s.n_failed += failed
+            s.total_function_evals += nfev
+            s.total_seconds += seconds
+            s.last_seconds = seconds
+
+    @staticmethod
+    def _mean_square(result: FitResult, y: np.ndarray) -> float:
+        return result.residual_sum_squares / max(len(y), 1)
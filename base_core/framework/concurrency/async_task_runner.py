@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import AsyncIterable, Awaitable, Callable, Hashable, Iterable, Optional, Union
+
+from .interfaces import T
+from .models import AsyncStreamHandle
+
+_END = object()
+
+
+@dataclass
+class _Entry:
+    token: int
+    task: asyncio.Task
+    stop_event: Optional[threading.Event] = None
+
+
+class AsyncTaskRunner:
+    """
+    asyncio counterpart of TaskRunner, for services that live on an event loop:
+    - run(): awaitable one-shot (an asyncio.Task)
+    - stream(): producer yields many items; the handle is an async iterator over the latest ones
+    - key/cancel_previous/drop_outdated: the same "latest wins" semantics as TaskRunner
+
+    Callbacks run on the loop, inside the task, with no thread hop. Jobs run on the loop:
+    coroutine functions are awaited and plain functions are called inline, unless
+    offload=True sends them to `executor` (None: the loop's default executor).
+    Cancelling cancels the asyncio task, so a coroutine is interrupted at its current await.
+    Must be used from the thread running the loop. As in TaskRunner, a key is only tracked
+    while its latest task runs.
+    """
+
+    def __init__(self, executor: Executor | None = None) -> None:
+        self._executor = executor
+        self._entries: dict[Hashable, _Entry] = {}
+        self._tokens = itertools.count(1)
+
+    def _next_token_and_cancel_prev(self, key: Hashable | None, *, cancel_previous: bool) -> int:
+        if key is None:
+            return 0
+
+        prev = self._entries.get(key)
+        if prev is not None and cancel_previous:
+            prev.task.cancel()
+            if prev.stop_event is not None:
+                prev.stop_event.set()
+
+        return next(self._tokens)
+
+    def _set_entry(
+        self,
+        key: Hashable | None,
+        token: int,
+        task: asyncio.Task,
+        stop_event: Optional[threading.Event],
+    ) -> None:
+        if key is None:
+            return
+        self._entries[key] = _Entry(token=token, task=task, stop_event=stop_event)
+        task.add_done_callback(lambda _: self._forget(key, token))
+
+    def _forget(self, key: Hashable, token: int) -> None:
+        cur = self._entries.get(key)
+        if cur is not None and cur.token == token:
+            del self._entries[key]
+
+    def _is_latest(self, key: Hashable | None, token: int, *, drop_outdated: bool) -> bool:
+        if key is None or not drop_outdated:
+            return True
+        cur = self._entries.get(key)
+        return cur is not None and cur.token == token
+
+    def run(
+        self,
+        fn: Callable[[], Union[T, Awaitable[T]]],
+        *,
+        on_success: Optional[Callable[[T], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        key: Hashable | None = None,
+        cancel_previous: bool = False,
+        drop_outdated: bool = True,
+        offload: bool = False,
+    ) -> asyncio.Task[T]:
+        loop = asyncio.get_running_loop()
+        token = self._next_token_and_cancel_prev(key, cancel_previous=cancel_previous)
+
+        if on_success is None and on_error is None:
+            if offload:
+                coro = self._offload(fn)
+            elif inspect.iscoroutinefunction(fn):
+                coro = fn()
+            else:
+                coro = self._call(fn)
+        else:
+            coro = self._call_with_callbacks(fn, offload, key, token, drop_outdated, on_success, on_error)
+
+        task = loop.create_task(coro)
+        self._set_entry(key, token, task, stop_event=None)
+        return task
+
+    async def _offload(self, fn: Callable[[], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+    async def _call(self, fn: Callable[[], Union[T, Awaitable[T]]]) -> T:
+        result = fn()
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _call_with_callbacks(
+        self,
+        fn: Callable[[], Union[T, Awaitable[T]]],
+        offload: bool,
+        key: Hashable | None,
+        token: int,
+        drop_outdated: bool,
+        on_success: Optional[Callable[[T], None]],
+        on_error: Optional[Callable[[BaseException], None]],
+    ) -> T:
+        try:
+            res = await (self._offload(fn) if offload else self._call(fn))
+        except BaseException as e:
+            if on_error is not None and self._is_latest(key, token, drop_outdated=drop_outdated):
+                on_error(e)
+            raise
+        if on_success is not None and self._is_latest(key, token, drop_outdated=drop_outdated):
+            on_success(res)
+        return res
+
+    def stream(
+        self,
+        producer: Callable[[threading.Event], Union[AsyncIterable[T], Iterable[T]]],
+        *,
+        on_item: Optional[Callable[[T], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        on_complete: Optional[Callable[[], None]] = None,
+        key: Hashable | None = None,
+        cancel_previous: bool = False,
+        drop_outdated: bool = True,
+        offload: bool = False,
+    ) -> AsyncStreamHandle[T]:
+        """
+        producer(stop_event) returns an async iterable, or a plain iterable that is iterated
+        on the loop (offload=False, yielding to the loop between items) or with every next()
+        in the executor (offload=True). Items go to on_item and to the handle's async iterator.
+        """
+        loop = asyncio.get_running_loop()
+        stop_event = threading.Event()
+        token = self._next_token_and_cancel_prev(key, cancel_previous=cancel_previous)
+        handle: AsyncStreamHandle[T] = AsyncStreamHandle(stop_event)
+
+        def deliver(item: T) -> bool:
+            if stop_event.is_set() or not self._is_latest(key, token, drop_outdated=drop_outdated):
+                return False
+            if on_item is not None:
+                on_item(item)
+            handle._publish(item)
+            return True
+
+        async def run_loop() -> None:
+            error: Optional[BaseException] = None
+            try:
+                source = producer(stop_event)
+                if hasattr(source, "__aiter__"):
+                    iterator = aiter(source)
+                    try:
+                        async for item in iterator:
+                            if not deliver(item):
+                                break
+                    finally:
+                        if hasattr(iterator, "aclose"):
+                            await iterator.aclose()
+                elif offload:
+                    iterator = iter(source)
+                    try:
+                        while not stop_event.is_set():
+                            item = await loop.run_in_executor(self._executor, next, iterator, _END)
+                            if item is _END or not deliver(item):
+                                break
+                    finally:
+                        if hasattr(iterator, "close"):
+                            try:
+                                iterator.close()
+                            except ValueError:
+                                # cancelled while next() still runs in the executor; the
+                                # producer sees stop_event at its next item
+                                pass
+                else:
+                    for item in source:
+                        if not deliver(item):
+                            break
+                        await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                error = e
+                if on_error is not None:
+                    on_error(e)
+            finally:
+                stop_event.set()
+                handle._finish(error)
+                if on_complete is not None:
+                    on_complete()
+
+        task = loop.create_task(run_loop())
+        handle.task = task
+        self._set_entry(key, token, task, stop_event=stop_event)
+        return handle
+
+    def cancel(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        if entry.stop_event is not None:
+            entry.stop_event.set()
+        return entry.task.cancel()
+
+    def cancel_all(self) -> None:
+        for k in list(self._entries.keys()):
+            self.cancel(k)
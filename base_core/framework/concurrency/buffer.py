@@ -15,7 +15,8 @@ class Buffer(Generic[T]):
     """
     Thread-safe 'latest item' buffer.
     - Multiple readers can read the same latest value (no consumption).
-    - Each set() increments a version counter (useful for triggers).
+    - Each set() increments a version counter (useful for triggers);
+      wait_for_version() blocks until a given version is reached.
     """
 
     def __init__(self) -> None:
@@ -38,3 +39,19 @@ class Buffer(Generic[T]):
     def version(self) -> int:
         with self._lock:
             return self._version
+
+    def get_with_version(self) -> tuple[Optional[T], int]:
+        """
+        The latest value and its version, read together.
+        """
+        with self._lock:
+            return self._value, self._version
+
+    def wait_for_version(self, version: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until the version reaches `version` (e.g. last seen + 1) or timeout seconds pass.
+        Returns the current version, which is below `version` on timeout.
+        """
+        with self._lock:
+            self._cond.wait_for(lambda: self._version >= version, timeout)
+            return self._version
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class DeliveryPolicy(str, Enum):
+    LATEST   = "latest"
+    BATCH    = "batch"
+    MAX_RATE = "max_rate"
@@ -1,20 +1,13 @@
 from __future__ import annotations
 
 import threading
-from dataclasses import dataclass
 from typing import Callable, Hashable, Iterable, Optional, Protocol, TypeVar
 from concurrent.futures import Future
 
-T = TypeVar("T")
-
+from .enums import DeliveryPolicy
+from .models import StreamHandle
 
-@dataclass(frozen=True)
-class StreamHandle:
-    stop_event: threading.Event
-    future: Future[None]
-
-    def stop(self) -> None:
-        self.stop_event.set()
+T = TypeVar("T")
 
 
 class ITaskRunner(Protocol):
@@ -40,6 +33,10 @@ class ITaskRunner(Protocol):
         key: Hashable | None = None,
         cancel_previous: bool = False,
         drop_outdated: bool = True,
+        policy: DeliveryPolicy = DeliveryPolicy.LATEST,
+        max_rate: float | None = None,
+        max_batch: int | None = None,
+        stack: bool = False,
     ) -> StreamHandle:
         ...
 
@@ -1,12 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import math
 from concurrent.futures import Future
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 import threading
-from typing import Optional
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+_EMPTY = object()
+
+@dataclass
+class StreamStats:
+    """
+    Item counters of one TaskRunner.stream(); produced = delivered + coalesced + dropped
+    once the stream has ended.
+    - produced: items taken from the producer
+    - delivered: on_item calls
+    - coalesced: items handed to on_item in a batch after its first item
+    - dropped: items replaced by a newer one, cut from a full batch or discarded because
+      the stream was stopped or outdated
+    """
+    produced: int = 0
+    delivered: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+
+
+class LatencyHistogram:
+    """
+    Durations in power-of-two buckets: counts[0] holds those below 1 µs, counts[i] those in
+    [2^(i-1), 2^i) µs and the last bucket everything longer. record() is O(1).
+    """
+
+    N_BUCKETS = 32
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        bucket = math.frexp(seconds * 1e6)[1]
+        self.counts[min(max(bucket, 0), self.N_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper edge (seconds) of the bucket holding the q-quantile, 0 <= q <= 1, at most max.
+        """
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(2.0 ** i * 1e-6, self.max)
+        return self.max
+
+    def copy(self) -> "LatencyHistogram":
+        other = LatencyHistogram()
+        other.counts = list(self.counts)
+        other.count, other.total, other.max = self.count, self.total, self.max
+        return other
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyHistogram(count={self.count}, mean={self.mean:.3g}, "
+            f"p50={self.percentile(0.5):.3g}, p99={self.percentile(0.99):.3g}, max={self.max:.3g})"
+        )
+
+
+@dataclass
+class TaskMetrics:
+    """
+    Jobs (run()) and streams (stream()) of a TaskRunner or of one of its keys.
+    - submitted; in_flight: submitted and not finished yet
+    - completed, failed, cancelled: how finished ones ended (cancelled: before they started)
+    - dropped_outdated: run() results whose callbacks were skipped because the key had a newer job
+    - queued: time from submission to start; run: time from start to end (for a stream,
+      until its last item is delivered)
+    """
+    submitted: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    dropped_outdated: int = 0
+    queued: LatencyHistogram = field(default_factory=LatencyHistogram)
+    run: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def copy(self) -> "TaskMetrics":
+        return replace(self, queued=self.queued.copy(), run=self.run.copy())
+
 
 @dataclass(frozen=True)
 class StreamHandle:
     stop_event: threading.Event
     future: Future[None]
+    stats: StreamStats = field(default_factory=StreamStats)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+
+class AsyncStreamHandle(Generic[T]):
+    """
+    Handle of AsyncTaskRunner.stream().
+    - stop(): ask the producer to stop
+    - `async for item in handle`: the latest item not seen yet (items produced while the
+      consumer is busy are skipped); ends when the stream ends and re-raises its error
+    - `await handle`: wait until the stream has ended
+    Meant for one consuming coroutine.
+    """
+
+    def __init__(self, stop_event: threading.Event) -> None:
+        self.stop_event = stop_event
+        self.task: Optional[asyncio.Task[None]] = None
+        self._latest: object = _EMPTY
+        self._ready = asyncio.Event()
+        self._finished = False
+        self._error: Optional[BaseException] = None
 
     def stop(self) -> None:
         self.stop_event.set()
+
+    def _publish(self, item: T) -> None:
+        self._latest = item
+        self._ready.set()
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        self._finished = True
+        self._error = error
+        self._ready.set()
+
+    def __aiter__(self) -> "AsyncStreamHandle[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        while self._latest is _EMPTY:
+            if self._finished:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        item, self._latest = self._latest, _EMPTY
+        return item  # type: ignore[return-value]
+
+    def __await__(self):
+        return self.task.__await__()
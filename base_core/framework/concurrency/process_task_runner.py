@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import Manager
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty, Full
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
+
+from .enums import DeliveryPolicy
+from .interfaces import T
+from .models import StreamHandle
+from .task_runner import TaskRunner, _Timing
+
+# how often blocked queue operations re-check the stop events (seconds)
+_POLL_INTERVAL = 0.05
+_STREAM_QUEUE_SIZE = 16
+
+_ITEM, _DONE, _ERROR = "item", "done", "error"
+
+
+@dataclass(frozen=True)
+class _SharedArray:
+    """
+    Stand-in for an ndarray whose data sits in the shared-memory block `name`.
+    """
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class ProcessTaskRunner(TaskRunner):
+    """
+    TaskRunner on a ProcessPoolExecutor, for CPU-bound jobs that would hold the GIL.
+
+    run()/stream()/cancel() keep the TaskRunner semantics (key, cancel_previous,
+    drop_outdated; callbacks run in this process). Jobs and producers must be
+    picklable: module-level functions, or functools.partial objects of them.
+
+    NumPy arrays of at least shared_memory_threshold bytes do not go through pickle:
+    - arguments of a partial are copied into shared memory once, and the worker maps them
+    - arrays returned by a job or yielded by a producer are written into shared memory
+      by the worker and copied out here
+    Arrays are found at the top level and inside tuples, lists and dicts. NumPy is only
+    touched if it has already been imported.
+
+    stream() producers run in a worker and send their items through a manager queue.
+    They get a manager Event with the threading.Event interface as stop event. A pump
+    thread here forwards items and stop requests. close() shuts down the manager, the
+    pump threads and the default dispatcher; the process pool belongs to the caller.
+    dispatcher and max_metric_keys are passed on to TaskRunner.
+    """
+
+    def __init__(
+        self,
+        executor: ProcessPoolExecutor,
+        *,
+        shared_memory_threshold: int = 1 << 20,
+        dispatcher: Executor | None = None,
+        max_metric_keys: int = 256,
+    ) -> None:
+        super().__init__(executor, dispatcher=dispatcher, max_metric_keys=max_metric_keys)  # type: ignore[arg-type]
+        self._threshold = shared_memory_threshold
+        self._pumps = ThreadPoolExecutor(thread_name_prefix="process-stream")
+        self._manager = None
+        self._manager_lock = threading.Lock()
+        if os.name == "posix":
+            # workers must share this process's resource tracker, or segments they create
+            # would be reported as leaked (and unlinked) when they exit
+            from multiprocessing import resource_tracker
+
+            resource_tracker.ensure_running()
+
+    def close(self) -> None:
+        self.cancel_all()
+        self._pumps.shutdown(wait=True)
+        with self._manager_lock:
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+        super().close()
+
+    def _submit(self, fn: Callable[[], T], timing: _Timing) -> Future[T]:
+        # queued time includes the transfers to and from the worker; jobs that raise in
+        # the worker are not timed
+        created: list[SharedMemory] = []
+        job = _share_callable(fn, self._threshold, created)
+        outer: _ChainedFuture[T] = _ChainedFuture()
+        try:
+            inner = self._executor.submit(_run_job, job, self._threshold)
+        except BaseException:
+            _release(created)
+            raise
+        outer._inner = inner
+
+        def transfer(f: Future) -> None:
+            _release(created)
+            if f.cancelled():
+                Future.cancel(outer)
+                return
+            try:
+                result, seconds = f.result()
+                timing.finished = time.perf_counter()
+                timing.started = max(timing.submitted, timing.finished - seconds)
+                outer.set_result(_materialize(result))
+            except BaseException as e:
+                timing.failed = True
+                outer.set_exception(e)
+
+        inner.add_done_callback(transfer)
+        return outer
+
+    def _submit_stream(self, loop: Callable[[], None]) -> Future[None]:
+        return self._pumps.submit(loop)
+
+    def stream(
+        self,
+        producer: Callable[[threading.Event], Iterable[T]],
+        *,
+        on_item: Callable[[T], None],
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        on_complete: Optional[Callable[[], None]] = None,
+        key: Hashable | None = None,
+        cancel_previous: bool = False,
+        drop_outdated: bool = True,
+        policy: DeliveryPolicy = DeliveryPolicy.LATEST,
+        max_rate: float | None = None,
+        max_batch: int | None = None,
+        stack: bool = False,
+    ) -> StreamHandle:
+        return super().stream(
+            functools.partial(self._remote_items, producer),
+            on_item=on_item,
+            on_error=on_error,
+            on_complete=on_complete,
+            key=key,
+            cancel_previous=cancel_previous,
+            drop_outdated=drop_outdated,
+            policy=policy,
+            max_rate=max_rate,
+            max_batch=max_batch,
+            stack=stack,
+        )
+
+    def _remote_items(self, producer: Callable[[threading.Event], Iterable[T]], stop_event: threading.Event) -> Iterator[T]:
+        """
+        Runs on a pump thread: starts producer in a worker and yields its items until it
+        finishes, fails or stop_event is set.
+        """
+        manager = self._get_manager()
+        queue = manager.Queue(_STREAM_QUEUE_SIZE)
+        remote_stop = manager.Event()
+        future = self._executor.submit(_run_producer, producer, queue, remote_stop, self._threshold)
+        try:
+            while not stop_event.is_set():
+                try:
+                    kind, payload = queue.get(timeout=_POLL_INTERVAL)
+                except Empty:
+                    if future.done():
+                        future.result()  # re-raises if the worker died
+                        return
+                    continue
+                if kind == _ITEM:
+                    yield _materialize(payload)
+                elif kind == _DONE:
+                    return
+                else:
+                    raise payload
+        finally:
+            remote_stop.set()
+            if not future.cancel():
+                # the producer stops at its next item; then nothing is added to the queue
+                wait([future])
+            # release the shared memory of items that were never delivered
+            try:
+                while True:
+                    kind, payload = queue.get_nowait()
+                    if kind == _ITEM:
+                        _release_shared(payload)
+            except Empty:
+                pass
+
+    def _get_manager(self):
+        with self._manager_lock:
+            if self._manager is None:
+                self._manager = Manager()
+            return self._manager
+
+
+class _ChainedFuture(Future):
+    """
+    Completes with the (shared-memory decoded) outcome of a process-pool future.
+    cancel() cancels that future and, like any executor future, fails once it runs.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._inner: Optional[Future] = None
+
+    def cancel(self) -> bool:
+        inner = self._inner
+        if inner is not None and not inner.cancel():
+            return False
+        return super().cancel()
+
+
+# --- worker side --------------------------------------------------------------
+
+def _run_job(job: Callable[[], Any], threshold: int) -> tuple[Any, float]:
+    opened: list[SharedMemory] = []
+    try:
+        started = time.perf_counter()
+        result = _attach_callable(job, opened)()
+        seconds = time.perf_counter() - started
+        return _share(result, threshold, []), seconds
+    finally:
+        _close(opened)
+
+
+def _run_producer(producer: Callable[[Any], Iterable[Any]], queue, stop_event, threshold: int) -> None:
+    def put(message: tuple[str, Any]) -> bool:
+        while not stop_event.is_set():
+            try:
+                queue.put(message, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    try:
+        for item in producer(stop_event):
+            if stop_event.is_set():
+                break
+            created: list[SharedMemory] = []
+            if not put((_ITEM, _share(item, threshold, created))):
+                _release(created)
+                break
+        put((_DONE, None))
+    except BaseException as e:
+        put((_ERROR, e))
+
+
+# --- shared-memory transfer ---------------------------------------------------
+
+def _share_callable(fn: Callable[[], Any], threshold: int, created: list[SharedMemory]) -> Callable[[], Any]:
+    if not isinstance(fn, functools.partial):
+        return fn
+    args = _share(fn.args, threshold, created)
+    keywords = _share(fn.keywords, threshold, created)
+    return functools.partial(fn.func, *args, **keywords)
+
+
+def _attach_callable(fn: Callable[[], Any], opened: list[SharedMemory]) -> Callable[[], Any]:
+    if not isinstance(fn, functools.partial):
+        return fn
+    return functools.partial(fn.func, *_attach(fn.args, opened), **_attach(fn.keywords, opened))
+
+
+def _share(value: Any, threshold: int, created: list[SharedMemory]) -> Any:
+    """
+    value with every ndarray of at least threshold bytes copied into a new shared-memory
+    block (appended to created, closed here but not unlinked) and replaced by a _SharedArray.
+    """
+    np = sys.modules.get("numpy")
+    if np is None:
+        return value
+    if isinstance(value, np.ndarray):
+        if value.nbytes < threshold or value.dtype.hasobject:
+            return value
+        shm = SharedMemory(create=True, size=value.nbytes)
+        created.append(shm)
+        np.ndarray(value.shape, value.dtype, buffer=shm.buf)[...] = value
+        shared = _SharedArray(shm.name, value.shape, value.dtype.str)
+        shm.close()
+        return shared
+    if type(value) in (tuple, list):
+        return type(value)(_share(v, threshold, created) for v in value)
+    if type(value) is dict:
+        return {k: _share(v, threshold, created) for k, v in value.items()}
+    return value
+
+
+def _attach(value: Any, opened: list[SharedMemory]) -> Any:
+    """
+    value with every _SharedArray replaced by an ndarray view of its block (appended to opened).
+    """
+    if isinstance(value, _SharedArray):
+        import numpy as np
+
+        shm = SharedMemory(name=value.name)
+        opened.append(shm)
+        return np.ndarray(value.shape, np.dtype(value.dtype), buffer=shm.buf)
+    if type(value) in (tuple, list):
+        return type(value)(_attach(v, opened) for v in value)
+    if type(value) is dict:
+        return {k: _attach(v, opened) for k, v in value.items()}
+    return value
+
+
+def _materialize(value: Any) -> Any:
+    """
+    value with every _SharedArray copied into a regular ndarray; the blocks are unlinked.
+    """
+    if isinstance(value, _SharedArray):
+        import numpy as np
+
+        shm = SharedMemory(name=value.name)
+        try:
+            return np.ndarray(value.shape, np.dtype(value.dtype), buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+    if type(value) in (tuple, list):
+        return type(value)(_materialize(v) for v in value)
+    if type(value) is dict:
+        return {k: _materialize(v) for k, v in value.items()}
+    return value
+
+
+def _release_shared(value: Any) -> None:
+    if isinstance(value, _SharedArray):
+        shm = SharedMemory(name=value.name)
+        shm.close()
+        shm.unlink()
+    elif type(value) in (tuple, list):
+        for v in value:
+            _release_shared(v)
+    elif type(value) is dict:
+        for v in value.values():
+            _release_shared(v)
+
+
+def _release(blocks: list[SharedMemory]) -> None:
+    for shm in blocks:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _close(blocks: list[SharedMemory]) -> None:
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:
+            # the job kept a view of its argument; the mapping goes away with the process
+            pass
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import time
+from threading import Condition, Lock
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class FrameOverwrittenError(RuntimeError):
+    pass
+
+
+class FrameRingBuffer:
+    """
+    Fixed-capacity ring of equally shaped frames (e.g. detector images) stored in one
+    preallocated NumPy slab of shape (capacity, *frame_shape); nothing is allocated per frame.
+
+    - write() copies a frame into the next slot and returns its sequence number (0, 1, ...)
+    - frame()/latest() return zero-copy views into the slab
+    - reader() creates a cursor that walks the frames in order and counts dropped ones
+
+    A view stays valid until the writer comes around to its slot again. Overwrites are
+    detected seqlock-style: a writer claims a sequence number before it copies, so after
+    using a view, is_valid(seq) tells whether the data may have been overwritten
+    meanwhile. copy() does copy + check in one go.
+
+    Writers are serialized by a lock; readers do not take it unless they wait for frames.
+    NumPy is imported when a buffer is created.
+    """
+
+    def __init__(self, capacity: int, frame_shape: tuple[int, ...], dtype: Any = "float64") -> None:
+        import numpy as np
+
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1.")
+        self._np = np
+        self._capacity = capacity
+        self._slab = np.zeros((capacity,) + tuple(frame_shape), dtype=dtype)
+        self._lock = Lock()
+        self._cond = Condition(self._lock)
+        # frames [0, _written) are complete; frames below _claimed - capacity may be overwritten
+        self._written = 0
+        self._claimed = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def frame_shape(self) -> tuple[int, ...]:
+        return self._slab.shape[1:]
+
+    @property
+    def dtype(self) -> "np.dtype":
+        return self._slab.dtype
+
+    @property
+    def written(self) -> int:
+        """
+        Number of frames written so far (= sequence number of the next frame).
+        """
+        return self._written
+
+    def write(self, frame: "np.ndarray") -> int:
+        with self._cond:
+            seq = self._written
+            self._claimed = seq + 1
+            self._slab[seq % self._capacity] = frame
+            self._written = seq + 1
+            self._cond.notify_all()
+            return seq
+
+    def write_many(self, frames: "np.ndarray") -> int:
+        """
+        Copy a (n, *frame_shape) stack in at most two slices; returns the sequence number
+        of the first frame. Only the last `capacity` frames are kept.
+        """
+        frames = self._np.asarray(frames)
+        n = len(frames)
+        with self._cond:
+            first = self._written
+            keep = frames[-self._capacity :] if n > self._capacity else frames
+            start = first + n - len(keep)
+            self._claimed = first + n
+            slot = start % self._capacity
+            head = min(len(keep), self._capacity - slot)
+            self._slab[slot : slot + head] = keep[:head]
+            self._slab[: len(keep) - head] = keep[head:]
+            self._written = first + n
+            self._cond.notify_all()
+            return first
+
+    def is_valid(self, seq: int) -> bool:
+        """
+        True if frame seq is written and its slot has not been claimed by a newer frame.
+        """
+        return self._claimed - self._capacity <= seq < self._written
+
+    def frame(self, seq: int) -> "np.ndarray":
+        """
+        Zero-copy view of frame seq; check is_valid(seq) after using it.
+        """
+        if not self.is_valid(seq):
+            raise FrameOverwrittenError(f"frame {seq} is not available (written: {self._written}).")
+        return self._slab[seq % self._capacity]
+
+    def latest(self) -> Optional[tuple[int, "np.ndarray"]]:
+        """
+        (seq, view) of the newest frame, or None if nothing was written yet.
+        """
+        seq = self._written - 1
+        if seq < 0:
+            return None
+        return seq, self._slab[seq % self._capacity]
+
+    def copy(self, seq: int, out: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """
+        Copy of frame seq; raises FrameOverwrittenError if it was overwritten before or during the copy.
+        """
+        view = self.frame(seq)
+        if out is None:
+            out = view.copy()
+        else:
+            self._np.copyto(out, view)
+        if not self.is_valid(seq):
+            raise FrameOverwrittenError(f"frame {seq} was overwritten while copying.")
+        return out
+
+    def wait_for(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until frame seq is written or timeout seconds pass.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._written > seq, timeout)
+
+    def reader(self, *, from_start: bool = False) -> "FrameReader":
+        """
+        A cursor over the frames written from now on (from_start: the oldest still available).
+        """
+        return FrameReader(self, max(0, self._written - self._capacity) if from_start else self._written)
+
+
+class FrameReader:
+    """
+    Per-consumer cursor over a FrameRingBuffer. Frames the writer overwrote before this
+    reader got to them are skipped and counted in `dropped`; so are frames that
+    validate() finds overwritten after use.
+    """
+
+    def __init__(self, ring: FrameRingBuffer, start: int) -> None:
+        self._ring = ring
+        self._next = start
+        self.dropped = 0
+        self.delivered = 0
+
+    @property
+    def position(self) -> int:
+        """
+        Sequence number of the next frame this reader returns.
+        """
+        return self._next
+
+    @property
+    def pending(self) -> int:
+        return max(0, self._ring.written - self._next)
+
+    def read(self, timeout: Optional[float] = None) -> Optional[tuple[int, "np.ndarray"]]:
+        """
+        (seq, view) of the next frame, waiting up to timeout seconds (None: forever) for it.
+        Returns None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._ring.written <= self._next and not self._ring.wait_for(self._next, remaining):
+                return None
+            self._skip_overwritten()
+            # skipping can land on a frame that is still being written
+            if self._next < self._ring.written:
+                break
+        seq = self._next
+        self._next += 1
+        self.delivered += 1
+        return seq, self._ring._slab[seq % self._ring.capacity]
+
+    def read_available(self) -> list[tuple[int, "np.ndarray"]]:
+        """
+        (seq, view) of every frame written since the last read, without waiting.
+        """
+        self._skip_overwritten()
+        end = self._ring.written
+        if self._next >= end:
+            return []
+        frames = [(seq, self._ring._slab[seq % self._ring.capacity]) for seq in range(self._next, end)]
+        self.delivered += len(frames)
+        self._next = end
+        return frames
+
+    def validate(self, seq: int) -> bool:
+        """
+        Call after using the view of frame seq: False (and counted as dropped) if it was
+        overwritten meanwhile.
+        """
+        if self._ring.is_valid(seq):
+            return True
+        self.dropped += 1
+        self.delivered -= 1
+        return False
+
+    def _skip_overwritten(self) -> None:
+        # frames whose slots a writer has claimed again are gone
+        oldest = self._ring._claimed - self._ring.capacity
+        if self._next < oldest:
+            self.dropped += oldest - self._next
+            self._next = oldest
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Callable, Hashable, Iterable, Optional
-from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 
-from .interfaces import T, ITaskRunner, StreamHandle
+from .enums import DeliveryPolicy
+from .interfaces import T, ITaskRunner
+from .models import StreamHandle, StreamStats, TaskMetrics
 
 
 @dataclass
@@ -15,18 +21,97 @@ class _Entry:
     stop_event: Optional[threading.Event] = None
 
 
+class _Timing:
+    """
+    Start/end time and outcome of one job or stream; started stays None if it never ran.
+    """
+
+    __slots__ = ("submitted", "started", "finished", "failed")
+
+    def __init__(self) -> None:
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.failed = False
+
+    def call(self, fn: Callable[[], T]) -> T:
+        self.started = time.perf_counter()
+        try:
+            return fn()
+        except BaseException:
+            self.failed = True
+            raise
+        finally:
+            self.finished = time.perf_counter()
+
+
 class TaskRunner(ITaskRunner):
     """
     Background execution helper:
     - run(): one-shot
-    - stream(): producer yields many items (delivers only the latest)
+    - stream(): producer yields many items, handed to on_item by a DeliveryPolicy
     - key/cancel_previous/drop_outdated: "latest wins" semantics
+
+    stream() callbacks run on `dispatcher` (default: a thread pool created on first use
+    and shut down by close()), so a slow on_item never blocks the producer. It must not
+    share workers with `executor`: a stream's loop waits for its last delivery, which
+    could then deadlock queued behind the loop.
+
+    A key is only tracked while its latest job or stream runs; tokens come from one
+    counter, so they keep increasing for a key that is reused after it was dropped.
+    metrics() and key_metrics() report counts and queue/run time histograms, the latter
+    for the max_metric_keys most recently used keys (0: none).
     """
 
-    def __init__(self, executor: ThreadPoolExecutor) -> None:
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        *,
+        dispatcher: Executor | None = None,
+        max_metric_keys: int = 256,
+    ) -> None:
         self._executor = executor
         self._lock = threading.RLock()
+        self._metrics_lock = threading.Lock()
         self._entries: dict[Hashable, _Entry] = {}
+        self._tokens = itertools.count(1)
+        if dispatcher is not None and dispatcher is executor:
+            # a stream's loop waits for its last delivery, which would queue behind it
+            raise ValueError("dispatcher must be a separate executor, not the one that runs the jobs.")
+        self._dispatcher = dispatcher
+        self._owns_dispatcher = dispatcher is None
+        self._metrics = TaskMetrics()
+        self._key_metrics: OrderedDict[Hashable, TaskMetrics] = OrderedDict()
+        self._max_metric_keys = max_metric_keys
+
+    def metrics(self) -> TaskMetrics:
+        """
+        Snapshot of the metrics of all jobs and streams.
+        """
+        with self._metrics_lock:
+            return self._metrics.copy()
+
+    def key_metrics(self) -> dict[Hashable, TaskMetrics]:
+        """
+        Snapshots of the per-key metrics, least recently used key first.
+        """
+        with self._metrics_lock:
+            return {k: m.copy() for k, m in self._key_metrics.items()}
+
+    def close(self) -> None:
+        self.cancel_all()
+        with self._lock:
+            dispatcher, owned = self._dispatcher, self._owns_dispatcher
+            if owned:
+                self._dispatcher = None
+        if owned and dispatcher is not None:
+            dispatcher.shutdown(wait=True)
+
+    def _get_dispatcher(self) -> Executor:
+        with self._lock:
+            if self._dispatcher is None:
+                self._dispatcher = ThreadPoolExecutor(thread_name_prefix="stream-dispatch")
+            return self._dispatcher
 
     def _next_token_and_cancel_prev(
         self,
@@ -38,13 +123,9 @@ class TaskRunner(ITaskRunner):
         if key is None:
             return 0
 
+        token = next(self._tokens)
         prev = self._entries.get(key)
-        if prev is None:
-            return 1
-
-        token = prev.token + 1
-
-        if cancel_previous:
+        if prev is not None and cancel_previous:
             prev.future.cancel()
             if prev.stop_event is not None:
                 prev.stop_event.set()
@@ -60,7 +141,82 @@ class TaskRunner(ITaskRunner):
     ) -> None:
         if key is None:
             return
-        self._entries[key] = _Entry(token=token, future=future, stop_event=stop_event)
+        cur = self._entries.get(key)
+        # a newer job with this key may have been registered while this one was submitted
+        if cur is None or cur.token < token:
+            self._entries[key] = _Entry(token=token, future=future, stop_event=stop_event)
+
+    def _start_metrics(self, key: Hashable | None) -> tuple[TaskMetrics, ...]:
+        """
+        Count a submission; returns the metrics to update when it finishes.
+        """
+        with self._metrics_lock:
+            targets: tuple[TaskMetrics, ...] = (self._metrics,)
+            if key is not None and self._max_metric_keys > 0:
+                per_key = self._key_metrics.get(key)
+                if per_key is None:
+                    per_key = self._key_metrics[key] = TaskMetrics()
+                    if len(self._key_metrics) > self._max_metric_keys:
+                        self._key_metrics.popitem(last=False)
+                else:
+                    self._key_metrics.move_to_end(key)
+                targets += (per_key,)
+            for m in targets:
+                m.submitted += 1
+                m.in_flight += 1
+            return targets
+
+    def _undo_start_metrics(self, targets: tuple[TaskMetrics, ...]) -> None:
+        # the submission itself failed
+        with self._metrics_lock:
+            for m in targets:
+                m.submitted -= 1
+                m.in_flight -= 1
+
+    def _finish(
+        self,
+        key: Hashable | None,
+        token: int,
+        timing: _Timing,
+        targets: tuple[TaskMetrics, ...],
+        future: Future,
+    ) -> None:
+        """
+        Done callback of every job and stream: forgets the key if this was its latest job
+        and records the metrics. Registered after the run() callbacks, which still need the entry.
+        """
+        if key is not None:
+            with self._lock:
+                cur = self._entries.get(key)
+                if cur is not None and cur.token == token:
+                    del self._entries[key]
+        started, finished = timing.started, timing.finished or time.perf_counter()
+        with self._metrics_lock:
+            for m in targets:
+                m.in_flight -= 1
+                if timing.failed:
+                    m.failed += 1
+                elif started is None:
+                    m.cancelled += 1
+                else:
+                    m.completed += 1
+                if started is not None:
+                    m.queued.record(started - timing.submitted)
+                    m.run.record(finished - started)
+
+    def _submit(self, fn: Callable[[], T], timing: _Timing) -> Future[T]:
+        """
+        Schedule a run() job through timing.call(). Subclasses override this to run jobs
+        elsewhere; they set timing.started/finished (or timing.failed) before the future
+        completes.
+        """
+        return self._executor.submit(timing.call, fn)
+
+    def _submit_stream(self, loop: Callable[[], None]) -> Future[None]:
+        """
+        Schedule the loop that drives a stream() producer and delivers its items.
+        """
+        return self._executor.submit(loop)
 
     def _is_latest(self, key: Hashable | None, token: int, *, drop_outdated: bool) -> bool:
         if key is None or not drop_outdated:
@@ -83,18 +239,31 @@ class TaskRunner(ITaskRunner):
                 key, cancel_previous=cancel_previous, new_stop_event=None
             )
 
-        fut: Future[T] = self._executor.submit(fn)
+        targets = self._start_metrics(key)
+        timing = _Timing()
+        try:
+            fut: Future[T] = self._submit(fn, timing)
+        except BaseException:
+            self._undo_start_metrics(targets)
+            raise
 
         with self._lock:
             self._set_entry(key, token, fut, stop_event=None)
 
+        finish = functools.partial(self._finish, key, token, timing, targets)
         if on_success is None and on_error is None:
+            fut.add_done_callback(finish)
             return fut
 
         def _done(f: Future[T]) -> None:
             with self._lock:
-                if not self._is_latest(key, token, drop_outdated=drop_outdated):
-                    return
+                latest = self._is_latest(key, token, drop_outdated=drop_outdated)
+            if not latest:
+                if not f.cancelled():
+                    with self._metrics_lock:
+                        for m in targets:
+                            m.dropped_outdated += 1
+                return
             try:
                 res = f.result()
             except BaseException as e:
@@ -105,6 +274,7 @@ class TaskRunner(ITaskRunner):
                 on_success(res)
 
         fut.add_done_callback(_done)
+        fut.add_done_callback(finish)
         return fut
 
     def stream(
@@ -117,61 +287,85 @@ class TaskRunner(ITaskRunner):
         key: Hashable | None = None,
         cancel_previous: bool = False,
         drop_outdated: bool = True,
+        policy: DeliveryPolicy = DeliveryPolicy.LATEST,
+        max_rate: float | None = None,
+        max_batch: int | None = None,
+        stack: bool = False,
     ) -> StreamHandle:
+        """
+        Run producer(stop_event) and hand its items to on_item on the dispatcher, with at
+        most one on_item call of this stream running at a time. Items that arrive while
+        on_item is busy are merged according to policy:
+        - LATEST: only the newest one is delivered
+        - BATCH: all of them are delivered as one list (stack: numpy.stack() of them),
+          keeping at most the newest max_batch
+        - MAX_RATE: like LATEST, with at most max_rate deliveries per second
+        max_rate also limits BATCH deliveries. When the producer ends, pending items are
+        still delivered; on_error and on_complete come after the last on_item. An exception
+        from on_item stops the stream and goes to on_error. handle.stats counts the items.
+        """
+        if policy is DeliveryPolicy.MAX_RATE and max_rate is None:
+            raise ValueError("DeliveryPolicy.MAX_RATE needs max_rate.")
+        if policy is DeliveryPolicy.LATEST and max_rate is not None:
+            raise ValueError("max_rate needs DeliveryPolicy.MAX_RATE or DeliveryPolicy.BATCH.")
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError("max_rate must be > 0.")
+        if max_batch is not None and max_batch < 1:
+            raise ValueError("max_batch must be >= 1.")
+
         stop_event = threading.Event()
 
         with self._lock:
             token = self._next_token_and_cancel_prev(
                 key, cancel_previous=cancel_previous, new_stop_event=stop_event
             )
+        targets = self._start_metrics(key)
+        timing = _Timing()
 
-        latest_lock = threading.Lock()
-        latest: Optional[T] = None
-        scheduled = False
-
-        def flush_latest() -> None:
-            nonlocal scheduled
+        def is_active() -> bool:
+            if stop_event.is_set():
+                return False
             with self._lock:
-                if not self._is_latest(key, token, drop_outdated=drop_outdated):
-                    scheduled = False
-                    return
-            with latest_lock:
-                value = latest
-                scheduled = False
-            if value is not None:
-                on_item(value)
-
-        def publish(item: T) -> None:
-            nonlocal latest, scheduled
-            with latest_lock:
-                latest = item
-                if scheduled:
-                    return
-                scheduled = True
-            flush_latest()
+                return self._is_latest(key, token, drop_outdated=drop_outdated)
+
+        stats = StreamStats()
+        delivery = _Delivery(
+            self._get_dispatcher(), on_item, is_active, stats,
+            policy=policy, max_rate=max_rate, max_batch=max_batch, stack=stack,
+        )
 
         def loop() -> None:
+            timing.started = time.perf_counter()
+            error: Optional[BaseException] = None
             try:
                 for item in producer(stop_event):
-                    if stop_event.is_set():
+                    if not delivery.publish(item):
                         break
-                    with self._lock:
-                        if not self._is_latest(key, token, drop_outdated=drop_outdated):
-                            break
-                    publish(item)
             except BaseException as e:
-                if on_error is not None:
-                    on_error(e)
+                error = e
             finally:
-                if on_complete is not None:
-                    on_complete()
-
-        fut: Future[None] = self._executor.submit(loop)
+                delivery.close()
+                timing.finished = time.perf_counter()
+                try:
+                    error = delivery.error or error
+                    timing.failed = error is not None
+                    if error is not None and on_error is not None:
+                        on_error(error)
+                finally:
+                    if on_complete is not None:
+                        on_complete()
 
+        # the loop checks is_active() under the lock, so it waits until the entry exists
         with self._lock:
+            try:
+                fut: Future[None] = self._submit_stream(loop)
+            except BaseException:
+                self._undo_start_metrics(targets)
+                raise
             self._set_entry(key, token, fut, stop_event=stop_event)
+        fut.add_done_callback(functools.partial(self._finish, key, token, timing, targets))
 
-        return StreamHandle(stop_event=stop_event, future=fut)
+        return StreamHandle(stop_event=stop_event, future=fut, stats=stats)
 
     def cancel(self, key: Hashable) -> bool:
         with self._lock:
@@ -187,3 +381,138 @@ class TaskRunner(ITaskRunner):
             keys = list(self._entries.keys())
         for k in keys:
             self.cancel(k)
+
+
+class _Delivery:
+    """
+    Hands the items of one stream to on_item on the dispatcher. At most one delivery is
+    scheduled or running at a time; items published meanwhile wait in `pending`, and the
+    delivery that finishes schedules the next one.
+    """
+
+    def __init__(
+        self,
+        dispatcher: Executor,
+        on_item: Callable[[Any], None],
+        is_active: Callable[[], bool],
+        stats: StreamStats,
+        *,
+        policy: DeliveryPolicy,
+        max_rate: float | None,
+        max_batch: int | None,
+        stack: bool,
+    ) -> None:
+        self._dispatcher = dispatcher
+        self._on_item = on_item
+        self._is_active = is_active
+        self._stats = stats
+        self._batch = policy is DeliveryPolicy.BATCH
+        self._interval = 0.0 if max_rate is None else 1.0 / max_rate
+        self._max_batch = max_batch
+        self._stack = stack
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: list[Any] = []
+        self._busy = False
+        self._timer: Optional[threading.Timer] = None
+        self._next_time = 0.0
+        self.error: Optional[BaseException] = None
+
+    def publish(self, item: Any) -> bool:
+        """
+        Queue item for delivery; False if the stream is no longer active or on_item failed.
+        """
+        active = self._is_active()
+        with self._cond:
+            self._stats.produced += 1
+            if not active or self.error is not None:
+                self._stats.dropped += 1
+                return False
+            if not self._batch and self._pending:
+                self._stats.dropped += 1
+                self._pending[0] = item
+            else:
+                self._pending.append(item)
+                if self._max_batch is not None and len(self._pending) > self._max_batch:
+                    del self._pending[0]
+                    self._stats.dropped += 1
+            if self._busy:
+                return True
+            self._busy = True
+        self._schedule()
+        return True
+
+    def close(self) -> None:
+        """
+        Wait until pending items are delivered, or discarded if the stream is inactive.
+        """
+        if not self._is_active():
+            with self._cond:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                    self._discard_pending()
+        with self._cond:
+            self._cond.wait_for(lambda: not self._busy)
+
+    def _schedule(self) -> None:
+        with self._cond:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                self._timer = threading.Timer(delay, self._wake)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        try:
+            self._dispatcher.submit(self._deliver)
+        except RuntimeError:
+            # the dispatcher was shut down
+            with self._cond:
+                self._discard_pending()
+
+    def _wake(self) -> None:
+        with self._cond:
+            if self._timer is None:
+                return  # cancelled by close()
+            self._timer = None
+        self._schedule()
+
+    def _deliver(self) -> None:
+        active = self._is_active()
+        with self._cond:
+            items, self._pending = self._pending, []
+            if not active:
+                self._stats.dropped += len(items)
+                self._busy = False
+                self._cond.notify_all()
+                return
+            self._next_time = time.monotonic() + self._interval
+        try:
+            if not self._batch:
+                self._on_item(items[0])
+            elif self._stack:
+                import numpy as np
+
+                self._on_item(np.stack(items))
+            else:
+                self._on_item(items)
+        except BaseException as e:
+            self.error = e
+        with self._cond:
+            self._stats.delivered += 1
+            self._stats.coalesced += len(items) - 1
+            if self.error is not None:
+                self._discard_pending()
+                return
+            if not self._pending:
+                self._busy = False
+                self._cond.notify_all()
+                return
+        # items arrived during on_item; the stream stays busy until they are delivered
+        self._schedule()
+
+    def _discard_pending(self) -> None:
+        # with self._cond held
+        self._stats.dropped += len(self._pending)
+        self._pending = []
+        self._busy = False
+        self._cond.notify_all()
@@ -0,0 +1,53 @@
+"""
+Lazy re-exports: the defining module is imported on first access, so importing
+base_core.math (or only base_core.math.enums) does not load NumPy.
+"""
+import importlib
+
+_EXPORTS = {
+    "AngleUnit": "enums",
+    "ConvolutionMethod": "enums",
+    "InterpolationKind": "enums",
+    "KernelType": "enums",
+    "PaddingMode": "enums",
+    "SmoothingMode": "enums",
+    "gaussian": "functions",
+    "cfg_envelope": "functions",
+    "usCFG_projection": "functions",
+    "cfCFG_projection": "functions",
+    "usCFG_projection_grid": "functions",
+    "cfCFG_projection_grid": "functions",
+    "Angle": "models",
+    "AngleArray": "models",
+    "Point": "models",
+    "PointArray": "models",
+    "Range": "models",
+    "RangeIndex": "models",
+    "WavelengthGrid": "models",
+    "ResamplingPlan": "resampling",
+    "resample": "resampling",
+    "resampling_plan": "resampling",
+    "clear_resampling_cache": "resampling",
+    "moving_average": "smoothing",
+    "StreamingMovingAverage": "smoothing",
+    "smoothing_kernel": "smoothing",
+    "convolve_smooth": "smoothing",
+    "gaussian_smooth": "smoothing",
+    "savgol_smooth": "smoothing",
+    "calibrate_fft_crossover": "smoothing",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
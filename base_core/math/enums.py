@@ -1,7 +1,34 @@
 from enum import Enum
-import numpy as np
+import math
 
 
 class AngleUnit(float, Enum):
     RAD = 1.0          
-    DEG = np.pi / 180.0    
\ No newline at end of file
+    DEG = math.pi / 180.0
+
+
+class SmoothingMode(str, Enum):
+    VALID = "valid"
+    SAME  = "same"
+
+
+class PaddingMode(str, Enum):
+    REFLECT = "reflect"
+    NEAREST = "nearest"
+
+
+class KernelType(str, Enum):
+    BOXCAR         = "boxcar"
+    GAUSSIAN       = "gaussian"
+    SAVITZKY_GOLAY = "savitzky_golay"
+
+
+class ConvolutionMethod(str, Enum):
+    AUTO   = "auto"
+    DIRECT = "direct"
+    FFT    = "fft"
+
+
+class InterpolationKind(str, Enum):
+    LINEAR = "linear"
+    CUBIC  = "cubic"
@@ -2,39 +2,223 @@
 from typing import Sequence
 import numpy as np
 
+from base_core.math.models import WavelengthGrid
 
+_FWHM_PER_SIGMA = float(np.sqrt(8 * np.log(2)))
 
-def gaussian(x: Sequence[float], A, x0, sigma, offset):
+
+def gaussian(x: Sequence[float] | WavelengthGrid, A, x0, sigma, offset):
     """
     1D Gaussian with constant offset.
     """
-    xs = np.array(x, dtype=float)
+    if isinstance(x, WavelengthGrid):
+        return A * x.gaussian_profile(x0, sigma) + offset
+    xs = np.asarray(x, dtype=float)
     
     return A * np.exp(-((xs - x0) ** 2) / (2 * sigma ** 2)) + offset
 
+def cfg_envelope(wavelengths: Sequence[float] | WavelengthGrid, carrier_wavelength, bandwidth):
+    """
+    Squared Gaussian envelope of the CFG projections, exp(-(λ - carrier)^2 / sigma^2)
+    with sigma = bandwidth / sqrt(8 ln 2).
+    """
+    # gaussian(sigma)^2 is the gaussian with sigma / sqrt(2)
+    sigma = bandwidth / (_FWHM_PER_SIGMA * np.sqrt(2))
+    if isinstance(wavelengths, WavelengthGrid):
+        return wavelengths.gaussian_profile(carrier_wavelength, sigma)
+    return gaussian(wavelengths, 1, carrier_wavelength, sigma, 0)
+
 def usCFG_projection(
-    wavelengths: Sequence[float],
+    wavelengths: Sequence[float] | WavelengthGrid,
     carrier_wavelength: float,
     starting_wavelength: float,
     bandwidth: float,
     baseline: float,
     phase: float,
     acceleration: float) -> list[float]:
-    wavelengths_np = np.array(wavelengths, dtype=float)
-    sigma = bandwidth / np.sqrt(8*np.log(2))
+    if isinstance(wavelengths, WavelengthGrid):
+        theta = acceleration * wavelengths.offset(starting_wavelength, 2)
+        theta += phase
+        return _cfg_from_theta(theta, cfg_envelope(wavelengths, carrier_wavelength, bandwidth), baseline)
+    wavelengths_np = np.asarray(wavelengths, dtype=float)
+    sigma = bandwidth / _FWHM_PER_SIGMA
     # maybe not square gaussian
-    return baseline + (1-baseline) * (gaussian(wavelengths, 1, carrier_wavelength, sigma, 0) * np.sin(phase + acceleration * (wavelengths_np - starting_wavelength)**2))**2
+    return baseline + (1-baseline) * (gaussian(wavelengths_np, 1, carrier_wavelength, sigma, 0) * np.sin(phase + acceleration * (wavelengths_np - starting_wavelength)**2))**2
 
 def cfCFG_projection(
 #S = const +  (1-const)*(Gaussian(lambda - carrier,FWHM)*sin(phase + average*(lambda - carrier) + acceleration*(lambda - carrier)^3 )^2 )
-    wavelengths: Sequence[float],
+    wavelengths: Sequence[float] | WavelengthGrid,
     carrier_wavelength: float,
     average_frequency: float,
     bandwidth: float,
     baseline: float,
     phase: float,
     acceleration: float) -> list[float]:
-    wavelengths_np = np.array(wavelengths, dtype=float)
-    sigma = bandwidth / np.sqrt(8*np.log(2))
+    if isinstance(wavelengths, WavelengthGrid):
+        theta = acceleration * wavelengths.offset(carrier_wavelength, 3)
+        theta += average_frequency * wavelengths.offset(carrier_wavelength)
+        theta += phase
+        return _cfg_from_theta(theta, cfg_envelope(wavelengths, carrier_wavelength, bandwidth), baseline)
+    wavelengths_np = np.asarray(wavelengths, dtype=float)
+    sigma = bandwidth / _FWHM_PER_SIGMA
     # maybe not square gaussian
-    return baseline + (1-baseline) * (gaussian(wavelengths, 1, carrier_wavelength, sigma, 0) * np.sin(phase + average_frequency*(wavelengths_np - carrier_wavelength) + acceleration * (wavelengths_np - carrier_wavelength)**3))**2
\ No newline at end of file
+    return baseline + (1-baseline) * (gaussian(wavelengths_np, 1, carrier_wavelength, sigma, 0) * np.sin(phase + average_frequency*(wavelengths_np - carrier_wavelength) + acceleration * (wavelengths_np - carrier_wavelength)**3))**2
+
+def _cfg_from_theta(theta: np.ndarray, envelope: np.ndarray, baseline) -> np.ndarray:
+    # baseline + (1 - baseline) * envelope * sin(theta)^2, in place on theta
+    np.sin(theta, out=theta)
+    theta *= theta
+    theta *= envelope
+    theta *= 1 - baseline
+    theta += baseline
+    return theta
+
+
+# Working-set budget per block of grid rows (output + scratch), sized for L2.
+_BLOCK_BYTES = 256 * 1024
+
+_ParamLike = float | Sequence[float] | np.ndarray
+
+
+def usCFG_projection_grid(
+    wavelengths: Sequence[float],
+    carrier_wavelength: _ParamLike,
+    starting_wavelength: _ParamLike,
+    bandwidth: _ParamLike,
+    baseline: _ParamLike,
+    phase: _ParamLike,
+    acceleration: _ParamLike,
+    *,
+    out: np.ndarray | None = None,
+    dtype: type = np.float64,
+    block_bytes: int = _BLOCK_BYTES,
+) -> np.ndarray:
+    """
+    usCFG_projection for N parameter sets at once -> (N, len(wavelengths)).
+
+    Parameters are scalars or length-N arrays (broadcast against each other).
+    Rows are evaluated in blocks that fit in `block_bytes`, in place in `out`
+    (allocated if not given), so peak memory is the output plus one block.
+    dtype=np.float32 halves memory and bandwidth at float32 accuracy.
+    """
+    wl, params, out = _prepare_grid(
+        wavelengths,
+        (carrier_wavelength, starting_wavelength, bandwidth, baseline, phase, acceleration),
+        out,
+        dtype,
+    )
+    carrier, start, bw, base, ph, acc = params
+    inv_var = -(8 * np.log(2)) / bw ** 2  # -1/sigma^2 of the squared gaussian
+    shared_start = np.all(start == start[0])
+    ds2_shared = (wl - start[0]) ** 2 if shared_start else None
+
+    rows = _block_rows(len(wl), out.itemsize, n_buffers=3 if shared_start else 4, block_bytes=block_bytes)
+    scratch = np.empty((rows, len(wl)), dtype=out.dtype)
+    for lo in range(0, len(out), rows):
+        hi = min(lo + rows, len(out))
+        o = out[lo:hi]
+        g2 = scratch[: hi - lo]
+        col = slice(lo, hi), None
+
+        # theta = phase + acceleration * (wl - start)^2 -> sin^2(theta)
+        if shared_start:
+            np.multiply(acc[col], ds2_shared, out=o)
+        else:
+            np.subtract(wl, start[col], out=o)
+            np.multiply(o, o, out=o)
+            o *= acc[col]
+        o += ph[col]
+        np.sin(o, out=o)
+        np.multiply(o, o, out=o)
+
+        # gaussian^2 = exp(-(wl - carrier)^2 / sigma^2)
+        np.subtract(wl, carrier[col], out=g2)
+        np.multiply(g2, g2, out=g2)
+        g2 *= inv_var[col]
+        np.exp(g2, out=g2)
+
+        o *= g2
+        o *= 1 - base[col]
+        o += base[col]
+    return out
+
+
+def cfCFG_projection_grid(
+    wavelengths: Sequence[float],
+    carrier_wavelength: _ParamLike,
+    average_frequency: _ParamLike,
+    bandwidth: _ParamLike,
+    baseline: _ParamLike,
+    phase: _ParamLike,
+    acceleration: _ParamLike,
+    *,
+    out: np.ndarray | None = None,
+    dtype: type = np.float64,
+    block_bytes: int = _BLOCK_BYTES,
+) -> np.ndarray:
+    """
+    cfCFG_projection for N parameter sets at once -> (N, len(wavelengths)).
+    Broadcasting, blocking and `out`/dtype behave as in usCFG_projection_grid.
+    """
+    wl, params, out = _prepare_grid(
+        wavelengths,
+        (carrier_wavelength, average_frequency, bandwidth, baseline, phase, acceleration),
+        out,
+        dtype,
+    )
+    carrier, avg, bw, base, ph, acc = params
+    inv_var = -(8 * np.log(2)) / bw ** 2
+
+    rows = _block_rows(len(wl), out.itemsize, n_buffers=3, block_bytes=block_bytes)
+    scratch = np.empty((2, rows, len(wl)), dtype=out.dtype)
+    for lo in range(0, len(out), rows):
+        hi = min(lo + rows, len(out))
+        o = out[lo:hi]
+        d = scratch[0, : hi - lo]
+        d2 = scratch[1, : hi - lo]
+        col = slice(lo, hi), None
+
+        np.subtract(wl, carrier[col], out=d)
+        np.multiply(d, d, out=d2)
+
+        # theta = phase + d * (average_frequency + acceleration * d^2) -> sin^2(theta)
+        np.multiply(d2, acc[col], out=o)
+        o += avg[col]
+        o *= d
+        o += ph[col]
+        np.sin(o, out=o)
+        np.multiply(o, o, out=o)
+
+        d2 *= inv_var[col]
+        np.exp(d2, out=d2)
+
+        o *= d2
+        o *= 1 - base[col]
+        o += base[col]
+    return out
+
+
+def _prepare_grid(
+    wavelengths: Sequence[float],
+    params: tuple[_ParamLike, ...],
+    out: np.ndarray | None,
+    dtype: type,
+) -> tuple[np.ndarray, list[np.ndarray], np.ndarray]:
+    dtype = np.dtype(dtype)
+    wl = np.asarray(wavelengths, dtype=dtype)
+    if wl.ndim != 1:
+        raise ValueError("wavelengths must be 1-D.")
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(p, dtype=dtype)) for p in params))
+    if columns[0].ndim != 1:
+        raise ValueError("parameters must be scalars or 1-D arrays.")
+
+    shape = (len(columns[0]), len(wl))
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape or out.dtype != dtype:
+        raise ValueError(f"out must have shape {shape} and dtype {dtype}.")
+    return wl, columns, out
+
+
+def _block_rows(n_cols: int, itemsize: int, *, n_buffers: int, block_bytes: int) -> int:
+    return max(1, block_bytes // max(1, n_cols * itemsize * n_buffers))
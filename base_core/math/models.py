@@ -1,6 +1,8 @@
+from collections import OrderedDict
 from dataclasses import dataclass
 import math
-from typing import Generic, Optional, Protocol, Self, TypeVar
+import threading
+from typing import Generic, Hashable, Optional, Protocol, Self, Sequence, TypeVar
 import numpy as np
 
 from base_core.math.enums import AngleUnit
@@ -27,6 +29,67 @@ class Angle(float):
         return float(self) / AngleUnit.DEG.value
 
 
+class AngleArray:
+    """
+    Many angles in radians, stored in one float64 array and wrapped to [-pi, pi)
+    like Angle. Indexing with an int gives an Angle, a slice or mask gives an
+    AngleArray.
+    """
+
+    __slots__ = ("_rad",)
+
+    def __init__(self, values: Sequence[float] | np.ndarray, unit: AngleUnit = AngleUnit.RAD, wrap: bool = True) -> None:
+        radians = np.array(values, dtype=np.float64)
+        if radians.ndim != 1:
+            raise ValueError("values must be 1-D.")
+        if unit is not AngleUnit.RAD:
+            radians *= unit.value
+        if wrap:
+            self._wrap_to_minus_pi_pi(radians)
+        self._rad = radians
+
+    @classmethod
+    def from_angles(cls, angles: Sequence[Angle]) -> "AngleArray":
+        # Angles are already wrapped (or were built with wrap=False on purpose)
+        return cls(np.fromiter(angles, dtype=np.float64, count=len(angles)), wrap=False)
+
+    @staticmethod
+    def _wrap_to_minus_pi_pi(rad: np.ndarray) -> None:
+        rad += math.pi
+        np.mod(rad, 2 * math.pi, out=rad)
+        rad -= math.pi
+
+    @property
+    def Rad(self) -> np.ndarray:
+        return self._rad
+
+    @property
+    def Deg(self) -> np.ndarray:
+        return self._rad / AngleUnit.DEG.value
+
+    def to(self, unit: AngleUnit) -> np.ndarray:
+        return self._rad if unit is AngleUnit.RAD else self._rad / unit.value
+
+    def __len__(self) -> int:
+        return len(self._rad)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Angle(self._rad[index], wrap=False)
+        return AngleArray(self._rad[index], wrap=False)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return np.array(self._rad, dtype=dtype)
+        return self._rad if dtype is None else np.asarray(self._rad, dtype=dtype)
+
+    def __repr__(self) -> str:
+        return f"AngleArray(n={len(self)})"
+
+    def to_angles(self) -> list[Angle]:
+        return [Angle(value, wrap=False) for value in self._rad.tolist()]
+
+
 @dataclass(frozen=True)
 class Point:
     x: float
@@ -40,17 +103,13 @@ class Point:
         self._set_y(self.y - point.y)
 
     def rotate(self, angle: Angle, center: Optional["Point"] = None) -> None:
-       
-        if center is None:
-            center = Point(0.0, 0.0)
-
-        cx, cy = center.x, center.y
+        cx, cy = (0.0, 0.0) if center is None else (center.x, center.y)
 
         tx = self.x - cx
         ty = self.y - cy
 
-        cos_a = np.cos(angle.Rad)
-        sin_a = np.sin(angle.Rad)
+        cos_a = math.cos(angle.Rad)
+        sin_a = math.sin(angle.Rad)
 
         rx = tx * cos_a - ty * sin_a
         ry = tx * sin_a + ty * cos_a
@@ -68,6 +127,115 @@ class Point:
         object.__setattr__(self, "y", value)
         
         
+class PointArray:
+    """
+    Many points stored as two contiguous float64 columns (x, y).
+
+    rotate, subtract and affine_transform work in place like their Point
+    counterparts; rotated, subtracted and affine_transformed return a
+    transformed copy. Indexing with an int gives a Point, a slice or mask
+    gives a PointArray (a view for slices, as in numpy). Contiguous float64
+    x and y are used without copying, so in-place methods modify them.
+    """
+
+    __slots__ = ("_x", "_y")
+
+    def __init__(self, x: Sequence[float] | np.ndarray, y: Sequence[float] | np.ndarray) -> None:
+        x_arr = np.ascontiguousarray(x, dtype=np.float64)
+        y_arr = np.ascontiguousarray(y, dtype=np.float64)
+        if x_arr.ndim != 1 or x_arr.shape != y_arr.shape:
+            raise ValueError("x and y must be 1-D arrays of the same length.")
+        self._x = x_arr
+        self._y = y_arr
+
+    @classmethod
+    def from_points(cls, points: Sequence[Point]) -> "PointArray":
+        n = len(points)
+        x = np.fromiter((p.x for p in points), dtype=np.float64, count=n)
+        y = np.fromiter((p.y for p in points), dtype=np.float64, count=n)
+        return cls(x, y)
+
+    @classmethod
+    def zeros(cls, n: int) -> "PointArray":
+        return cls(np.zeros(n), np.zeros(n))
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y
+
+    def __len__(self) -> int:
+        return len(self._x)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Point(float(self._x[index]), float(self._y[index]))
+        return PointArray(self._x[index], self._y[index])
+
+    def __repr__(self) -> str:
+        return f"PointArray(n={len(self)})"
+
+    def to_points(self) -> list[Point]:
+        return [Point(x, y) for x, y in zip(self._x.tolist(), self._y.tolist())]
+
+    def copy(self) -> "PointArray":
+        return PointArray(self._x.copy(), self._y.copy())
+
+    def distance_from_center(self) -> np.ndarray:
+        return np.hypot(self._x, self._y)
+
+    def subtract(self, point: "Point | PointArray") -> None:
+        self._x -= point.x
+        self._y -= point.y
+
+    def rotate(self, angle: "Angle | AngleArray", center: Optional[Point] = None) -> None:
+        """
+        Rotate all points by one Angle, or each point by its own angle from an AngleArray.
+        """
+        if isinstance(angle, AngleArray):
+            if len(angle) != len(self):
+                raise ValueError("AngleArray must have one angle per point.")
+            cos_a = np.cos(angle.Rad)
+            sin_a = np.sin(angle.Rad)
+        else:
+            cos_a = math.cos(angle.Rad)
+            sin_a = math.sin(angle.Rad)
+        x, y = self._x, self._y
+
+        if center is not None:
+            x -= center.x
+            y -= center.y
+
+        # x' = x cos - y sin, y' = x sin + y cos, with two temporaries
+        x_sin = x * sin_a
+        y_sin = y * sin_a
+        x *= cos_a
+        x -= y_sin
+        y *= cos_a
+        y += x_sin
+
+        if center is not None:
+            x += center.x
+            y += center.y
+
+    def affine_transform(self, transform_parameter: float) -> None:
+        self._x *= transform_parameter
+
+    def subtracted(self, point: "Point | PointArray") -> "PointArray":
+        return PointArray(self._x - point.x, self._y - point.y)
+
+    def rotated(self, angle: "Angle | AngleArray", center: Optional[Point] = None) -> "PointArray":
+        out = self.copy()
+        out.rotate(angle, center)
+        return out
+
+    def affine_transformed(self, transform_parameter: float) -> "PointArray":
+        return PointArray(self._x * transform_parameter, self._y.copy())
+
+
 class SupportsOrdering(Protocol):
     def __lt__(self, other: Self, /) -> bool: ...
     def __le__(self, other: Self, /) -> bool: ...
@@ -89,4 +257,307 @@ class Range(Generic[T]):
         if inclusive:
             return self.min <= value <= self.max
         else:
-            return self.min < value < self.max
\ No newline at end of file
+            return self.min < value < self.max
+
+
+class WavelengthGrid:
+    """
+    A fixed wavelength axis that caches the axis-dependent terms of the models evaluated on it.
+
+    gaussian, usCFG_projection, cfCFG_projection and the fit models accept a
+    WavelengthGrid in place of the wavelength array. The offsets (x - c)^k are
+    cached per center c, and Gaussian profiles per (center, sigma), in an LRU
+    cache of max_entries arrays. Repeated evaluations (parameter scans, or the
+    function and Jacobian calls of one fit step) then only redo the
+    parameter-dependent part. Cached arrays are read-only.
+
+    set_values() replaces the axis and drops every cached term.
+    """
+
+    def __init__(self, values: Sequence[float], *, max_entries: int = 32) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1.")
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self.set_values(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._values.shape
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __reduce__(self):
+        # the lock does not pickle; workers rebuild their own cache
+        return (WavelengthGrid, (self._values,), {"_max_entries": self._max_entries})
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return np.array(self._values, dtype=dtype)
+        return self._values if dtype is None else np.asarray(self._values, dtype=dtype)
+
+    def set_values(self, values: Sequence[float]) -> None:
+        array = np.array(values, dtype=float)
+        if array.ndim != 1:
+            raise ValueError("values must be 1-D.")
+        array.flags.writeable = False
+        with self._lock:
+            self._values = array
+            self._cache.clear()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def offset(self, center: float, power: int = 1) -> np.ndarray:
+        """
+        (x - center) ** power. Array-valued centers are computed without caching.
+        """
+        if not _is_scalar(center):
+            return (self._values - np.asarray(center, dtype=float)[..., None]) ** power
+        center = float(center)
+        if power == 1:
+            return self._cached(("offset", center, 1), lambda: self._values - center)
+        return self._cached(("offset", center, power), lambda: self.offset(center) ** power)
+
+    def gaussian_profile(self, center: float, sigma: float) -> np.ndarray:
+        """
+        exp(-(x - center)^2 / (2 sigma^2)).
+        """
+        if not (_is_scalar(center) and _is_scalar(sigma)):
+            sigma = np.asarray(sigma, dtype=float)[..., None]
+            return np.exp(-self.offset(center, 2) / (2 * sigma ** 2))
+        center, sigma = float(center), float(sigma)
+        return self._cached(
+            ("gaussian", center, sigma), lambda: np.exp(self.offset(center, 2) * (-0.5 / sigma ** 2))
+        )
+
+    def _cached(self, key: Hashable, compute) -> np.ndarray:
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+            values = self._values
+
+        # compute outside the lock; nested terms (offset -> power -> profile) take it again
+        value = compute()
+        value.flags.writeable = False
+        with self._lock:
+            if self._values is not values:
+                return value  # axis replaced meanwhile, do not cache a stale term
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+        return value
+
+
+def _is_scalar(value) -> bool:
+    # cheaper than np.ndim for the common float case
+    return not isinstance(value, (np.ndarray, list, tuple)) or np.ndim(value) == 0
+
+
+class RangeIndex:
+    """
+    Bulk membership queries of values against many Range objects.
+
+    The sorted unique endpoints e_0 < ... < e_{U-1} split the axis into slots:
+    slot 2i is the open gap below e_i, slot 2i+1 the point e_i. Every range
+    covers a contiguous run of slots, and each value is located with one binary
+    search. counts() reads a prefix sum of range starts and ends per slot;
+    pairs() and containing() walk a centered interval tree over the slot runs,
+    all values one tree level per step. Building costs O(K log K) time and
+    O(K) memory; a query over N values costs O(N log K) plus the size of its
+    output.
+
+    Range indices in results refer to the order of `ranges`.
+    """
+
+    def __init__(self, ranges: Sequence[Range[float]]) -> None:
+        self._ranges = tuple(ranges)
+        low = np.array([r.min for r in self._ranges], dtype=np.float64)
+        high = np.array([r.max for r in self._ranges], dtype=np.float64)
+        self._endpoints = np.unique(np.concatenate([low, high]))
+        a = np.searchsorted(self._endpoints, low)
+        b = np.searchsorted(self._endpoints, high)
+        self._n_slots = 2 * len(self._endpoints) + 1
+
+        # first/last covered slot; an exclusive range with min == max covers nothing
+        self._bounds = {
+            True: (2 * a + 1, 2 * b + 1),
+            False: (2 * a + 2, 2 * b),
+        }
+        self._coverage = {inclusive: self._build_coverage(*self._bounds[inclusive]) for inclusive in (True, False)}
+        self._trees = {inclusive: _IntervalTree(*self._bounds[inclusive], self._n_slots) for inclusive in (True, False)}
+
+    @property
+    def ranges(self) -> tuple[Range[float], ...]:
+        return self._ranges
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def pairs(self, values, *, inclusive: bool = True) -> tuple[np.ndarray, np.ndarray]:
+        """
+        All (value index, range index) pairs with values[value index] inside the range,
+        ordered by value index, then range index.
+        """
+        return self._trees[inclusive].query(self._slots(values))
+
+    def containing(self, value: float, *, inclusive: bool = True) -> np.ndarray:
+        """
+        Indices of the ranges that contain one value.
+        """
+        return self._trees[inclusive].query(self._slots([value]))[1]
+
+    def counts(self, values, *, inclusive: bool = True) -> np.ndarray:
+        """
+        Number of ranges containing each value.
+        """
+        return self._coverage[inclusive][self._slots(values)]
+
+    def contains_any(self, values, *, inclusive: bool = True) -> np.ndarray:
+        return self.counts(values, inclusive=inclusive) > 0
+
+    def mask(self, values, *, inclusive: bool = True) -> np.ndarray:
+        """
+        (K, N) boolean mask: mask[k, n] is True if values[n] lies in ranges[k].
+        """
+        slots = self._slots(values)
+        first, last = self._bounds[inclusive]
+        return (slots >= first[:, None]) & (slots <= last[:, None])
+
+    def _slots(self, values) -> np.ndarray:
+        v = np.asarray(values, dtype=np.float64).ravel()
+        i = np.searchsorted(self._endpoints, v)
+        at_endpoint = self._endpoints[np.minimum(i, len(self._endpoints) - 1)] == v if len(self._endpoints) else False
+        # NaN sorts past the last endpoint and lands in the final gap, which no range covers
+        return 2 * i + at_endpoint
+
+    def _build_coverage(self, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        # +1 where a range starts, -1 after it ends; the running sum counts the covering ranges
+        used = last >= first
+        marks = np.bincount(first[used], minlength=self._n_slots + 1)
+        marks -= np.bincount(last[used] + 1, minlength=self._n_slots + 1)
+        return np.cumsum(marks[:-1])
+
+
+class _IntervalTree:
+    """
+    Centered interval tree over integer slot runs [first, last], built and queried
+    level by level with array operations. Each node keeps the runs that contain its
+    center twice, sorted by first and by last (descending); runs entirely below the
+    center go to the left child, runs entirely above it to the right one. The center
+    is the median midpoint of the node's runs, so the depth is O(log K).
+    """
+
+    def __init__(self, first: np.ndarray, last: np.ndarray, n_slots: int) -> None:
+        self._stride = n_slots + 1
+        centers, lefts, rights = [], [], []
+        stored_node, stored_id = [], []
+        ids = np.flatnonzero(last >= first)
+        node = np.zeros(len(ids), dtype=np.int64)
+        n_nodes = 1 if len(ids) else 0
+        level_start = 0
+        while len(ids):
+            # the median midpoint of each node's runs is its center
+            mid = (first[ids] + last[ids]) // 2
+            order = np.lexsort((mid, node))
+            ids, node, mid = ids[order], node[order], mid[order]
+            level_nodes, starts, sizes = np.unique(node, return_index=True, return_counts=True)
+            center = np.empty(n_nodes - level_start, dtype=np.int64)
+            center[level_nodes - level_start] = mid[starts + (sizes - 1) // 2]
+            centers.append(center)
+
+            c = center[node - level_start]
+            here = (first[ids] <= c) & (last[ids] >= c)
+            stored_node.append(node[here])
+            stored_id.append(ids[here])
+
+            # number the children of this level's nodes after all nodes so far
+            left = np.full(len(center), -1, dtype=np.int64)
+            right = np.full(len(center), -1, dtype=np.int64)
+            below = last[ids] < c
+            moving = ~here
+            child_key = 2 * node[moving] + (~below[moving])
+            child_keys, child_of = np.unique(child_key, return_inverse=True)
+            child_ids = n_nodes + np.arange(len(child_keys))
+            parents, sides = child_keys // 2 - level_start, child_keys % 2
+            left[parents[sides == 0]] = child_ids[sides == 0]
+            right[parents[sides == 1]] = child_ids[sides == 1]
+            lefts.append(left)
+            rights.append(right)
+
+            level_start = n_nodes
+            n_nodes += len(child_keys)
+            ids = ids[moving]
+            node = child_ids[child_of.ravel()]
+
+        self._center = np.concatenate(centers) if centers else np.empty(0, dtype=np.int64)
+        self._left = np.concatenate(lefts) if lefts else np.empty(0, dtype=np.int64)
+        self._right = np.concatenate(rights) if rights else np.empty(0, dtype=np.int64)
+        node = np.concatenate(stored_node) if stored_node else np.empty(0, dtype=np.int64)
+        ids = np.concatenate(stored_id) if stored_id else np.empty(0, dtype=np.int64)
+
+        # per node: runs by ascending first, and by descending last, as one sorted key each
+        by_first = np.lexsort((ids, first[ids], node))
+        by_last = np.lexsort((ids, -last[ids], node))
+        self._first_ids = ids[by_first]
+        self._first_keys = node[by_first] * self._stride + first[ids][by_first]
+        self._last_ids = ids[by_last]
+        self._last_keys = node[by_last] * self._stride + (self._stride - 1 - last[ids][by_last])
+        self._offsets = np.searchsorted(node[by_first], np.arange(n_nodes + 1))
+
+    def query(self, slots: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (value index, run index) of every slot inside a run, sorted by both.
+        """
+        value_parts, run_parts = [], []
+        values = np.arange(len(slots)) if len(self._center) else np.empty(0, dtype=np.int64)
+        node = np.zeros(len(values), dtype=np.int64)
+        while len(values):
+            s = slots[values]
+            c = self._center[node]
+            start = self._offsets[node]
+            below, above = s < c, s > c
+            # below the center: the runs with first <= s; above: those with last >= s; at it: all
+            end = self._offsets[node + 1].copy()
+            end[below] = np.searchsorted(self._first_keys, node[below] * self._stride + s[below], side="right")
+            stop = np.searchsorted(
+                self._last_keys, node[above] * self._stride + (self._stride - 1 - s[above]), side="right"
+            )
+            counts = end - start
+            counts[above] = stop - start[above]
+
+            pos = np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            from_last = np.repeat(above, counts)
+            value_parts.append(np.repeat(values, counts))
+            run_parts.append(np.where(from_last, self._last_ids[np.where(from_last, pos, 0)], self._first_ids[pos]))
+
+            nxt = np.where(below, self._left[node], np.where(above, self._right[node], -1))
+            keep = nxt >= 0
+            values, node = values[keep], nxt[keep]
+
+        value_idx = np.concatenate(value_parts) if value_parts else np.empty(0, dtype=np.int64)
+        run_idx = np.concatenate(run_parts) if run_parts else np.empty(0, dtype=np.int64)
+        order = np.lexsort((run_idx, value_idx))
+        return value_idx[order], run_idx[order]
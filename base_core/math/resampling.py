@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from base_core.math.enums import InterpolationKind
+
+_PLAN_CACHE_SIZE = 32
+# rows per block of apply() so that the output block and one gathered tap stay in L2
+_BLOCK_BYTES = 128 * 1024
+_plan_cache: "OrderedDict[tuple, ResamplingPlan]" = OrderedDict()
+_plan_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ResamplingPlan:
+    """
+    Interpolation from a source axis onto a target axis as a sparse linear map:
+    out[..., m] = sum_k weights[k, m] * y[..., indices[k, m]], with 2 taps (linear) or 4 (cubic).
+
+    Values outside the source range are held at the end values, as in np.interp.
+    """
+    source: np.ndarray
+    target: np.ndarray
+    kind: InterpolationKind
+    indices: np.ndarray
+    weights: np.ndarray
+
+    def apply(self, y: Sequence[float] | np.ndarray, *, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Resample y of shape (..., len(source)), e.g. a (B, N) stack of spectra, to (..., len(target)).
+        """
+        y_arr = np.asarray(y, dtype=float)
+        n_source, n_target = len(self.source), len(self.target)
+        if y_arr.shape[-1] != n_source:
+            raise ValueError(f"last axis of y must have length {n_source}.")
+        shape = y_arr.shape[:-1] + (n_target,)
+        if out is None:
+            out = np.empty(shape)
+        elif out.shape != shape or out.dtype != np.float64:
+            raise ValueError(f"out must be a float64 array of shape {shape}.")
+
+        rows = y_arr.reshape(-1, n_source)
+        # reshape() of a non-contiguous out would be a copy; fill a contiguous one instead
+        result = out if out.flags.c_contiguous else np.empty(shape)
+        out_rows = result.reshape(-1, n_target)
+        block = max(1, _BLOCK_BYTES // (n_target * out.itemsize))
+        scratch = np.empty((min(block, len(rows)), n_target))
+        # gather-multiply-accumulate one tap at a time on blocks of rows
+        for start in range(0, len(rows), block):
+            y_block = rows[start : start + block]
+            o = out_rows[start : start + block]
+            tap = scratch[: len(y_block)]
+            np.take(y_block, self.indices[0], axis=1, out=o)
+            o *= self.weights[0]
+            for k in range(1, len(self.indices)):
+                np.take(y_block, self.indices[k], axis=1, out=tap)
+                tap *= self.weights[k]
+                o += tap
+        if result is not out:
+            np.copyto(out, result)
+        return out
+
+
+def resample(
+    source: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
+    target: Sequence[float] | np.ndarray,
+    *,
+    kind: InterpolationKind = InterpolationKind.LINEAR,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Interpolate y (one spectrum, or a stack on its last axis) from the source axis onto target.
+    LINEAR matches np.interp; CUBIC is a non-uniform Catmull-Rom spline.
+    The plan for (source, target, kind) is cached, see resampling_plan().
+    """
+    return resampling_plan(source, target, kind).apply(y, out=out)
+
+
+def resampling_plan(
+    source: Sequence[float] | np.ndarray,
+    target: Sequence[float] | np.ndarray,
+    kind: InterpolationKind = InterpolationKind.LINEAR,
+) -> ResamplingPlan:
+    """
+    Cached plan for (source, target, kind). The last _PLAN_CACHE_SIZE plans are kept
+    (LRU), keyed by a hash of both axes; a hit is confirmed by comparing the axes.
+    """
+    source_arr = np.ascontiguousarray(source, dtype=float)
+    target_arr = np.ascontiguousarray(target, dtype=float)
+    kind = InterpolationKind(kind)
+    key = (_digest(source_arr), _digest(target_arr), kind)
+
+    with _plan_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None and np.array_equal(plan.source, source_arr) and np.array_equal(plan.target, target_arr):
+            _plan_cache.move_to_end(key)
+            return plan
+
+    plan = _build_plan(source_arr, target_arr, kind)
+    with _plan_lock:
+        _plan_cache[key] = plan
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def clear_resampling_cache() -> None:
+    with _plan_lock:
+        _plan_cache.clear()
+
+
+def _digest(a: np.ndarray) -> bytes:
+    return hashlib.blake2b(a.view(np.uint8), digest_size=16).digest()
+
+
+def _build_plan(source: np.ndarray, target: np.ndarray, kind: InterpolationKind) -> ResamplingPlan:
+    if source.ndim != 1 or target.ndim != 1:
+        raise ValueError("source and target must be 1-D.")
+    n = len(source)
+    if n < 2:
+        raise ValueError("source needs at least 2 points.")
+    if not np.all(np.diff(source) > 0):
+        raise ValueError("source must be strictly increasing.")
+
+    # interval [source[i], source[i+1]] and position t in it; clamping t holds the end values
+    i = np.clip(np.searchsorted(source, target, side="right") - 1, 0, n - 2)
+    h = source[i + 1] - source[i]
+    t = np.clip((target - source[i]) / h, 0.0, 1.0)
+
+    if kind is InterpolationKind.LINEAR:
+        indices = np.stack([i, i + 1])
+        weights = np.stack([1 - t, t])
+    else:
+        # cubic Hermite with Catmull-Rom tangents m_j = (y[j+1] - y[j-1]) / (x[j+1] - x[j-1]),
+        # one-sided at the ends (indices clamped), written as weights on y[i-1 .. i+2]
+        im1 = np.maximum(i - 1, 0)
+        ip2 = np.minimum(i + 2, n - 1)
+        t2 = t * t
+        t3 = t2 * t
+        h00 = 2 * t3 - 3 * t2 + 1
+        h10 = t3 - 2 * t2 + t
+        h01 = -2 * t3 + 3 * t2
+        h11 = t3 - t2
+        a = h10 * h / (source[i + 1] - source[im1])
+        b = h11 * h / (source[ip2] - source[i])
+        indices = np.stack([im1, i, i + 1, ip2])
+        weights = np.stack([-a, h00 - b, h01 + a, b])
+
+    # the plan keeps its own copies of the axes to confirm cache hits against
+    source, target = source.copy(), target.copy()
+    for array in (source, target, indices, weights):
+        array.flags.writeable = False
+    return ResamplingPlan(source=source, target=target, kind=kind, indices=indices, weights=weights)
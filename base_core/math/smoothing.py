@@ -1,30 +1,354 @@
+from functools import lru_cache
+import time
 import numpy as np
 from typing import Sequence, Tuple
 
+from base_core.math.enums import ConvolutionMethod, KernelType, PaddingMode, SmoothingMode
+
+_NP_PAD_MODES = {
+    PaddingMode.REFLECT: "reflect",
+    PaddingMode.NEAREST: "edge",
+}
+
+
 def moving_average(
-    x: Sequence[float],
-    y: Sequence[float],
+    x: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
     window_size: int,
-) -> Tuple[list[float], list[float]]:
+    *,
+    axis: int = -1,
+    mode: SmoothingMode = SmoothingMode.VALID,
+    padding: PaddingMode = PaddingMode.REFLECT,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Boxcar average over `window_size` points along `axis`.
+
+    y may be a stack of traces (e.g. shape (n_traces, n)); x is either shaped
+    like y or 1-D with len(x) == y.shape[axis].
 
-    if len(x) != len(y):
-        raise ValueError("x and y must have the same length.")
-    n = len(x)
+    - VALID: only windows that fit completely (n - window_size + 1 points);
+      x is averaged the same way as y.
+    - SAME: y is padded at both edges with `padding` so the result keeps n
+      points; x is returned unchanged since every output sits on an input sample.
+    """
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    mode = SmoothingMode(mode)
+    padding = PaddingMode(padding)
+
+    if y_arr.ndim == 0:
+        raise ValueError("y must have at least one dimension.")
+    n = y_arr.shape[axis]
+    if x_arr.ndim == 1:
+        x_axis = -1
+        if len(x_arr) != n:
+            raise ValueError("x and y must have the same length.")
+    elif x_arr.shape == y_arr.shape:
+        x_axis = axis
+    else:
+        raise ValueError("x must be 1-D or have the same shape as y.")
     if window_size < 1 or window_size > n:
         raise ValueError("window_size should be between 1 and len(x).")
     if window_size % 2 == 0:
         raise ValueError("window_size should be uneven.")
 
+    y_smooth = _boxcar(y_arr, window_size, axis, mode, padding)
+    if mode is SmoothingMode.SAME:
+        return x_arr, y_smooth
+    return _boxcar(x_arr, window_size, x_axis, mode, padding), y_smooth
+
+
+def _boxcar(
+    a: np.ndarray,
+    window_size: int,
+    axis: int,
+    mode: SmoothingMode,
+    padding: PaddingMode,
+) -> np.ndarray:
+    """
+    O(n) sliding mean via cumulative sums. The per-trace mean is removed before
+    summing so long traces with a large DC level don't lose precision.
+    """
+    a = np.moveaxis(a, axis, -1)
+    half = window_size // 2
+
+    if mode is SmoothingMode.SAME and half > 0:
+        pad_width = [(0, 0)] * (a.ndim - 1) + [(half, half)]
+        a = np.pad(a, pad_width, mode=_NP_PAD_MODES[padding])
+
+    ref = a.mean(axis=-1, keepdims=True)
+    csum = np.zeros(a.shape[:-1] + (a.shape[-1] + 1,))
+    np.cumsum(a - ref, axis=-1, out=csum[..., 1:])
+
+    out = (csum[..., window_size:] - csum[..., :-window_size]) / window_size + ref
+    return np.moveaxis(out, -1, axis)
+
+
+class StreamingMovingAverage:
+    """
+    Incremental VALID moving average for data that arrives in chunks
+    (e.g. items delivered by TaskRunner.stream).
+
+    Feeding chunks through update() yields the same samples (up to float
+    rounding) as moving_average() over the concatenated data. Only the last
+    window_size - 1 samples are kept, so an update costs O(len(chunk) + window)
+    no matter how long the run has been going.
+    """
+
+    def __init__(self, window_size: int, *, axis: int = -1) -> None:
+        if window_size < 1:
+            raise ValueError("window_size should be at least 1.")
+        if window_size % 2 == 0:
+            raise ValueError("window_size should be uneven.")
+        self._window_size = window_size
+        self._axis = axis
+        self.reset()
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @property
+    def samples_seen(self) -> int:
+        return self._samples_seen
+
+    def reset(self) -> None:
+        self._x_tail: np.ndarray | None = None
+        self._y_tail: np.ndarray | None = None
+        self._filled = 0
+        self._samples_seen = 0
+
+    def update(
+        self,
+        x: Sequence[float] | np.ndarray,
+        y: Sequence[float] | np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Consume one chunk and return the smoothed samples it completed.
+        The result is empty until window_size samples have been seen.
+        """
+        x_arr = np.asarray(x, dtype=float)
+        y_arr = np.asarray(y, dtype=float)
+        if x_arr.ndim == 1:
+            if len(x_arr) != y_arr.shape[self._axis]:
+                raise ValueError("x and y must have the same length.")
+        elif x_arr.shape == y_arr.shape:
+            x_arr = np.moveaxis(x_arr, self._axis, -1)
+        else:
+            raise ValueError("x must be 1-D or have the same shape as y.")
+        y_arr = np.moveaxis(y_arr, self._axis, -1)
+
+        if self._y_tail is None:
+            self._allocate(x_arr.shape[:-1], y_arr.shape[:-1])
+        elif self._y_tail.shape[:-1] != y_arr.shape[:-1] or self._x_tail.shape[:-1] != x_arr.shape[:-1]:
+            raise ValueError("chunk shape does not match previous chunks.")
+
+        x_all = np.concatenate([self._x_tail[..., : self._filled], x_arr], axis=-1)
+        y_all = np.concatenate([self._y_tail[..., : self._filled], y_arr], axis=-1)
+        self._samples_seen += y_arr.shape[-1]
+
+        keep = min(self._window_size - 1, y_all.shape[-1])
+        if keep > 0:
+            self._x_tail[..., :keep] = x_all[..., -keep:]
+            self._y_tail[..., :keep] = y_all[..., -keep:]
+        self._filled = keep
+
+        if y_all.shape[-1] < self._window_size:
+            x_out = x_all[..., :0]
+            y_out = y_all[..., :0]
+        else:
+            x_out = _boxcar(x_all, self._window_size, -1, SmoothingMode.VALID, PaddingMode.REFLECT)
+            y_out = _boxcar(y_all, self._window_size, -1, SmoothingMode.VALID, PaddingMode.REFLECT)
+        if x_out.ndim > 1:
+            x_out = np.moveaxis(x_out, -1, self._axis)
+        return x_out, np.moveaxis(y_out, -1, self._axis)
+
+    def _allocate(self, x_lead: tuple[int, ...], y_lead: tuple[int, ...]) -> None:
+        capacity = self._window_size - 1
+        self._x_tail = np.empty(x_lead + (capacity,))
+        self._y_tail = np.empty(y_lead + (capacity,))
+
+
+# Kernel length from which FFT convolution beats the direct tap loop, measured
+# with calibrate_fft_crossover() on 10^6-sample traces. Re-run it to tune a new machine.
+_fft_crossover: int = 17
+
+
+@lru_cache(maxsize=128)
+def smoothing_kernel(kernel_type: KernelType, window_size: int, order: float = 0) -> np.ndarray:
+    """
+    Normalized smoothing kernel of length window_size (read-only, cached).
+
+    `order` is the polynomial order for SAVITZKY_GOLAY and the width in samples
+    for GAUSSIAN (0 -> window_size / 6); BOXCAR ignores it.
+    """
+    kernel_type = KernelType(kernel_type)
+    if window_size < 1 or window_size % 2 == 0:
+        raise ValueError("window_size should be a positive uneven number.")
+
     half = window_size // 2
+    t = np.arange(-half, half + 1, dtype=float)
+
+    if kernel_type is KernelType.BOXCAR:
+        kernel = np.full(window_size, 1.0 / window_size)
+    elif kernel_type is KernelType.GAUSSIAN:
+        sigma = float(order) if order > 0 else window_size / 6
+        kernel = np.exp(-(t ** 2) / (2 * sigma ** 2))
+        kernel /= kernel.sum()
+    else:
+        if not 0 <= order < window_size or int(order) != order:
+            raise ValueError("order should be an integer between 0 and window_size - 1.")
+        vander = np.vander(t, int(order) + 1, increasing=True)
+        kernel = np.linalg.pinv(vander)[0]
+
+    kernel.setflags(write=False)
+    return kernel
+
+
+def gaussian_smooth(
+    y: Sequence[float] | np.ndarray,
+    window_size: int,
+    sigma: float | None = None,
+    *,
+    axis: int = -1,
+    mode: SmoothingMode = SmoothingMode.SAME,
+    padding: PaddingMode = PaddingMode.REFLECT,
+    method: ConvolutionMethod = ConvolutionMethod.AUTO,
+) -> np.ndarray:
+    """
+    Gaussian-kernel smoothing along `axis` (sigma in samples, default window_size / 6).
+    """
+    kernel = smoothing_kernel(KernelType.GAUSSIAN, window_size, sigma or 0)
+    return convolve_smooth(y, kernel, axis=axis, mode=mode, padding=padding, method=method)
+
+
+def savgol_smooth(
+    y: Sequence[float] | np.ndarray,
+    window_size: int,
+    order: int,
+    *,
+    axis: int = -1,
+    mode: SmoothingMode = SmoothingMode.SAME,
+    padding: PaddingMode = PaddingMode.REFLECT,
+    method: ConvolutionMethod = ConvolutionMethod.AUTO,
+) -> np.ndarray:
+    """
+    Savitzky–Golay smoothing (local polynomial of degree `order`) along `axis`.
+    """
+    kernel = smoothing_kernel(KernelType.SAVITZKY_GOLAY, window_size, order)
+    return convolve_smooth(y, kernel, axis=axis, mode=mode, padding=padding, method=method)
+
+
+def convolve_smooth(
+    y: Sequence[float] | np.ndarray,
+    kernel: np.ndarray,
+    *,
+    axis: int = -1,
+    mode: SmoothingMode = SmoothingMode.SAME,
+    padding: PaddingMode = PaddingMode.REFLECT,
+    method: ConvolutionMethod = ConvolutionMethod.AUTO,
+) -> np.ndarray:
+    """
+    Convolve every trace of y with an uneven-length kernel along `axis`.
+
+    AUTO uses the direct tap loop below the measured crossover length and
+    overlap-add FFT convolution above it. Edge modes match moving_average().
+    """
+    y_arr = np.moveaxis(np.asarray(y, dtype=float), axis, -1)
+    kernel = np.asarray(kernel, dtype=float)
+    mode = SmoothingMode(mode)
+    method = ConvolutionMethod(method)
+
+    w = len(kernel)
+    if w % 2 == 0:
+        raise ValueError("kernel length should be uneven.")
+    if w > y_arr.shape[-1]:
+        raise ValueError("kernel is longer than the data.")
+
+    half = w // 2
+    if mode is SmoothingMode.SAME and half > 0:
+        pad_width = [(0, 0)] * (y_arr.ndim - 1) + [(half, half)]
+        y_arr = np.pad(y_arr, pad_width, mode=_NP_PAD_MODES[PaddingMode(padding)])
+
+    if method is ConvolutionMethod.AUTO:
+        method = ConvolutionMethod.FFT if w >= _fft_crossover else ConvolutionMethod.DIRECT
+
+    if method is ConvolutionMethod.DIRECT:
+        out = _direct_convolve_valid(y_arr, kernel)
+    else:
+        out = _fft_convolve_valid(y_arr, kernel)
+    return np.moveaxis(out, -1, axis)
+
+
+def calibrate_fft_crossover(
+    n: int = 1_000_000,
+    windows: Sequence[int] = (5, 9, 17, 33, 65, 129, 257),
+    repeats: int = 3,
+) -> int:
+    """
+    Time direct vs FFT convolution on this machine and store the smallest
+    window for which FFT wins as the AUTO crossover. Returns the new crossover.
+    """
+    global _fft_crossover
+
+    data = np.random.default_rng(0).normal(size=n)
+    crossover = max(windows) + 2
+    for w in sorted(windows):
+        kernel = smoothing_kernel(KernelType.BOXCAR, w)
+        t_direct = _best_time(lambda: _direct_convolve_valid(data, kernel), repeats)
+        t_fft = _best_time(lambda: _fft_convolve_valid(data, kernel), repeats)
+        if t_fft < t_direct:
+            crossover = w
+            break
+
+    _fft_crossover = crossover
+    return crossover
+
+
+def _direct_convolve_valid(a: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    w = len(kernel)
+    n_out = a.shape[-1] - w + 1
+    out = np.zeros(a.shape[:-1] + (n_out,))
+    for j, k in enumerate(kernel[::-1]):
+        out += k * a[..., j : j + n_out]
+    return out
+
+
+def _fft_convolve_valid(a: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """
+    Overlap-add FFT convolution over the last axis, batched over leading axes.
+    Block length is a power of two of ~8 kernel lengths (or the whole trace if shorter).
+    """
+    lead = a.shape[:-1]
+    n = a.shape[-1]
+    w = len(kernel)
+
+    nfft = min(_next_pow2(8 * w), _next_pow2(n + w - 1))
+    step = nfft - w + 1
+    n_blocks = -(-n // step)
+
+    blocks = np.zeros(lead + (n_blocks * step,))
+    blocks[..., :n] = a
+    blocks = blocks.reshape(lead + (n_blocks, step))
+
+    spectrum = np.fft.rfft(blocks, nfft, axis=-1) * np.fft.rfft(kernel, nfft)
+    conv = np.fft.irfft(spectrum, nfft, axis=-1)
+
+    out = np.zeros(lead + (n_blocks + 1, step))
+    out[..., :n_blocks, :] += conv[..., :step]
+    out[..., 1:, : w - 1] += conv[..., step:]
+    full = out.reshape(lead + ((n_blocks + 1) * step,))
+    return full[..., w - 1 : n]
 
-    x_smooth = []
-    y_smooth = []
 
-    for i in range(half, n - half):
-        x_window = x[i - half : i + half + 1]
-        y_window = y[i - half : i + half + 1]
+def _next_pow2(n: int) -> int:
+    return 1 << max(0, int(n) - 1).bit_length()
 
-        x_smooth.append(np.mean(x_window))  
-        y_smooth.append(np.mean(y_window))   
 
-    return x_smooth, y_smooth
+def _best_time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from base_core.plotting.enums import DecimationMethod
+
+
+def decimate(
+    x: Sequence[float] | np.ndarray,
+    y: Sequence[float] | np.ndarray,
+    n_out: int,
+    *,
+    method: DecimationMethod = DecimationMethod.MIN_MAX,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a trace to at most n_out points for plotting (n_out ~ pixel width, or 2x for MIN_MAX).
+
+    - y: (N,) or a (B, N) batch of traces
+    - x: shared (N,) axis or one axis per row (same shape as y)
+
+    Returns (x, y) with the last axis reduced. Traces with at most n_out points are returned unchanged.
+    """
+    x_arr = np.asarray(x, dtype=float)
+    y_arr = np.asarray(y, dtype=float)
+    method = DecimationMethod(method)
+    if method is DecimationMethod.MIN_MAX:
+        idx = min_max_indices(y_arr, max(n_out // 2, 1))
+    else:
+        idx = lttb_indices(x_arr, y_arr, n_out)
+    x_out = np.take_along_axis(np.broadcast_to(x_arr, y_arr.shape), idx, axis=-1)
+    return x_out, np.take_along_axis(y_arr, idx, axis=-1)
+
+
+def min_max_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of each of n_buckets buckets (widths differ by at most one),
+    in index order within each bucket, so every peak survives the decimation.
+    Shape (..., 2 * n_buckets), or arange(N) if N <= 2 * n_buckets.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+    if n <= 2 * n_buckets:
+        return np.broadcast_to(np.arange(n), y.shape).copy()
+
+    # the first n % n_buckets buckets hold one sample more; both groups are reshaped views, no copies
+    width, n_long = divmod(n, n_buckets)
+    split = n_long * (width + 1)
+    i_min, i_max = [], []
+    for start, stop, w in ((0, split, width + 1), (split, n, width)):
+        if stop == start:
+            continue
+        block = y[..., start:stop].reshape(y.shape[:-1] + (-1, w))
+        first = start + w * np.arange(block.shape[-2])
+        i_min.append(first + np.argmin(block, axis=-1))
+        i_max.append(first + np.argmax(block, axis=-1))
+    i_min = np.concatenate(i_min, axis=-1)
+    i_max = np.concatenate(i_max, axis=-1)
+
+    out = np.empty(y.shape[:-1] + (n_buckets, 2), dtype=np.int64)
+    out[..., 0] = np.minimum(i_min, i_max)
+    out[..., 1] = np.maximum(i_min, i_max)
+    return out.reshape(y.shape[:-1] + (2 * n_buckets,))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets (Steinarsson 2013), exact: the first and last
+    points are kept, and from each of the n_out - 2 buckets in between the point
+    forming the largest triangle with the previously selected point and the mean
+    of the next bucket. Loops over buckets, vectorized over rows.
+    Shape (..., n_out), or arange(N) if N <= n_out.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+    if n_out < 3:
+        raise ValueError("LTTB needs n_out >= 3.")
+    if n <= n_out:
+        return np.broadcast_to(np.arange(n), y.shape).copy()
+
+    rows = y.reshape(-1, n)
+    x_rows = np.broadcast_to(x, y.shape).reshape(-1, n)
+    n_rows = len(rows)
+
+    # bucket b (0..n_out-3) spans [edges[b], edges[b+1]) of the interior points 1..n-2
+    edges = (1 + np.floor(np.arange(n_out - 1) * ((n - 2) / (n_out - 2)))).astype(np.int64)
+    edges[-1] = n - 1
+    # mean of each bucket; the "next bucket" of the last interior bucket is the last point
+    cx = np.add.reduceat(x_rows[:, :-1], edges[:-1], axis=1) / np.diff(edges)
+    cy = np.add.reduceat(rows[:, :-1], edges[:-1], axis=1) / np.diff(edges)
+    cx = np.concatenate([cx[:, 1:], x_rows[:, -1:]], axis=1)
+    cy = np.concatenate([cy[:, 1:], rows[:, -1:]], axis=1)
+
+    out = np.empty((n_rows, n_out), dtype=np.int64)
+    out[:, 0] = 0
+    out[:, -1] = n - 1
+    row_idx = np.arange(n_rows)
+    ax = x_rows[:, 0].copy()
+    ay = rows[:, 0].copy()
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        bx = x_rows[:, lo:hi]
+        by = rows[:, lo:hi]
+        # twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((ax - cx[:, b])[:, None] * (by - ay[:, None]) - (ax[:, None] - bx) * (cy[:, b] - ay)[:, None])
+        pick = np.argmax(area, axis=1)
+        out[:, b + 1] = lo + pick
+        ax = bx[row_idx, pick]
+        ay = by[row_idx, pick]
+
+    return out.reshape(y.shape[:-1] + (n_out,))
+
+
+class LiveDecimator:
+    """
+    Min/max decimation of a growing trace, for live plots.
+
+    Samples are grouped into buckets of bucket_width consecutive samples. append()
+    only updates the last (open) bucket and the buckets filled by the new samples.
+    When the trace would need more than n_buckets buckets, neighbouring buckets are
+    merged pairwise and the width doubles, so memory and series() cost stay
+    bounded by n_buckets.
+
+    y chunks are (n,) or (B, n) for B channels sharing x.
+    """
+
+    def __init__(self, n_buckets: int, *, bucket_width: int = 1) -> None:
+        if n_buckets < 1 or bucket_width < 1:
+            raise ValueError("n_buckets and bucket_width must be >= 1.")
+        self._n_buckets = n_buckets
+        self._initial_width = bucket_width
+        self.reset()
+
+    @property
+    def bucket_width(self) -> int:
+        return self._width
+
+    @property
+    def n_samples(self) -> int:
+        return self._n
+
+    def reset(self) -> None:
+        self._width = self._initial_width
+        self._n = 0
+        self._count = 0
+        self._channels: tuple[int, ...] | None = None
+        # per bucket: sample index, x and y of its minimum and maximum
+        self._i = self._x = self._y = None
+
+    def append(self, x: Sequence[float] | np.ndarray, y: Sequence[float] | np.ndarray) -> None:
+        x_arr = np.asarray(x, dtype=float)
+        y_arr = np.asarray(y, dtype=float)
+        m = x_arr.shape[-1]
+        if x_arr.ndim != 1 or y_arr.shape[-1] != m:
+            raise ValueError("x must be 1-D with the same length as the last axis of y.")
+        if m == 0:
+            return
+        if self._channels is None:
+            self._allocate(y_arr.shape[:-1])
+        elif y_arr.shape[:-1] != self._channels:
+            raise ValueError(f"y chunks must have leading shape {self._channels}.")
+
+        while -(-(self._n + m) // self._width) > self._n_buckets:
+            self._merge_pairs()
+
+        offset = self._n % self._width
+        first = self._n // self._width
+        # pad the chunk to whole buckets: +inf never wins a minimum, -inf never a maximum
+        k = -(-(offset + m) // self._width)
+        pad_after = k * self._width - offset - m
+        xs = np.pad(x_arr, (offset, pad_after)).reshape(k, self._width)
+        pad = [(0, 0)] * (y_arr.ndim - 1) + [(offset, pad_after)]
+        lo = np.pad(y_arr, pad, constant_values=np.inf).reshape(y_arr.shape[:-1] + (k, self._width))
+        hi = np.pad(y_arr, pad, constant_values=-np.inf).reshape(y_arr.shape[:-1] + (k, self._width))
+        a_min = np.argmin(lo, axis=-1)
+        a_max = np.argmax(hi, axis=-1)
+
+        bucket = np.arange(k)
+        start_index = (first + bucket) * self._width
+        new_i = np.stack([start_index + a_min, start_index + a_max])
+        new_x = np.stack([xs[bucket, a_min], xs[bucket, a_max]])
+        new_y = np.stack([
+            np.take_along_axis(lo, a_min[..., None], axis=-1)[..., 0],
+            np.take_along_axis(hi, a_max[..., None], axis=-1)[..., 0],
+        ])
+
+        if offset:
+            # the first new bucket continues the open one
+            self._combine(first, new_i[..., 0], new_x[..., 0], new_y[..., 0])
+            new_i, new_x, new_y = new_i[..., 1:], new_x[..., 1:], new_y[..., 1:]
+            start = first + 1
+        else:
+            start = first
+        stop = start + new_i.shape[-1]
+        self._i[..., start:stop] = new_i
+        self._x[..., start:stop] = new_x
+        self._y[..., start:stop] = new_y
+
+        self._n += m
+        self._count = stop
+
+    def series(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (x, y) with the minimum and maximum of every bucket in sample order:
+        shapes (2 * n_buckets_used,) or (B, 2 * n_buckets_used).
+        """
+        if self._channels is None:
+            return np.empty(0), np.empty(0)
+        c = self._count
+        i, x, y = self._i[..., :c], self._x[..., :c], self._y[..., :c]
+        max_first = i[1] < i[0]
+        order = np.stack([max_first, ~max_first]).astype(np.intp)  # slot taken first, second
+        xs = np.take_along_axis(x, order, axis=0)
+        ys = np.take_along_axis(y, order, axis=0)
+        # interleave (first, second) per bucket
+        xs = np.moveaxis(xs, 0, -1).reshape(self._channels + (2 * c,))
+        ys = np.moveaxis(ys, 0, -1).reshape(self._channels + (2 * c,))
+        return xs, ys
+
+    def _allocate(self, channels: tuple[int, ...]) -> None:
+        self._channels = channels
+        shape = (2,) + channels + (self._n_buckets,)
+        self._i = np.zeros(shape, dtype=np.int64)
+        self._x = np.zeros(shape)
+        self._y = np.zeros(shape)
+
+    def _combine(self, j: int, i: np.ndarray, x: np.ndarray, y: np.ndarray) -> None:
+        take_min = y[0] < self._y[0, ..., j]
+        take_max = y[1] > self._y[1, ..., j]
+        for slot, take in ((0, take_min), (1, take_max)):
+            self._i[slot, ..., j] = np.where(take, i[slot], self._i[slot, ..., j])
+            self._x[slot, ..., j] = np.where(take, x[slot], self._x[slot, ..., j])
+            self._y[slot, ..., j] = np.where(take, y[slot], self._y[slot, ..., j])
+
+    def _merge_pairs(self) -> None:
+        c = self._count
+        pairs = c // 2
+        if pairs:
+            y = self._y[..., : 2 * pairs]
+            take_right = np.stack([y[0, ..., 1::2] < y[0, ..., 0::2], y[1, ..., 1::2] > y[1, ..., 0::2]])
+            for arr in (self._i, self._x, self._y):
+                pair = arr[..., : 2 * pairs]
+                arr[..., :pairs] = np.where(take_right, pair[..., 1::2], pair[..., 0::2])
+        if c % 2:
+            # an unpaired last bucket becomes a bucket of the doubled width on its own
+            for arr in (self._i, self._x, self._y):
+                arr[..., pairs] = arr[..., c - 1]
+        self._count = pairs + c % 2
+        self._width *= 2
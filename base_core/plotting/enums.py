@@ -7,4 +7,8 @@ class PlotColor(str, Enum):
     GREEN  = "g"
     PURPLE = "purple"
     GRAY   = "tab:gray"
-    
+
+
+class DecimationMethod(str, Enum):
+    MIN_MAX = "min_max"
+    LTTB    = "lttb"
@@ -1,4 +1,7 @@
 
+import numpy as np
+
+from base_core.quantities.constants import SPEED_OF_LIGHT
 from base_core.quantities.enums import Prefix
 
 
@@ -29,3 +32,115 @@ class Frequency(float):
 
 
 
+
+
+class QuantityArray:
+    """
+    An array of values in units of `prefix`, backed by one float64 ndarray.
+
+    to(prefix) does not touch the data: it returns an array that shares it and
+    only records the scale factor, which is applied when the values are read
+    (value(), np.asarray()). With a factor of 1, np.asarray() returns the
+    stored array itself, so the math functions use it without copying.
+    Indexing with an int gives the scalar quantity (in SI units, like Length; a plain
+    float for QuantityArray itself).
+    """
+
+    __slots__ = ("_data", "_data_prefix", "_prefix")
+    _scalar_type: type[float] = float
+
+    def __init__(self, values, prefix: Prefix = Prefix.NONE) -> None:
+        self._data = np.asarray(values, dtype=np.float64)
+        self._data_prefix = prefix
+        self._prefix = prefix
+
+    @classmethod
+    def from_quantities(cls, quantities, prefix: Prefix = Prefix.NONE):
+        si = np.fromiter(quantities, dtype=np.float64, count=len(quantities))
+        return cls(si, Prefix.NONE).to(prefix)
+
+    @property
+    def prefix(self) -> Prefix:
+        return self._prefix
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._data.shape
+
+    @property
+    def scale(self) -> float:
+        """
+        Factor from the stored data to values in units of prefix.
+        """
+        return self._data_prefix.value / self._prefix.value
+
+    def to(self, prefix: Prefix):
+        out = object.__new__(type(self))
+        out._data = self._data
+        out._data_prefix = self._data_prefix
+        out._prefix = prefix
+        return out
+
+    def value(self, prefix: Prefix | None = None) -> np.ndarray:
+        """
+        Values in units of prefix (default: this array's prefix). Only copies if a scale applies.
+        """
+        factor = self._data_prefix.value / (self._prefix if prefix is None else prefix).value
+        return self._data if factor == 1 else self._data * factor
+
+    def materialize(self):
+        """
+        Apply the pending scale factor once, so later reads need no multiplication.
+        """
+        return type(self)(self.value(), self._prefix)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if self.scale != 1:
+            if copy is False:
+                raise ValueError("a scaled QuantityArray cannot be read without a copy.")
+            return self.value().astype(dtype or np.float64, copy=False)
+        if copy:
+            return np.array(self._data, dtype=dtype)
+        return self._data if dtype is None else np.asarray(self._data, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if self._scalar_type is float:
+                return float(self._data[index]) * self._data_prefix.value
+            return self._scalar_type(float(self._data[index]), self._data_prefix)
+        out = type(self)(self._data[index], self._data_prefix)
+        return out.to(self._prefix)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape}, prefix={self._prefix.name})"
+
+
+class LengthArray(QuantityArray):
+    __slots__ = ()
+    _scalar_type = Length
+
+    def to_frequency(self, prefix: Prefix = Prefix.NONE) -> "FrequencyArray":
+        """
+        Vacuum frequency c / λ of every wavelength.
+        """
+        # fold all unit factors into the constant: one division over the data
+        return FrequencyArray((SPEED_OF_LIGHT / (self._data_prefix.value * prefix.value)) / self._data, prefix)
+
+
+class TimeArray(QuantityArray):
+    __slots__ = ()
+    _scalar_type = Time
+
+
+class FrequencyArray(QuantityArray):
+    __slots__ = ()
+    _scalar_type = Frequency
+
+    def to_wavelength(self, prefix: Prefix = Prefix.NONE) -> LengthArray:
+        """
+        Vacuum wavelength c / f of every frequency.
+        """
+        return LengthArray((SPEED_OF_LIGHT / (self._data_prefix.value * prefix.value)) / self._data, prefix)
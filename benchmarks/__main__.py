@@ -0,0 +1,60 @@
+"""
+Run the benchmark suite:
+
+    python -m benchmarks                               # everything, print results
+    python -m benchmarks -k "math.*" --quick           # subset, small sizes
+    python -m benchmarks -o results.json               # store results as JSON
+    python -m benchmarks -b baseline.json -t 0.2       # fail on >20% slowdowns
+
+Exit status 1 if a benchmark failed its check or any metric regressed against the baseline.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from benchmarks.suite import BaselineMismatch, compare, load, run, save
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="base_core benchmark suite")
+    parser.add_argument("-k", "--pattern", help="glob on benchmark names, e.g. 'concurrency.*'")
+    parser.add_argument("--quick", action="store_true", help="small sizes, for a smoke run")
+    parser.add_argument("-o", "--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("-b", "--baseline", type=Path, help="compare against this results JSON")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=0.15, help="allowed slowdown before failing (default 0.15 = 15%%)"
+    )
+    args = parser.parse_args(argv)
+
+    results, failures = run(args.pattern, quick=args.quick)
+    if args.output is not None:
+        save(args.output, results, quick=args.quick)
+        print(f"\nresults written to {args.output}")
+
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) failed:")
+        for name, message in failures.items():
+            print(f"  {name}: {message}")
+
+    if args.baseline is None:
+        return 1 if failures else 0
+
+    try:
+        baseline = load(args.baseline, quick=args.quick)
+    except BaselineMismatch as e:
+        print(f"\n{e}")
+        return 1
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"\nno regressions against {args.baseline} (threshold {args.threshold:.0%})")
+        return 1 if failures else 0
+
+    print(f"\n{len(regressions)} regression(s) against {args.baseline} (threshold {args.threshold:.0%}):")
+    for r in regressions:
+        print(f"  {r.metric:<60} {r.baseline:.3e} s -> {r.current:.3e} s  ({r.ratio:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
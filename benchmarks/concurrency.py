@@ -0,0 +1,331 @@
+"""
+Concurrency benchmarks: TaskRunner run/stream throughput and latency (also with one key per
+request), stream delivery policies against a slow consumer, Buffer contention, thread vs
+process runner on CPU-bound fits and shared-memory array transfer, AsyncTaskRunner overhead
+against bridging TaskRunner into an event loop, FrameRingBuffer against publishing frame
+copies through Buffer.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from base_core.fitting.functions import fit_gaussian
+from base_core.framework.concurrency.async_task_runner import AsyncTaskRunner
+from base_core.framework.concurrency.buffer import Buffer
+from base_core.framework.concurrency.enums import DeliveryPolicy
+from base_core.framework.concurrency.process_task_runner import ProcessTaskRunner
+from base_core.framework.concurrency.ring_buffer import FrameRingBuffer
+from base_core.framework.concurrency.task_runner import TaskRunner
+from benchmarks.suite import BenchmarkFailure, benchmark, best_time, latency_metrics
+
+
+@benchmark("concurrency.run")
+def bench_run(quick: bool) -> dict[str, float]:
+    n = 2_000 if quick else 20_000
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        runner = TaskRunner(executor)
+
+        def submit_all() -> None:
+            wait([runner.run(_noop) for _ in range(n)])
+
+        def submit_keyed() -> None:
+            wait([runner.run(_noop, key=i % 16, on_success=_ignore) for i in range(n)])
+
+        # one key per request, as services do; finished keys must not pile up
+        def submit_unique_keys() -> None:
+            wait([runner.run(_noop, key=("request", i), on_success=_ignore) for i in range(n)])
+
+        latencies: list[float] = []
+        for _ in range(500 if quick else 2_000):
+            done = threading.Event()
+            t0 = time.perf_counter()
+            runner.run(_noop, on_success=lambda _: done.set())
+            done.wait()
+            latencies.append(time.perf_counter() - t0)
+
+        unique_keys = best_time(submit_unique_keys, repeats=3) / n
+        metrics = runner.metrics()
+        if metrics.in_flight != 0 or len(runner.key_metrics()) > 256:
+            raise BenchmarkFailure(f"runner did not release finished keys: {metrics}")
+
+        return {
+            "per_task": best_time(submit_all, repeats=3) / n,
+            "keyed_per_task": best_time(submit_keyed, repeats=3) / n,
+            "unique_key_per_task": unique_keys,
+            "metrics_snapshot": best_time(runner.metrics, repeats=5, number=100),
+            **latency_metrics("callback_latency", latencies),
+        }
+
+
+@benchmark("concurrency.stream")
+def bench_stream(quick: bool) -> dict[str, float]:
+    n = 10_000 if quick else 100_000
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        runner = TaskRunner(executor)
+
+        def produce(stop: threading.Event):
+            return range(n)
+
+        def stream_all() -> None:
+            handle = runner.stream(produce, on_item=_ignore)
+            handle.future.result()
+
+        # time from yield to on_item for a producer that emits at a modest rate
+        n_timed = 200 if quick else 1_000
+        sent: list[float] = []
+        latencies: list[float] = []
+
+        def timed_producer(stop: threading.Event):
+            for i in range(n_timed):
+                sent.append(time.perf_counter())
+                yield i
+                time.sleep(0.0002)
+
+        handle = runner.stream(timed_producer, on_item=lambda i: latencies.append(time.perf_counter() - sent[i]))
+        handle.future.result()
+
+        return {
+            "per_item": best_time(stream_all, repeats=3) / n,
+            **latency_metrics("item_latency", latencies),
+        }
+
+
+@benchmark("concurrency.stream_policies")
+def bench_stream_policies(quick: bool) -> dict[str, float]:
+    # a producer at about 5 kHz feeding an on_item that takes 2 ms (e.g. a redraw);
+    # per_item is the producer's time per item, which should stay near its own period
+    n = 500 if quick else 5_000
+
+    def produce(stop: threading.Event):
+        for i in range(n):
+            if stop.is_set():
+                return
+            yield i
+            time.sleep(0.0002)
+
+    def slow(_) -> None:
+        time.sleep(0.002)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        runner = TaskRunner(executor)
+        for name, options in (
+            ("latest", {}),
+            ("batch", {"policy": DeliveryPolicy.BATCH}),
+            ("max_rate_60hz", {"policy": DeliveryPolicy.MAX_RATE, "max_rate": 60.0}),
+        ):
+            t0 = time.perf_counter()
+            handle = runner.stream(produce, on_item=slow, **options)
+            handle.future.result()
+            results[f"{name}_per_item"] = (time.perf_counter() - t0) / n
+        runner.close()
+    return results
+
+
+@benchmark("concurrency.async_run")
+def bench_async_run(quick: bool) -> dict[str, float]:
+    n = 2_000 if quick else 20_000
+
+    async def measure() -> dict[str, float]:
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            threaded = TaskRunner(executor)
+            runner = AsyncTaskRunner(executor)
+
+            async def thread_bridge() -> None:
+                # what asyncio services do today: wait for the thread runner's future on the loop
+                for _ in range(n):
+                    await asyncio.wrap_future(threaded.run(_noop))
+
+            async def thread_callback() -> None:
+                for _ in range(n):
+                    done = loop.create_future()
+                    threaded.run(_noop, on_success=lambda r, f=done: loop.call_soon_threadsafe(f.set_result, r))
+                    await done
+
+            async def inline() -> None:
+                for _ in range(n):
+                    await runner.run(_noop)
+
+            async def inline_callback() -> None:
+                for i in range(n):
+                    await runner.run(_noop, key=i % 16, on_success=_ignore)
+
+            async def coroutine() -> None:
+                for _ in range(n):
+                    await runner.run(_async_noop)
+
+            async def offload() -> None:
+                for _ in range(n):
+                    await runner.run(_noop, offload=True)
+
+            async def keyed_burst() -> None:
+                tasks = [runner.run(_async_noop, key="burst", cancel_previous=True) for _ in range(n)]
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            async def stream_all() -> None:
+                await runner.stream(_async_range(n), on_item=_ignore)
+
+            results = {}
+            for name, fn in (
+                ("thread_bridge_per_call", thread_bridge),
+                ("thread_callback_per_call", thread_callback),
+                ("async_inline_per_call", inline),
+                ("async_keyed_callback_per_call", inline_callback),
+                ("async_coroutine_per_call", coroutine),
+                ("async_offload_per_call", offload),
+                ("async_keyed_burst_per_call", keyed_burst),
+                ("async_stream_per_item", stream_all),
+            ):
+                best = float("inf")
+                for _ in range(3):
+                    t0 = time.perf_counter()
+                    await fn()
+                    best = min(best, time.perf_counter() - t0)
+                results[name] = best / n
+            return results
+
+    return asyncio.run(measure())
+
+
+@benchmark("concurrency.buffer")
+def bench_buffer(quick: bool) -> dict[str, float]:
+    ops = 20_000 if quick else 200_000
+    results = {}
+    for writers, readers in ((1, 1), (2, 8)):
+        buffer: Buffer[int] = Buffer()
+
+        def write() -> None:
+            for i in range(ops // writers):
+                buffer.set(i)
+
+        def read() -> None:
+            for _ in range(ops // readers):
+                buffer.get()
+                buffer.version()
+
+        def contend() -> None:
+            threads = [threading.Thread(target=write) for _ in range(writers)]
+            threads += [threading.Thread(target=read) for _ in range(readers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        results[f"w{writers}_r{readers}_per_op"] = best_time(contend, repeats=3) / (2 * ops)
+    return results
+
+
+@benchmark("concurrency.process_runner")
+def bench_process_runner(quick: bool) -> dict[str, float]:
+    workers = min(4, os.cpu_count() or 1)
+    n_tasks, rows_per_task = (8, 25) if quick else (32, 50)
+    rng = np.random.default_rng(0)
+    x = np.linspace(-5, 5, 200)
+    centers = rng.uniform(-1, 1, (n_tasks * rows_per_task, 1))
+    y = 3 * np.exp(-((x - centers) ** 2) / 2) + 0.5 + rng.normal(0, 0.1, (len(centers), len(x)))
+    jobs = [functools.partial(_fit_rows, x, chunk) for chunk in np.split(y, n_tasks)]
+    array = rng.normal(size=4 * 1024 * 1024)  # 32 MiB
+
+    def run_all(runner: TaskRunner) -> None:
+        wait([runner.run(job) for job in jobs])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        threaded = best_time(lambda: run_all(TaskRunner(executor)), repeats=3)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        runner = ProcessTaskRunner(executor)
+        pickling = ProcessTaskRunner(executor, shared_memory_threshold=2 ** 62)
+        run_all(runner)  # start the workers and import scipy in them
+        processes = best_time(lambda: run_all(runner), repeats=3)
+        shared = best_time(lambda: runner.run(functools.partial(_negate, array)).result(), repeats=3)
+        pickled = best_time(lambda: pickling.run(functools.partial(_negate, array)).result(), repeats=3)
+        runner.close()
+        pickling.close()
+
+    n_fits = n_tasks * rows_per_task
+    return {
+        "thread_fit_per_trace": threaded / n_fits,
+        "process_fit_per_trace": processes / n_fits,
+        "roundtrip_32mib_shared_memory": shared,
+        "roundtrip_32mib_pickle": pickled,
+    }
+
+
+@benchmark("concurrency.ring_buffer")
+def bench_ring_buffer(quick: bool) -> dict[str, float]:
+    n = 500 if quick else 5_000
+    frame = np.random.default_rng(0).integers(0, 4096, (512, 512), dtype=np.uint16)
+    buffer: Buffer[np.ndarray] = Buffer()
+    ring = FrameRingBuffer(64, frame.shape, frame.dtype)
+
+    def buffer_copies() -> None:
+        for _ in range(n):
+            buffer.set(frame.copy())
+
+    def ring_writes() -> None:
+        for _ in range(n):
+            ring.write(frame)
+
+    # one writer, one reader that touches every frame it gets
+    def ring_stream() -> None:
+        stream = FrameRingBuffer(64, frame.shape, frame.dtype)
+        reader = stream.reader()
+        done = threading.Event()
+
+        def consume() -> None:
+            while not (done.is_set() and reader.pending == 0):
+                item = reader.read(timeout=0.05)
+                if item is not None:
+                    item[1].max()
+                    reader.validate(item[0])
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for _ in range(n):
+            stream.write(frame)
+        done.set()
+        consumer.join()
+        if reader.delivered + reader.dropped != n:
+            raise BenchmarkFailure(f"reader lost track: {reader.delivered} + {reader.dropped} != {n}")
+
+    return {
+        "buffer_copy_per_frame": best_time(buffer_copies, repeats=3) / n,
+        "ring_write_per_frame": best_time(ring_writes, repeats=3) / n,
+        "ring_stream_per_frame": best_time(ring_stream, repeats=3) / n,
+    }
+
+
+def _fit_rows(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return np.array([fit_gaussian(x, row).center for row in y])
+
+
+def _negate(a: np.ndarray) -> np.ndarray:
+    return -a
+
+
+def _noop() -> None:
+    return None
+
+
+async def _async_noop() -> None:
+    return None
+
+
+def _async_range(n: int):
+    async def produce(stop: threading.Event):
+        for i in range(n):
+            yield i
+
+    return produce
+
+
+def _ignore(_) -> None:
+    return None
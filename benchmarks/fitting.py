@@ -0,0 +1,165 @@
+"""
+Fitting benchmarks.
+
+Registered in the suite (python -m benchmarks -k "fitting.*"): per-trace time of
+fit_gaussian, fit_gaussian_batch, the CFG fits, bootstrap intervals and multi-peak fits.
+
+Run directly for a detailed comparison of looped vs batched vs process-pool
+Gaussian fits, and of finite-difference vs analytic Jacobians:
+
+    python -m benchmarks.fitting
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+from base_core.fitting.batch import fit_gaussian_batch
+from base_core.fitting.bootstrap import fit_gaussian_resampled
+from base_core.fitting.fit_models import CF_CFG_MODEL, GAUSSIAN_MODEL, US_CFG_MODEL, FitModel
+from base_core.fitting.functions import fit_cfCFG, fit_gaussian, fit_model, fit_usCFG
+from base_core.fitting.multi_peak import find_gaussian_peaks, fit_multi_gaussian
+from benchmarks.suite import benchmark, best_time
+
+
+def make_profiles(n_rows: int, n_points: int = 200, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    x = np.linspace(-5, 5, n_points)
+    centers = rng.uniform(-1, 1, (n_rows, 1))
+    sigmas = rng.uniform(0.5, 1.5, (n_rows, 1))
+    y = 3 * np.exp(-((x - centers) ** 2) / (2 * sigmas ** 2)) + 0.5
+    y += rng.normal(0, 0.1, y.shape)
+    return x, y
+
+
+def make_cfg_spectra(model: FitModel, truth: list[float], n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    x = np.linspace(780, 820, 400)
+    clean = model.evaluate(x, *truth)
+    return x, clean + rng.normal(0, 0.01, (n, len(x)))
+
+
+class _Counter:
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.fn(*args, **kwargs)
+
+
+def compare_jacobians(model: FitModel, x: np.ndarray, ys: np.ndarray) -> None:
+    """
+    Same start values and bounds; only the Jacobian differs.
+    Counts every model call (finite differences included) and every Jacobian call.
+    """
+    f_fd = _Counter(model.function)
+    fd_model = replace(model, function=f_fd)
+    bounds = {"bounds": (model.lower, model.upper)} if model.bounded else {}
+
+    def finite_difference() -> None:
+        for y in ys:
+            curve_fit(lambda x_, *p: fd_model.evaluate(x_, *p), x, y, p0=model.guess(x, y), **bounds)
+
+    f_an = _Counter(model.function)
+    j_an = _Counter(model.jacobian)
+    an_model = replace(model, function=f_an, jacobian=j_an)
+
+    def analytic() -> None:
+        for y in ys:
+            fit_model(an_model, x, y)
+
+    t_fd = best_time(finite_difference, repeats=1) / len(ys)
+    t_an = best_time(analytic, repeats=1) / len(ys)
+    print(
+        f"{model.name:<9} finite-diff {f_fd.calls / len(ys):6.1f} evals {t_fd * 1e6:8.1f} us | "
+        f"analytic {f_an.calls / len(ys):5.1f} evals + {j_an.calls / len(ys):4.1f} jac "
+        f"{t_an * 1e6:8.1f} us ({t_fd / t_an:.1f}x)"
+    )
+
+
+@benchmark("fitting.gaussian")
+def bench_gaussian(quick: bool) -> dict[str, float]:
+    x, y = make_profiles(1_000 if quick else 10_000)
+    n_loop = 100 if quick else 500
+    return {
+        "loop_per_trace": best_time(lambda: [fit_gaussian(x, row) for row in y[:n_loop]], repeats=3) / n_loop,
+        "batch_per_trace": best_time(lambda: fit_gaussian_batch(x, y), repeats=3) / len(y),
+    }
+
+
+@benchmark("fitting.bootstrap")
+def bench_bootstrap(quick: bool) -> dict[str, float]:
+    x, y = make_profiles(1)
+    y = y[0]
+    n_resamples = 200 if quick else 1_000
+    base = fit_gaussian(x, y)
+    p0 = [base.amplitude, base.center, abs(base.sigma), base.offset]
+    idx = np.random.default_rng(0).integers(0, len(x), (n_resamples, len(x)))
+    n_loop = min(n_resamples, 200)
+    return {
+        "loop_per_resample": best_time(
+            lambda: [fit_gaussian(x[i], y[i], p0=p0) for i in idx[:n_loop]], repeats=3
+        )
+        / n_loop,
+        "batch_per_resample": best_time(
+            lambda: fit_gaussian_resampled(x, y, n_resamples=n_resamples, seed=0), repeats=3
+        )
+        / n_resamples,
+    }
+
+
+@benchmark("fitting.multi_peak")
+def bench_multi_peak(quick: bool) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    n_points, n_peaks = (20_000, 10) if quick else (100_000, 30)
+    x = np.linspace(0, 1000, n_points)
+    centers = np.linspace(20, 980, n_peaks) + rng.uniform(-5, 5, n_peaks)
+    y = 0.5 + rng.normal(0, 0.05, n_points)
+    for a, c, s in zip(rng.uniform(1, 5, n_peaks), centers, rng.uniform(2, 8, n_peaks)):
+        y += a * np.exp(-((x - c) ** 2) / (2 * s ** 2))
+    return {
+        "find_peaks": best_time(lambda: find_gaussian_peaks(x, y), repeats=3),
+        "fit": best_time(lambda: fit_multi_gaussian(x, y), repeats=3),
+    }
+
+
+@benchmark("fitting.cfg")
+def bench_cfg(quick: bool) -> dict[str, float]:
+    n = 10 if quick else 50
+    us_model = US_CFG_MODEL.bind(starting_wavelength=790.0)
+    x_us, y_us = make_cfg_spectra(us_model, [800.0, 15.0, 0.1, 0.4, 0.02], n)
+    x_cf, y_cf = make_cfg_spectra(CF_CFG_MODEL, [801.0, 0.8, 15.0, 0.1, 0.4, 0.001], n)
+    return {
+        "usCFG_per_trace": best_time(lambda: [fit_usCFG(x_us, y, 790.0) for y in y_us], repeats=3) / n,
+        "cfCFG_per_trace": best_time(lambda: [fit_cfCFG(x_cf, y) for y in y_cf], repeats=3) / n,
+    }
+
+
+def main() -> None:
+    x, y = make_profiles(20_000)
+    n_loop = 500
+
+    t_loop = best_time(lambda: [fit_gaussian(x, row) for row in y[:n_loop]], repeats=3) / n_loop
+    t_batch = best_time(lambda: fit_gaussian_batch(x, y), repeats=3) / len(y)
+    with ProcessPoolExecutor() as ex:
+        fit_gaussian_batch(x, y[:1024], executor=ex)  # warm up workers
+        t_pool = best_time(lambda: fit_gaussian_batch(x, y, executor=ex, chunk_size=2048), repeats=3) / len(y)
+
+    print(f"fit_gaussian loop        {t_loop * 1e6:8.1f} us/trace")
+    print(f"fit_gaussian_batch       {t_batch * 1e6:8.1f} us/trace  ({t_loop / t_batch:.1f}x)")
+    print(f"fit_gaussian_batch pool  {t_pool * 1e6:8.1f} us/trace  ({t_loop / t_pool:.1f}x)")
+    print()
+
+    compare_jacobians(GAUSSIAN_MODEL, x, y[:300])
+    us_model = US_CFG_MODEL.bind(starting_wavelength=790.0)
+    compare_jacobians(us_model, *make_cfg_spectra(us_model, [800.0, 15.0, 0.1, 0.4, 0.02], 100))
+    compare_jacobians(CF_CFG_MODEL, *make_cfg_spectra(CF_CFG_MODEL, [801.0, 0.8, 15.0, 0.1, 0.4, 0.001], 100))
+
+
+if __name__ == "__main__":
+    main()
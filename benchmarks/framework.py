@@ -0,0 +1,91 @@
+"""
+Framework benchmarks: EventBus fan-out, DI resolution, module bootstrap.
+"""
+from __future__ import annotations
+
+import logging
+
+from base_core.framework.app.context import AppContext
+from base_core.framework.di.container import Container
+from base_core.framework.events.event_bus import EventBus
+from base_core.framework.lifecycle.cleanup_collection import CleanupCollection
+from base_core.framework.modules.base_module import BaseModule
+from base_core.framework.modules.module_manager import ModuleManager
+from benchmarks.suite import benchmark, time_per_call
+
+
+@benchmark("framework.event_bus")
+def bench_event_bus(quick: bool) -> dict[str, float]:
+    results = {}
+    for n_handlers in (1, 10, 100):
+        bus = EventBus()
+        for _ in range(n_handlers):
+            bus.subscribe("topic", _ignore)
+        results[f"publish_{n_handlers}_handlers"] = time_per_call(lambda: bus.publish("topic", 1))
+    results["publish_no_handlers"] = time_per_call(lambda: bus.publish("other", 1))
+    return results
+
+
+@benchmark("framework.di")
+def bench_di(quick: bool) -> dict[str, float]:
+    c = Container()
+    c.register_instance("instance", object())
+    c.register_singleton("singleton", lambda _: object())
+    c.register_factory("factory", lambda _: object())
+    # a factory that resolves a chain of 10 dependencies
+    for depth in range(10):
+        c.register_factory(("chain", depth), lambda c_, d=depth: [c_.get(("chain", d - 1))] if d else [])
+    c.get("singleton")
+    return {
+        "get_instance": time_per_call(lambda: c.get("instance")),
+        "get_singleton": time_per_call(lambda: c.get("singleton")),
+        "get_factory": time_per_call(lambda: c.get("factory")),
+        "get_factory_chain10": time_per_call(lambda: c.get(("chain", 9))),
+    }
+
+
+@benchmark("framework.module_bootstrap")
+def bench_bootstrap(quick: bool) -> dict[str, float]:
+    n = 20 if quick else 200
+    module_types = _module_chain(n)
+
+    def bootstrap() -> None:
+        ctx = AppContext(
+            config={},
+            log=logging.getLogger("benchmarks"),
+            event_bus=EventBus(),
+            lifecycle=CleanupCollection(),
+        )
+        c = Container()
+        manager = ModuleManager(t() for t in reversed(module_types))
+        manager.bootstrap(c, ctx)
+        manager.shutdown(c, ctx)
+
+    return {"bootstrap_per_module": time_per_call(bootstrap) / n}
+
+
+def _module_chain(n: int) -> list[type[BaseModule]]:
+    """
+    n module classes; each requires its two predecessors and registers one singleton.
+    """
+    types: list[type[BaseModule]] = []
+    for i in range(n):
+
+        def register(self, c: Container, ctx: AppContext, i=i) -> None:
+            c.register_singleton(("module", i), lambda _: object())
+
+        def on_startup(self, c: Container, ctx: AppContext, i=i) -> None:
+            c.get(("module", i))
+
+        types.append(
+            type(
+                f"Module{i}",
+                (BaseModule,),
+                {"requires": tuple(types[-2:]), "register": register, "on_startup": on_startup},
+            )
+        )
+    return types
+
+
+def _ignore(_) -> None:
+    return None
@@ -0,0 +1,101 @@
+"""
+Cold import times, each measured in a fresh interpreter, and an import-hygiene
+check: importing every base_core.framework module (and base_core, base_core.math,
+base_core.fitting themselves) must not load NumPy or SciPy.
+
+    python -m benchmarks.imports
+"""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+from benchmarks.suite import BenchmarkFailure, benchmark, best_time
+
+HEAVY = ("numpy", "scipy")
+
+# packages whose plain import must stay free of HEAVY
+LIGHT = ("base_core", "base_core.math", "base_core.math.enums", "base_core.fitting", "base_core.quantities.enums")
+
+_IMPORT_FRAMEWORK = """
+import pkgutil, importlib, base_core.framework as fw
+for info in pkgutil.walk_packages(fw.__path__, fw.__name__ + "."):
+    importlib.import_module(info.name)
+"""
+
+_CHECK = """
+import json, sys
+{imports}
+print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))
+"""
+
+
+def heavy_imports(code: str) -> list[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHECK.format(imports=code, heavy=HEAVY)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def check_import_hygiene() -> list[str]:
+    """
+    Descriptions of every light import that pulled in a heavy module.
+    """
+    problems = []
+    loaded = heavy_imports(_IMPORT_FRAMEWORK)
+    if loaded:
+        problems.append(f"base_core.framework.* loads {', '.join(loaded)}")
+    for module in LIGHT:
+        loaded = heavy_imports(f"import {module}")
+        if loaded:
+            problems.append(f"import {module} loads {', '.join(loaded)}")
+    return problems
+
+
+def _cold_import(code: str) -> None:
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@benchmark("imports.cold_start")
+def bench_cold_start(quick: bool) -> dict[str, float]:
+    problems = check_import_hygiene()
+    if problems:
+        raise BenchmarkFailure("; ".join(problems))
+
+    repeats = 3 if quick else 7
+    baseline = best_time(lambda: _cold_import("pass"), repeats=repeats)
+    cases = {
+        "framework": _IMPORT_FRAMEWORK,
+        "math_functions": "import base_core.math.functions",
+        "fitting_functions": "import base_core.fitting.functions",
+        "first_fit": (
+            "import numpy as np\n"
+            "from base_core.fitting import fit_gaussian\n"
+            "x = np.linspace(-3, 3, 50)\n"
+            "fit_gaussian(x, np.exp(-x * x / 2))"
+        ),
+    }
+    # interpreter start-up is subtracted, leaving the cost of the imports themselves
+    return {
+        name: max(best_time(lambda code=code: _cold_import(code), repeats=repeats) - baseline, 0.0)
+        for name, code in cases.items()
+    }
+
+
+def main() -> int:
+    try:
+        metrics = bench_cold_start(False)
+    except BenchmarkFailure as e:
+        print(f"FAILED: {e}")
+        return 1
+    for name, seconds in metrics.items():
+        print(f"{name:<20} {seconds * 1e3:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
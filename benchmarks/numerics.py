@@ -0,0 +1,129 @@
+"""
+Numerics benchmarks: smoothing, resampling, CFG projections, Point/Angle, plot decimation.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from base_core.math.enums import AngleUnit, InterpolationKind
+from base_core.math.functions import usCFG_projection, usCFG_projection_grid
+from base_core.math.models import Angle, AngleArray, Point, PointArray, WavelengthGrid
+from base_core.math.resampling import resample
+from base_core.math.smoothing import gaussian_smooth, moving_average
+from base_core.plotting.decimation import LiveDecimator, decimate
+from base_core.plotting.enums import DecimationMethod
+from benchmarks.suite import benchmark, time_per_call
+
+_US_CFG = (801.0, 790.0, 15.0, 0.1, 0.4, 0.02)
+
+
+@benchmark("math.moving_average")
+def bench_moving_average(quick: bool) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    n = 100_000 if quick else 1_000_000
+    x = np.arange(n, dtype=float)
+    y = rng.normal(size=n)
+    batch = rng.normal(size=(64 if quick else 512, 2048))
+    return {
+        "1d_w51": time_per_call(lambda: moving_average(x, y, 51)),
+        "batch_w51": time_per_call(lambda: moving_average(np.arange(batch.shape[1]), batch, 51)),
+    }
+
+
+@benchmark("math.gaussian_smooth")
+def bench_gaussian_smooth(quick: bool) -> dict[str, float]:
+    y = np.random.default_rng(0).normal(size=100_000 if quick else 1_000_000)
+    return {
+        "w9": time_per_call(lambda: gaussian_smooth(y, 9)),
+        "w201": time_per_call(lambda: gaussian_smooth(y, 201)),
+    }
+
+
+@benchmark("math.resample")
+def bench_resample(quick: bool) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    source = np.sort(rng.uniform(780, 820, 1024))
+    target = np.linspace(780, 820, 1000)
+    stack = rng.normal(size=(200 if quick else 2_000, len(source)))
+    return {
+        "np_interp_loop_per_row": time_per_call(lambda: [np.interp(target, source, y) for y in stack]) / len(stack),
+        "linear_per_row": time_per_call(lambda: resample(source, stack, target)) / len(stack),
+        "cubic_per_row": time_per_call(
+            lambda: resample(source, stack, target, kind=InterpolationKind.CUBIC)
+        ) / len(stack),
+    }
+
+
+@benchmark("math.usCFG_projection")
+def bench_projection(quick: bool) -> dict[str, float]:
+    wl = np.linspace(780, 820, 1024)
+    grid = WavelengthGrid(wl)
+    n_sets = 1_000 if quick else 20_000
+    phases = np.linspace(0, np.pi, n_sets)
+    out = np.empty((n_sets, len(wl)))
+    carrier, start, bandwidth, baseline, _, acceleration = _US_CFG
+    return {
+        "scalar": time_per_call(lambda: usCFG_projection(wl, *_US_CFG)),
+        "wavelength_grid": time_per_call(lambda: usCFG_projection(grid, *_US_CFG)),
+        "param_grid_per_row": time_per_call(
+            lambda: usCFG_projection_grid(wl, carrier, start, bandwidth, baseline, phases, acceleration, out=out)
+        )
+        / n_sets,
+    }
+
+
+@benchmark("math.point")
+def bench_point(quick: bool) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    n = 10_000 if quick else 100_000
+    x, y = rng.normal(size=n), rng.normal(size=n)
+    points = [Point(a, b) for a, b in zip(x, y)]
+    array = PointArray(x, y)
+    angle = Angle(0.3)
+    center = Point(0.1, -0.2)
+
+    def rotate_objects() -> None:
+        for p in points:
+            p.rotate(angle, center)
+
+    return {
+        "rotate_objects_per_point": time_per_call(rotate_objects, repeats=3) / n,
+        "rotate_array_per_point": time_per_call(lambda: array.rotate(angle, center)) / n,
+    }
+
+
+@benchmark("math.angle")
+def bench_angle(quick: bool) -> dict[str, float]:
+    n = 10_000 if quick else 100_000
+    degrees = np.random.default_rng(0).uniform(-720, 720, n)
+    values = degrees.tolist()
+    return {
+        "construct_objects_per_angle": time_per_call(
+            lambda: [Angle(v, AngleUnit.DEG) for v in values], repeats=3
+        )
+        / n,
+        "construct_array_per_angle": time_per_call(lambda: AngleArray(degrees, AngleUnit.DEG)) / n,
+    }
+
+
+@benchmark("plotting.decimate")
+def bench_decimate(quick: bool) -> dict[str, float]:
+    rng = np.random.default_rng(0)
+    n = 200_000 if quick else 2_000_000
+    x = np.arange(n, dtype=float)
+    y = rng.normal(size=(4, n)).cumsum(axis=1)
+    chunks = np.array_split(y[0], 1_000)
+
+    def live() -> None:
+        decimator = LiveDecimator(2_000)
+        start = 0
+        for chunk in chunks:
+            decimator.append(x[start : start + len(chunk)], chunk)
+            start += len(chunk)
+        decimator.series()
+
+    return {
+        "min_max_4x": time_per_call(lambda: decimate(x, y, 4_000)),
+        "lttb_4x": time_per_call(lambda: decimate(x, y, 2_000, method=DecimationMethod.LTTB)),
+        "live_1000_chunks": time_per_call(live),
+    }
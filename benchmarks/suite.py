@@ -0,0 +1,193 @@
+"""
+Benchmark registry, timing helpers and baseline comparison.
+
+A benchmark is a function registered with @benchmark("group.name"). It takes
+`quick` (smaller sizes for a smoke run) and returns {metric: seconds}. Every
+metric is lower-is-better and normalized (per call, per item, ...) rather than
+named after a problem size, so results from different runs can be compared
+by ratio. Quick and full results are not comparable all the same: save()
+records the mode and load() refuses a baseline recorded in the other one.
+A benchmark that checks an invariant (e.g. import hygiene) raises
+BenchmarkFailure; the run continues and reports it as failed, as it does for
+any other exception.
+"""
+from __future__ import annotations
+
+import fnmatch
+import importlib
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
+
+BenchmarkFn = Callable[[bool], dict[str, float]]
+
+MODULES = (
+    "benchmarks.imports",
+    "benchmarks.numerics",
+    "benchmarks.fitting",
+    "benchmarks.concurrency",
+    "benchmarks.framework",
+)
+
+_REGISTRY: dict[str, BenchmarkFn] = {}
+
+
+class BenchmarkFailure(AssertionError):
+    pass
+
+
+class BaselineMismatch(ValueError):
+    pass
+
+
+def benchmark(name: str) -> Callable[[BenchmarkFn], BenchmarkFn]:
+    def register(fn: BenchmarkFn) -> BenchmarkFn:
+        if name in _REGISTRY:
+            raise ValueError(f"benchmark {name!r} registered twice.")
+        _REGISTRY[name] = fn
+        return fn
+
+    return register
+
+
+def registered(modules: Iterable[str] = MODULES) -> dict[str, BenchmarkFn]:
+    for module in modules:
+        importlib.import_module(module)
+    return dict(_REGISTRY)
+
+
+# --- timing -----------------------------------------------------------------
+
+def best_time(fn: Callable[[], object], *, repeats: int = 5, number: int = 1) -> float:
+    """
+    Best wall time per call over `repeats` rounds of `number` calls.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+
+def auto_number(fn: Callable[[], object], *, target: float = 0.05) -> int:
+    """
+    Calls per round so that one round takes about `target` seconds.
+    """
+    t0 = time.perf_counter()
+    fn()
+    once = time.perf_counter() - t0
+    return max(1, int(target / max(once, 1e-9)))
+
+
+def time_per_call(fn: Callable[[], object], *, repeats: int = 5, target: float = 0.05) -> float:
+    return best_time(fn, repeats=repeats, number=auto_number(fn, target=target))
+
+
+def latency_metrics(prefix: str, samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        f"{prefix}_p50": statistics.median(ordered),
+        f"{prefix}_p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+    }
+
+
+# --- running and comparing --------------------------------------------------
+
+@dataclass(frozen=True)
+class Regression:
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def run(
+    pattern: str | None = None,
+    *,
+    quick: bool = False,
+    echo: Callable[[str], None] = print,
+) -> tuple[dict[str, float], dict[str, str]]:
+    """
+    Run the matching benchmarks. Returns ({metric: seconds}, {benchmark: failure message}).
+    """
+    results: dict[str, float] = {}
+    failures: dict[str, str] = {}
+    for name, fn in sorted(registered().items()):
+        if pattern is not None and not fnmatch.fnmatch(name, pattern):
+            continue
+        try:
+            metrics = fn(quick)
+        except BenchmarkFailure as e:
+            failures[name] = str(e)
+            echo(f"{name:<60} FAILED: {e}")
+            continue
+        except Exception as e:
+            failures[name] = f"{type(e).__name__}: {e}"
+            echo(f"{name:<60} ERROR: {failures[name]}")
+            continue
+        for metric, seconds in metrics.items():
+            key = f"{name}/{metric}"
+            results[key] = float(seconds)
+            echo(f"{key:<60} {_format_seconds(seconds)}")
+    return results, failures
+
+
+def compare(current: dict[str, float], baseline: dict[str, float], threshold: float) -> list[Regression]:
+    """
+    Metrics that got slower than baseline * (1 + threshold). Metrics missing on either side are ignored.
+    """
+    return [
+        Regression(metric, baseline[metric], seconds)
+        for metric, seconds in sorted(current.items())
+        if metric in baseline and baseline[metric] > 0 and seconds > baseline[metric] * (1 + threshold)
+    ]
+
+
+def save(path: Path, results: dict[str, float], *, quick: bool) -> None:
+    import numpy as np
+
+    document = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "quick": quick,
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load(path: Path, *, quick: bool) -> dict[str, float]:
+    """
+    Results stored by save(); raises BaselineMismatch unless they were recorded with the same quick.
+    """
+    document = json.loads(path.read_text(encoding="utf-8"))
+    recorded = document.get("meta", {}).get("quick")
+    if recorded is not quick:
+        mode = {True: "--quick", False: "full", None: "an unrecorded"}[recorded]
+        raise BaselineMismatch(
+            f"{path} was recorded in {mode} mode; re-record it {'with' if quick else 'without'} --quick."
+        )
+    return {k: float(v) for k, v in document["results"].items()}
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:10.3f} {unit}"
+    return f"{seconds / 1e-9:10.3f} ns"
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy.optimize import curve_fit
+
+from base_core.fitting.batch import fit_gaussian_batch
+from base_core.fitting.enums import FitMode
+from base_core.math.functions import gaussian
+
+
+def _traces(n_rows: int = 12, n_points: int = 80, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    x = np.linspace(-5.0, 5.0, n_points)
+    true = np.column_stack([
+        rng.uniform(1.0, 3.0, n_rows),
+        rng.uniform(-1.5, 1.5, n_rows),
+        rng.uniform(0.5, 1.5, n_rows),
+        rng.uniform(-0.2, 0.2, n_rows),
+    ])
+    y = np.stack([gaussian(x, *p) for p in true]) + rng.normal(0.0, 0.02, (n_rows, n_points))
+    return x, y, true
+
+
+def test_batch_matches_curve_fit():
+    x, y, true = _traces()
+    result = fit_gaussian_batch(x, y)
+
+    assert result.converged.all()
+    for i, row in enumerate(y):
+        popt, pcov = curve_fit(gaussian, x, row, p0=true[i])
+        fitted = np.array([result.amplitude[i], result.center[i], abs(result.sigma[i]), result.offset[i]])
+        popt[2] = abs(popt[2])
+        np.testing.assert_allclose(fitted, popt, rtol=1e-5, atol=1e-7)
+        np.testing.assert_allclose(result.center_err[i], np.sqrt(pcov[1, 1]), rtol=1e-3)
+
+
+def test_batch_chunks_match_single_chunk():
+    x, y, _ = _traces(n_rows=10)
+    whole = fit_gaussian_batch(x, y)
+    chunked = fit_gaussian_batch(x, y, chunk_size=3)
+    np.testing.assert_allclose(chunked.center, whole.center)
+    np.testing.assert_allclose(chunked.sigma, whole.sigma)
+
+
+def test_batch_rejects_p0_with_fast_mode():
+    x, y, true = _traces(n_rows=2)
+    with pytest.raises(ValueError):
+        fit_gaussian_batch(x, y, p0=true, mode=FitMode.FAST)
@@ -0,0 +1,229 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from base_core.framework.concurrency.enums import DeliveryPolicy
+from base_core.framework.concurrency.task_runner import TaskRunner
+
+
+@pytest.fixture
+def runner():
+    executor = ThreadPoolExecutor(4)
+    runner = TaskRunner(executor)
+    yield runner
+    runner.close()
+    executor.shutdown()
+
+
+def _count(n, delay=0.0):
+    def produce(stop):
+        for i in range(n):
+            if stop.is_set():
+                return
+            yield i
+            if delay:
+                time.sleep(delay)
+    return produce
+
+
+def _assert_accounted(stats):
+    assert stats.produced == stats.delivered + stats.coalesced + stats.dropped
+
+
+def test_stream_latest_delivers_last_item_in_order(runner):
+    got = []
+    done = threading.Event()
+    handle = runner.stream(
+        _count(500), on_item=lambda i: (time.sleep(0.002), got.append(i)), on_complete=done.set
+    )
+    handle.future.result()
+    assert done.is_set()
+    assert got[-1] == 499
+    assert got == sorted(got)
+    assert handle.stats.produced == 500
+    assert handle.stats.delivered == len(got)
+    _assert_accounted(handle.stats)
+
+
+def test_stream_batch_delivers_every_item(runner):
+    batches = []
+    handle = runner.stream(
+        _count(500), on_item=lambda b: (time.sleep(0.002), batches.append(b)), policy=DeliveryPolicy.BATCH
+    )
+    handle.future.result()
+    assert [i for b in batches for i in b] == list(range(500))
+    assert handle.stats.dropped == 0
+    _assert_accounted(handle.stats)
+
+
+def test_stream_batch_stacks_and_keeps_newest(runner):
+    batches = []
+    handle = runner.stream(
+        lambda stop: (np.full(3, i) for i in range(200)),
+        on_item=lambda b: (time.sleep(0.002), batches.append(b)),
+        policy=DeliveryPolicy.BATCH, max_batch=4, stack=True,
+    )
+    handle.future.result()
+    assert all(isinstance(b, np.ndarray) and b.shape[1] == 3 and len(b) <= 4 for b in batches)
+    assert batches[-1][-1, 0] == 199
+    _assert_accounted(handle.stats)
+
+
+def test_stream_max_rate_spaces_deliveries(runner):
+    times = []
+    handle = runner.stream(
+        _count(100, 0.001), on_item=lambda i: times.append((time.perf_counter(), i)),
+        policy=DeliveryPolicy.MAX_RATE, max_rate=50,
+    )
+    handle.future.result()
+    gaps = np.diff([t for t, _ in times])
+    assert times[-1][1] == 99
+    assert (gaps >= 1 / 50 * 0.9).all()
+    _assert_accounted(handle.stats)
+
+
+def test_stream_on_item_error_stops_the_stream(runner):
+    errors = []
+
+    def on_item(i):
+        if i == 5:
+            raise KeyError(i)
+
+    handle = runner.stream(_count(10 ** 6, 0.0001), on_item=on_item, on_error=errors.append)
+    handle.future.result(timeout=5)
+    assert len(errors) == 1 and isinstance(errors[0], KeyError)
+    assert handle.stats.produced < 10 ** 6
+
+
+def test_stream_stop_with_pending_rate_limit_returns_promptly(runner):
+    handle = runner.stream(
+        _count(10 ** 6, 0.001), on_item=lambda i: None, policy=DeliveryPolicy.MAX_RATE, max_rate=0.5
+    )
+    time.sleep(0.05)
+    start = time.perf_counter()
+    handle.stop()
+    handle.future.result(timeout=5)
+    assert time.perf_counter() - start < 1.0
+    _assert_accounted(handle.stats)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"policy": DeliveryPolicy.MAX_RATE},
+    {"max_rate": 5},
+    {"policy": DeliveryPolicy.BATCH, "max_rate": 0},
+    {"policy": DeliveryPolicy.BATCH, "max_batch": 0},
+])
+def test_stream_rejects_invalid_policy_options(runner, kwargs):
+    with pytest.raises(ValueError):
+        runner.stream(_count(1), on_item=lambda i: None, **kwargs)
+
+
+def test_dispatcher_must_not_be_the_executor():
+    with ThreadPoolExecutor(1) as executor:
+        with pytest.raises(ValueError):
+            TaskRunner(executor, dispatcher=executor)
+
+
+def _after_callbacks(future):
+    # done callbacks run in order, so this one fires after the runner's own
+    done = threading.Event()
+    future.add_done_callback(lambda _: done.set())
+    assert done.wait(5)
+
+
+def test_run_latest_wins(runner):
+    gate = threading.Event()
+    results = []
+    first = runner.run(lambda: gate.wait(5) and "first", key="k", on_success=results.append)
+    second = runner.run(lambda: "second", key="k", on_success=results.append)
+    _after_callbacks(second)
+    gate.set()
+    _after_callbacks(first)
+
+    assert first.result() == "first"
+    assert results == ["second"]
+    assert runner.key_metrics()["k"].dropped_outdated == 1
+
+
+def test_run_keeps_outdated_results_without_drop_outdated(runner):
+    gate = threading.Event()
+    results = []
+    first = runner.run(lambda: gate.wait(5) and 1, key="k", on_success=results.append, drop_outdated=False)
+    second = runner.run(lambda: 2, key="k", on_success=results.append, drop_outdated=False)
+    _after_callbacks(second)
+    gate.set()
+    _after_callbacks(first)
+    assert results == [2, 1]
+
+
+def test_cancel_previous_cancels_queued_job_and_stops_stream():
+    with ThreadPoolExecutor(1) as executor:
+        runner = TaskRunner(executor)
+        gate = threading.Event()
+        blocker = runner.run(lambda: gate.wait(5))
+        queued = runner.run(lambda: "old", key="k")
+        newer = runner.run(lambda: "new", key="k", cancel_previous=True)
+        assert queued.cancelled()
+        gate.set()
+        assert newer.result(timeout=5) == "new"
+        blocker.result()
+
+        produced = []
+        old = runner.stream(lambda stop: (produced.append(i) or i for i in iter(int, 1) if not stop.is_set()), on_item=lambda i: None, key="s")
+        time.sleep(0.02)
+        new = runner.stream(_count(3), on_item=lambda i: None, key="s", cancel_previous=True)
+        old.future.result(timeout=5)
+        new.future.result(timeout=5)
+        assert old.stop_event.is_set()
+        runner.close()
+
+
+def test_cancel_by_key(runner):
+    gate = threading.Event()
+    blockers = [runner.run(lambda: gate.wait(5)) for _ in range(4)]
+    queued = runner.run(lambda: 1, key="c")
+    assert runner.cancel("c")
+    assert queued.cancelled()
+    gate.set()
+    for f in blockers:
+        f.result()
+    _after_callbacks(queued)
+    metrics = runner.key_metrics()["c"]
+    assert metrics.cancelled == 1 and metrics.in_flight == 0
+
+
+def test_finished_keys_are_released(runner):
+    futures = [runner.run(lambda i=i: i, key=i, on_success=lambda _: None) for i in range(100)]
+    for f in futures:
+        _after_callbacks(f)
+    assert not any(runner.cancel(i) for i in range(100))
+
+    # a key reused after it was released still gets latest-wins
+    results = []
+    gate = threading.Event()
+    first = runner.run(lambda: gate.wait(5) and 1, key=0, on_success=results.append)
+    second = runner.run(lambda: 2, key=0, on_success=results.append)
+    _after_callbacks(second)
+    gate.set()
+    _after_callbacks(first)
+    assert results == [2]
+
+
+def test_metrics_count_outcomes():
+    with ThreadPoolExecutor(2) as executor:
+        runner = TaskRunner(executor, max_metric_keys=2)
+        ok = runner.run(lambda: time.sleep(0.002), key="a")
+        bad = runner.run(lambda: 1 / 0, key="b", on_error=lambda e: None)
+        streamed = runner.stream(_count(5), on_item=lambda i: None, key="c")
+        for f in (ok, bad, streamed.future):
+            _after_callbacks(f)
+
+        total = runner.metrics()
+        assert (total.submitted, total.completed, total.failed, total.in_flight) == (3, 2, 1, 0)
+        assert total.run.count == 3
+        assert total.run.max >= 0.002
+        assert list(runner.key_metrics()) == ["b", "c"]
+        runner.close()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from base_core.math.models import Range, RangeIndex
+
+
+def _brute_force(ranges, values, inclusive):
+    return np.array([[r.is_in_range(v, inclusive=inclusive) for v in values] for r in ranges], dtype=bool)
+
+
+def _ranges_and_values(seed: int = 6):
+    rng = np.random.default_rng(seed)
+    # integer endpoints so values hit endpoints exactly, plus empty and point ranges
+    low = rng.integers(0, 40, 60).astype(float)
+    high = low + rng.integers(0, 15, 60)
+    ranges = [Range(float(a), float(b)) for a, b in zip(low, high)]
+    ranges += [Range(10.0, 10.0), Range(-5.0, 100.0)]
+    values = np.concatenate([np.arange(-6.0, 60.0, 0.5), [np.nan]])
+    return ranges, values
+
+
+@pytest.mark.parametrize("inclusive", [True, False])
+def test_queries_match_is_in_range(inclusive):
+    ranges, values = _ranges_and_values()
+    index = RangeIndex(ranges)
+    expected = _brute_force(ranges, values, inclusive)
+
+    np.testing.assert_array_equal(index.mask(values, inclusive=inclusive), expected)
+    np.testing.assert_array_equal(index.counts(values, inclusive=inclusive), expected.sum(axis=0))
+    np.testing.assert_array_equal(index.contains_any(values, inclusive=inclusive), expected.any(axis=0))
+
+    value_idx, range_idx = index.pairs(values, inclusive=inclusive)
+    expected_ranges, expected_values = np.nonzero(expected)
+    order = np.lexsort((expected_ranges, expected_values))
+    np.testing.assert_array_equal(value_idx, expected_values[order])
+    np.testing.assert_array_equal(range_idx, expected_ranges[order])
+
+    for n in (0, 32, 52, 100):
+        np.testing.assert_array_equal(
+            index.containing(values[n], inclusive=inclusive), np.flatnonzero(expected[:, n])
+        )
+
+
+def test_empty_index():
+    index = RangeIndex([])
+    assert len(index) == 0
+    assert not index.contains_any([1.0, 2.0]).any()
+    value_idx, range_idx = index.pairs([1.0])
+    assert len(value_idx) == len(range_idx) == 0
@@ -0,0 +1,49 @@
+import numpy as np
+
+from base_core.math.enums import InterpolationKind
+from base_core.math.resampling import clear_resampling_cache, resample, resampling_plan
+
+
+def _axes(seed: int = 3):
+    rng = np.random.default_rng(seed)
+    source = np.sort(rng.uniform(400.0, 800.0, 300))
+    # includes points outside the source range, which np.interp clamps
+    target = np.linspace(380.0, 820.0, 517)
+    return source, target
+
+
+def test_linear_matches_np_interp_for_a_stack():
+    source, target = _axes()
+    y = np.random.default_rng(4).normal(size=(5, len(source)))
+    out = resample(source, y, target)
+    expected = np.stack([np.interp(target, source, row) for row in y])
+    np.testing.assert_allclose(out, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_non_contiguous_out_is_filled():
+    source, target = _axes()
+    y = np.random.default_rng(5).normal(size=(4, len(source)))
+    buffer = np.zeros((4, 2 * len(target)))
+    out = buffer[:, ::2]
+    returned = resample(source, y, target, out=out)
+    assert returned is out
+    expected = np.stack([np.interp(target, source, row) for row in y])
+    np.testing.assert_allclose(buffer[:, ::2], expected, rtol=1e-12, atol=1e-12)
+    assert not buffer[:, 1::2].any()
+
+
+def test_cubic_reproduces_linear_data_and_source_points():
+    source, target = _axes()
+    line = 2.0 * source - 3.0
+    inside = (target >= source[0]) & (target <= source[-1])
+    cubic = resample(source, line, target, kind=InterpolationKind.CUBIC)
+    np.testing.assert_allclose(cubic[inside], 2.0 * target[inside] - 3.0, rtol=1e-10)
+
+    y = np.sin(source / 20.0)
+    np.testing.assert_allclose(resample(source, y, source, kind=InterpolationKind.CUBIC), y, atol=1e-12)
+
+
+def test_plans_are_cached():
+    clear_resampling_cache()
+    source, target = _axes()
+    assert resampling_plan(source, target) is resampling_plan(source.copy(), target.copy())
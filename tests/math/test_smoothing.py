@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from base_core.math.smoothing import StreamingMovingAverage, moving_average
+
+
+@pytest.mark.parametrize("chunks", [[1000], [1, 2, 3, 994], [7] * 142 + [6], [300, 0, 700]])
+def test_streaming_matches_batch(chunks):
+    rng = np.random.default_rng(1)
+    x = np.arange(1000, dtype=float)
+    y = rng.normal(size=1000)
+    x_ref, y_ref = moving_average(x, y, 9)
+
+    stream = StreamingMovingAverage(9)
+    parts = []
+    start = 0
+    for size in chunks:
+        parts.append(stream.update(x[start:start + size], y[start:start + size]))
+        start += size
+
+    np.testing.assert_allclose(np.concatenate([p[0] for p in parts]), x_ref)
+    np.testing.assert_allclose(np.concatenate([p[1] for p in parts]), y_ref, atol=1e-12)
+    assert stream.samples_seen == 1000
+
+
+def test_streaming_stacked_traces_along_axis_0():
+    rng = np.random.default_rng(2)
+    x = np.linspace(0.0, 1.0, 200)
+    y = rng.normal(size=(200, 3))
+    _, y_ref = moving_average(x, y, 5, axis=0)
+
+    stream = StreamingMovingAverage(5, axis=0)
+    out = [stream.update(x[i:i + 30], y[i:i + 30])[1] for i in range(0, 200, 30)]
+    np.testing.assert_allclose(np.concatenate(out, axis=0), y_ref, atol=1e-12)
+
+
+def test_streaming_rejects_changed_chunk_shape():
+    stream = StreamingMovingAverage(3)
+    stream.update(np.arange(4.0), np.zeros((2, 4)))
+    with pytest.raises(ValueError):
+        stream.update(np.arange(4.0), np.zeros((3, 4)))